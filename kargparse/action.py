@@ -0,0 +1,320 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+from argparse import Action, ArgumentError, SUPPRESS, _SubParsersAction, _UNRECOGNIZED_ARGS_ATTR
+from re import compile as compile_regex
+from threading import RLock
+
+# The nargs expressions added by KArgParse. "N+" means N or more arguments
+# and "{m,n}" means at least m and at most n arguments.
+_NARGS_EXPRESSION = compile_regex("^(?:([0-9]+)\\+|\\{([0-9]+),([0-9]+)\\})$")
+
+# This lock makes sure a deferred subparser is only built once, even if
+# several threads select it at the same time.
+_BUILD_LOCK = RLock()
+
+# The per-call attributes of KArgumentParser that a subparser shares with
+# its parent. See KSubParsersAction's __call__() method.
+_CALL_STATE = ("_batch_output", "_async_pending", "_collected_errors")
+
+def get_nargs_range(nargs):
+    """
+    Returns the range of arguments for a KArgParse nargs expression.
+
+    Arguments:
+        nargs (string or integer, required):
+            The nargs of an argument.
+
+    Returns:
+        tuple:
+            A two item tuple containing the minimum and the maximum number
+            of arguments, or None if nargs isn't a KArgParse expression (e.g.,
+            "+", 2). The maximum is None for an "N+" expression.
+    """
+
+    # Check the nargs to make sure it is a valid expression.
+    if not isinstance(nargs, str):
+        return None
+    expression = _NARGS_EXPRESSION.match(nargs)
+    if expression is None:
+        return None
+
+    # An "N+" expression has no maximum.
+    if expression.group(1) is not None:
+        return int(expression.group(1)), None
+
+    # A "{m,n}" expression must allow at least one argument.
+    minimum, maximum = int(expression.group(2)), int(expression.group(3))
+    if maximum < minimum or maximum == 0:
+        return None
+
+    return minimum, maximum
+
+class _KParserFactory:
+    """
+    Object that stands in for a subparser that hasn't been built yet.
+
+    Arguments:
+        factory (function, required):
+            A function that takes the same keyword arguments as
+            KArgumentParser and returns a fully built parser.
+        kwargs (dictionary, required):
+            The keyword arguments to pass to the factory.
+    """
+
+    def __init__(self, factory, kwargs):
+        self.factory = factory
+        self.kwargs = kwargs
+
+    def build(self):
+        """Calls the factory and returns the parser it built."""
+
+        return self.factory(**self.kwargs)
+
+class _KParserMap(dict):
+    """
+    Object that extends Python's dict.
+
+    This is the map from subcommand names to subparsers. A value can be
+    a _KParserFactory, in which case the subparser is built the first
+    time it's looked up. Membership tests, len(), and iteration only use
+    the keys, so the choices check and the "choose from" message never
+    build a subparser.
+    """
+
+    def __getitem__(self, name):
+        """Returns the subparser for a name, building it if necessary."""
+
+        parser = super().__getitem__(name)
+        if isinstance(parser, _KParserFactory):
+            with _BUILD_LOCK:
+                # Check again, another thread may have built it while this one waited.
+                parser = super().__getitem__(name)
+                if isinstance(parser, _KParserFactory):
+                    placeholder = parser
+                    parser = placeholder.build()
+                    # Replace the placeholder for the name and all of its aliases.
+                    for key, value in super().items():
+                        if value is placeholder:
+                            super().__setitem__(key, parser)
+
+        return parser
+
+    def get(self, name, default=None):
+        """Returns the subparser for a name, or default if there isn't one."""
+
+        if name in self:
+            return self[name]
+
+        return default
+
+    def items(self):
+        """Returns the (name, subparser) pairs, building every subparser."""
+
+        return [(name, self[name]) for name in self]
+
+    def values(self):
+        """Returns the subparsers, building every subparser."""
+
+        return [self[name] for name in self]
+
+class KHelpAction(Action):
+    """
+    Object that extends argparse's Action.
+
+    This is the -h|--help option of a parser created with help_topics.
+    It is the same as argparse's help action, except it takes an optional
+    topic, in which case only the matching part of the help statement is
+    printed (see the topics module).
+
+    Arguments:
+        See argparse's _HelpAction.
+    """
+
+    def __init__(self, option_strings, dest=SUPPRESS, default=SUPPRESS, help=None): # pylint: disable=W0622
+
+        super().__init__(option_strings=option_strings,
+                         dest=dest,
+                         default=default,
+                         nargs="?",
+                         metavar="topic",
+                         help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """
+        Prints the help statement, or the help for a topic, and exits.
+
+        Arguments:
+            parser (class, required):
+                The parser.
+            namespace (class, required):
+                The parser's namespace.
+            values (string, required):
+                The topic, or None if there isn't one.
+            option_string (string, optional):
+                The option string used (default: None).
+        """
+
+        parser.print_help(topic=values)
+        parser.exit()
+
+class KSubParsersAction(_SubParsersAction):
+    """
+    Object that extends argparse's _SubParsersAction.
+
+    This is the action created by KArgumentParser's add_subparsers()
+    method. It adds the factory keyword argument to add_parser(), which
+    defers building a subparser until its name is seen on the command
+    line. The help and usage statements for the parent parser only need
+    the name, aliases, and help of each subparser, so they never build
+    a deferred subparser.
+
+    Arguments:
+        See argparse's _SubParsersAction.
+    """
+
+    def __init__(self, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+
+        # Replace the map created by _SubParsersAction with one that
+        # understands deferred subparsers. The map is also the choices.
+        self._name_parser_map = _KParserMap()
+        self.choices = self._name_parser_map
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """
+        Parses the remaining arguments with the selected subparser.
+
+        This is the same as _SubParsersAction's __call__() method, except
+        the subparser's namespace is copied with its _get_kwargs() method
+        instead of vars(). A slotted namespace (see the namespace module)
+        doesn't keep its attributes in the instance dictionary.
+
+        Arguments:
+            parser (class, required):
+                The parent parser.
+            namespace (class, required):
+                The parent parser's namespace.
+            values (list, required):
+                The subcommand name followed by the remaining arguments.
+            option_string (string, optional):
+                Always None for a subparsers action (default: None).
+
+        Raises:
+            ArgumentError:
+                If the subcommand name is unknown.
+        """
+
+        parser_name = values[0]
+        arg_strings = values[1:]
+
+        # Set the parser name if requested.
+        if self.dest is not SUPPRESS:
+            setattr(namespace, self.dest, parser_name)
+
+        # Select the parser.
+        parent = parser
+        try:
+            parser = self._name_parser_map[parser_name]
+        except KeyError:
+            message = "unknown parser '{}' (choices: {})".format(parser_name, ", ".join(self._name_parser_map))
+            raise ArgumentError(self, message) from None
+
+        # Parse the remaining arguments into a new namespace, then copy it
+        # into the parent's namespace. Any unrecognized arguments are kept
+        # so the parent parser can decide what to do with them. During the
+        # parent's parse_many() or parse_args_async(), or while the parent
+        # is collecting errors, the subparser shares the parent's call
+        # state, so it handles its output and errors the same as the parent.
+        call_state = [(name, getattr(parent, name, None)) for name in _CALL_STATE if hasattr(parser, name)]
+        call_state = [(name, value) for name, value in call_state if value is not None]
+        for name, value in call_state:
+            setattr(parser, name, value)
+        try:
+            subnamespace, arg_strings = parser.parse_known_args(arg_strings, None)
+        finally:
+            for name, _ in call_state:
+                setattr(parser, name, None)
+        for key, value in subnamespace._get_kwargs(): # pylint: disable=W0212
+            setattr(namespace, key, value)
+
+        if arg_strings:
+            if not hasattr(namespace, _UNRECOGNIZED_ARGS_ATTR):
+                setattr(namespace, _UNRECOGNIZED_ARGS_ATTR, [])
+            getattr(namespace, _UNRECOGNIZED_ARGS_ATTR).extend(arg_strings)
+
+    def add_parser(self, name, **kwargs):
+        """
+        Add a subparser.
+
+        Without a factory, this method creates the subparser right away
+        and returns it (see argparse's documentation). With a factory,
+        the subparser is registered now but not created until the parent
+        parser selects it.
+
+        Arguments:
+            name (string, required):
+                The name of the subcommand.
+            **factory (function, optional):
+                A function that takes the same keyword arguments as
+                KArgumentParser and returns a fully built parser. It is
+                called with prog and the remaining keyword arguments
+                below, except for aliases and help (default: None).
+            **aliases (list, optional):
+                Alternative names for the subcommand (default: []).
+            **help (string, optional):
+                A brief description of the subcommand for the help
+                statement (default: None).
+            **kwargs (optional):
+                Any other keyword arguments for the subparser.
+
+        Returns:
+            parser:
+                The subparser, or None if a factory was given.
+
+        Raises:
+            ArgumentError:
+                If the name or one of the aliases is already in use.
+            TypeError:
+                If the factory is not callable.
+        """
+
+        factory = kwargs.pop("factory", None)
+        if factory is None:
+            return super().add_parser(name, **kwargs)
+
+        if not callable(factory):
+            raise TypeError("The factory must be callable.")
+
+        # Set prog from the existing prefix.
+        if kwargs.get("prog") is None:
+            kwargs["prog"] = "{} {}".format(self._prog_prefix, name)
+
+        # Check the name and the aliases for conflicts.
+        aliases = kwargs.pop("aliases", ())
+        if name in self._name_parser_map:
+            raise ArgumentError(self, "conflicting subparser: {}".format(name))
+        for alias in aliases:
+            if alias in self._name_parser_map:
+                raise ArgumentError(self, "conflicting subparser alias: {}".format(alias))
+
+        # Create a pseudo-action to hold the choice help.
+        if "help" in kwargs:
+            choice_action = self._ChoicesPseudoAction(name, aliases, kwargs.pop("help"))
+            self._choices_actions.append(choice_action)
+
+        # Register a placeholder under the name and all of its aliases.
+        placeholder = _KParserFactory(factory, kwargs)
+        self._name_parser_map[name] = placeholder
+        for alias in aliases:
+            self._name_parser_map[alias] = placeholder
+
+        return None
@@ -0,0 +1,387 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# Checking a value against a list or tuple of choices is a linear scan,
+# which is slow when there are thousands of choices. A parser compiles
+# static choices into a membership index the first time it needs them:
+#
+#   - A range is checked with arithmetic, even for a float or any other
+#     value that can be used as an index.
+#   - Hashable choices are put in a frozenset.
+#   - Unhashable choices that can be sorted are put in a sorted list and
+#     searched with bisect, if each one is less than or equal to the next.
+#     Choices that are only partly ordered (e.g., sets) can be sorted
+#     without being in order, and a binary search would miss them.
+#
+# Any other choices (e.g., a string, a dict, or a custom container) are
+# checked with the in operator, the same as argparse. A list of choices
+# must not be changed in place, other than adding or removing choices,
+# since checking for that would be as slow as the in operator. Assign a
+# new list to the argument's choices instead. The index never
+# changes the order of the choices, which is still used for the help
+# statement and the "choose from" message. A value that can't be hashed
+# or compared with the choices falls back to a linear scan, so the answer
+# is always the same as the in operator's.
+#
+# A choices function is called for every value. A parser can be told to
+# keep the result of a zero-argument function for a while, in which case
+# the result is indexed the same as static choices (see the parser's
+# choices_cache). The results of a one-argument function can be kept in
+# an LRU cache (see the parser's choices_lru). An awaitable result is
+# never kept, since it can only be awaited once.
+#
+# A vocabulary with millions of values is too large to load as a list.
+# KFileChoices memory-maps a sorted text file with one value per line and
+# answers membership with a binary search over the mapped bytes, so none
+# of the file is loaded up front. A Bloom filter built ahead of time with
+# write_bloom_filter() can be put in front of the search, which turns most
+# misses into a few bit tests. In the help statement, "%(choices)s" is
+# the description of the file, not its values.
+
+from bisect import bisect_left
+from functools import lru_cache, partial
+from hashlib import blake2b
+from inspect import isawaitable
+from math import log
+from mmap import ACCESS_READ, mmap
+from operator import contains, index
+from os.path import basename, getsize
+
+# The first line of a Bloom filter file is this tag, the size of the file
+# it was built from, the number of bits, and the number of hashes.
+_BLOOM_TAG = b"KBLOOM1"
+
+# The file is read in chunks of this size to count its lines.
+_CHUNK_SIZE = 1 << 20
+
+def _in_range(choices, value):
+    """Returns True if the value is in a range of choices."""
+
+    # A float can only equal an integer if it is integral.
+    if isinstance(value, float):
+        return value.is_integer() and int(value) in choices
+
+    try:
+        return index(value) in choices
+    except TypeError:
+        return value in choices
+
+def _in_set(members, choices, value):
+    """Returns True if the value is in a set of hashable choices."""
+
+    try:
+        return value in members
+    except TypeError:
+        return value in choices
+
+def _in_sorted(ordered, choices, value):
+    """Returns True if the value is in a sorted list of choices."""
+
+    try:
+        position = bisect_left(ordered, value)
+    except TypeError:
+        return value in choices
+
+    return position < len(ordered) and ordered[position] == value
+
+def _is_ordered(ordered):
+    """Returns True if each of the sorted choices is less than or equal to the next one."""
+
+    try:
+        return all(previous < current or previous == current for previous, current in zip(ordered, ordered[1:]))
+    except (TypeError, ValueError):
+        return False
+
+class _KUncachedResult(Exception):
+    """
+    Exception that carries a result out of the LRU cache without the
+    cache keeping it.
+
+    Arguments:
+        result (type, required):
+            The result of the choices function.
+    """
+
+    def __init__(self, result):
+        super().__init__()
+        self.result = result
+
+def _call_uncached(function, value):
+    """Calls a choices function, and keeps an awaitable result out of the cache."""
+
+    result = function(value)
+    if isawaitable(result):
+        raise _KUncachedResult(result)
+
+    return result
+
+def _call_cached(function, cached, value):
+    """Calls a choices function through its LRU cache."""
+
+    # Make sure the value can be a key of the cache.
+    try:
+        hash(value)
+    except TypeError:
+        return function(value)
+
+    try:
+        return cached(value)
+    except _KUncachedResult as result:
+        return result.result
+
+def get_choices_predicate(function, maxsize):
+    """
+    Returns a one-argument choices function that keeps its results.
+
+    Arguments:
+        function (function, required):
+            The one-argument choices function of an argument.
+        maxsize (integer, required):
+            The number of results to keep.
+
+    Returns:
+        function:
+            A function that takes a value and returns the same result as
+            the choices function.
+    """
+
+    return partial(_call_cached, function, lru_cache(maxsize, typed=True)(partial(_call_uncached, function)))
+
+def get_choices_index(choices):
+    """
+    Returns a membership test for the choices of an argument.
+
+    Arguments:
+        choices (container, required):
+            The static choices of an argument.
+
+    Returns:
+        function:
+            A function that takes a value and returns True if the value
+            is one of the choices.
+    """
+
+    # A range is checked with arithmetic.
+    if isinstance(choices, range):
+        return partial(_in_range, choices)
+
+    # Only a list or a tuple is indexed, any other container keeps its own in operator.
+    if not isinstance(choices, (list, tuple)):
+        return partial(contains, choices)
+
+    # Put hashable choices in a frozenset.
+    try:
+        return partial(_in_set, frozenset(choices), choices)
+    except TypeError:
+        pass
+
+    # Otherwise, sort the choices if they can be sorted and are in order once sorted.
+    try:
+        ordered = sorted(choices)
+    except (TypeError, ValueError):
+        return partial(contains, choices)
+    if not _is_ordered(ordered):
+        return partial(contains, choices)
+
+    return partial(_in_sorted, ordered, choices)
+
+def _get_bloom_positions(key, bits, hashes):
+    """Returns the bit positions of a key in a Bloom filter."""
+
+    digest = blake2b(key, digest_size=16).digest()
+    first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    return [(first + number * second) % bits for number in range(hashes)]
+
+class KFileChoices:
+    """
+    Object that holds the choices in a sorted text file.
+
+    The file must have one value per line, each line ending with a newline,
+    and be sorted by its bytes (e.g., with "LC_ALL=C sort"). A value is
+    converted with str() and compared with the lines as bytes. The file
+    is memory-mapped, so checking a value only reads the pages the
+    binary search touches.
+
+    Arguments:
+        path (string, required):
+            The sorted text file.
+        encoding (string, optional):
+            The encoding of the file (default: "utf-8").
+        bloom_path (string, optional):
+            A Bloom filter built from the file with write_bloom_filter()
+            (default: None).
+        description (string, optional):
+            The description of the choices for the help statement
+            (default: "the values in <file name>").
+
+    Raises:
+        OSError:
+            If a file can't be opened.
+        ValueError:
+            If the Bloom filter wasn't built from a file of this size.
+    """
+
+    def __init__(self, path, encoding="utf-8", bloom_path=None, description=None):
+        self.path = path
+        self.encoding = encoding
+        self.bloom_path = bloom_path
+        self.description = description
+        self._length = None
+        self._size = getsize(path)
+
+        # An empty file can't be memory-mapped, and it has no choices.
+        self._data = None
+        if self._size:
+            with open(path, "rb") as data_file:
+                self._data = mmap(data_file.fileno(), 0, access=ACCESS_READ)
+
+        # Open the Bloom filter and make sure it belongs to the file.
+        self._bloom = None
+        if bloom_path is not None:
+            with open(bloom_path, "rb") as bloom_file:
+                header = bloom_file.readline().split()
+                if len(header) != 4 or header[0] != _BLOOM_TAG:
+                    raise ValueError("The file {} is not a Bloom filter.".format(bloom_path))
+                if int(header[1]) != self._size:
+                    raise ValueError("The Bloom filter {} was not built from {}.".format(bloom_path, path))
+                self._bloom_bits, self._bloom_hashes = int(header[2]), int(header[3])
+                self._bloom_offset = bloom_file.tell()
+                self._bloom = mmap(bloom_file.fileno(), 0, access=ACCESS_READ)
+
+    def __contains__(self, value):
+        """Returns True if the value is a line of the file."""
+
+        key = str(value).encode(self.encoding)
+        if self._data is None or b"\n" in key:
+            return False
+
+        # A value that isn't in the Bloom filter is not in the file.
+        if self._bloom is not None:
+            for position in _get_bloom_positions(key, self._bloom_bits, self._bloom_hashes):
+                if not self._bloom[self._bloom_offset + (position >> 3)] & (1 << (position & 7)):
+                    return False
+
+        # Search the lines between low and high, both of which are always the start of a line.
+        data = self._data
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            start = data.rfind(b"\n", low, middle) + 1 or low
+            end = data.find(b"\n", start, high)
+            if end == -1:
+                end = high
+            line = data[start:end]
+            if line < key:
+                low = end + 1
+            elif line > key:
+                high = start
+            else:
+                return True
+
+        return False
+
+    def __iter__(self):
+        """Yields each value in the file."""
+
+        for line in self._get_lines():
+            yield line.decode(self.encoding)
+
+    def __len__(self):
+        """Returns the number of values in the file."""
+
+        if self._length is None:
+            length = sum(self._data[start:start + _CHUNK_SIZE].count(b"\n") for start in range(0, self._size, _CHUNK_SIZE))
+            # The last line doesn't have to end with "\n".
+            if self._size and self._data[-1:] != b"\n":
+                length += 1
+            self._length = length
+
+        return self._length
+
+    def __reduce__(self):
+        """Pickles the choices by their files, which are opened again."""
+
+        return (self.__class__, (self.path, self.encoding, self.bloom_path, self.description))
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.path)
+
+    def __str__(self):
+        """Returns the description of the choices for the help statement."""
+
+        if self.description is not None:
+            return self.description
+
+        return "the values in {}".format(basename(self.path))
+
+    def _get_lines(self):
+        """Yields each line in the file as bytes, without the newline."""
+
+        if self._data is None:
+            return
+        start = 0
+        while start < self._size:
+            end = self._data.find(b"\n", start)
+            if end == -1:
+                end = self._size
+            yield self._data[start:end]
+            start = end + 1
+
+    def close(self):
+        """Closes the memory-mapped files."""
+
+        for mapped in (self._data, self._bloom):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._bloom = None
+
+def write_bloom_filter(path, bloom_path, bits_per_value=10):
+    """
+    Builds a Bloom filter for the choices in a sorted text file.
+
+    The filter is tied to the size of the file, so KFileChoices won't
+    use it once the file changes. With 10 bits per value, about 1% of
+    the values that aren't in the file still need the binary search.
+
+    Arguments:
+        path (string, required):
+            The sorted text file (see KFileChoices).
+        bloom_path (string, required):
+            The file to write the Bloom filter to.
+        bits_per_value (integer, optional):
+            The size of the filter for each value (default: 10).
+
+    Raises:
+        OSError:
+            If a file can't be opened.
+        ValueError:
+            If bits_per_value is less than 1.
+    """
+
+    # Check the bits_per_value.
+    if bits_per_value < 1:
+        raise ValueError("The bits_per_value must be at least 1.")
+
+    choices = KFileChoices(path)
+    try:
+        bits = max(8, len(choices) * bits_per_value)
+        hashes = max(1, round(bits_per_value * log(2)))
+        bloom = bytearray((bits + 7) // 8)
+        # The values are hashed as bytes, the same as KFileChoices checks them.
+        for line in choices._get_lines(): # pylint: disable=W0212
+            for position in _get_bloom_positions(line, bits, hashes):
+                bloom[position >> 3] |= 1 << (position & 7)
+    finally:
+        choices.close()
+
+    with open(bloom_path, "wb") as bloom_file:
+        bloom_file.write(b" ".join([_BLOOM_TAG, str(getsize(path)).encode(), str(bits).encode(), str(hashes).encode()]) + b"\n")
+        bloom_file.write(bloom)
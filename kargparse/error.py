@@ -67,3 +67,27 @@ class KUsageError(KArgParseError):
     the command line did not meet the requirements of the help statement.
     """
 
+class KMultipleErrors(KArgParseError):
+    """
+    This exception is for several errors at once.
+
+    If the parser was created with collect_errors, it keeps parsing
+    after argument and usage errors and raises all of them together.
+    The message has one line for each error and the status is the
+    status of the first error. The errors attribute is the list of
+    KArgumentError and KUsageError exceptions, in the order they were
+    found.
+
+    Arguments:
+        errors (list, required):
+            The exceptions for each error.
+    """
+
+    def __init__(self, errors):
+        super().__init__("\n".join(error.message for error in errors), errors[0].status)
+        self.errors = errors
+
+    def __reduce__(self):
+        """Pickles the exception by its errors."""
+
+        return (self.__class__, (self.errors,))
@@ -9,6 +9,32 @@ project's "README.CREDITS" file.
 """
 
 from argparse import HelpFormatter, ONE_OR_MORE, OPTIONAL, PARSER, REMAINDER, SUPPRESS, ZERO_OR_MORE
+from operator import itemgetter
+from textwrap import TextWrapper
+
+from kargparse.action import get_nargs_range
+
+class _KActionRecord:
+    """
+    Object that holds the formatted parts of an argument.
+
+    The usage statement, the help statement, and the mutually exclusive
+    groups all format the same parts of an argument, and sorting the
+    optional arguments formats them again. Each part is formatted the
+    first time it's needed and kept here for the rest of the formatter's
+    life. A part that hasn't been formatted yet is None.
+    """
+
+    __slots__ = ("formal_name", "input", "invocation", "metavar", "options", "ordered_options", "sort_key")
+
+    def __init__(self):
+        self.formal_name = None
+        self.input = None
+        self.invocation = None
+        self.metavar = None
+        self.options = None
+        self.ordered_options = None
+        self.sort_key = None
 
 class KHelpFormatter(HelpFormatter):
     """
@@ -56,6 +82,10 @@ class KHelpFormatter(HelpFormatter):
         self._delimeter = delimeter
         self._prefix_chars = prefix_chars
 
+        # These are the formatted parts of each argument. See the
+        # _get_action_record() method.
+        self._action_records = {}
+
         # Check the allowed_types.
         if not isinstance(self._allowed_types, dict):
             raise TypeError("A dictionary is the only allowed type value.")
@@ -187,11 +217,30 @@ class KHelpFormatter(HelpFormatter):
                 The argument to format the input for.
         """
 
+        # Use the formatted input from earlier, if there is one.
+        record = self._get_action_record(action)
+        if record.input is not None:
+            return record.input
+
         formatted_input = ""
         # Get the formatted metavar for this action.
         formatted_metavar = self._format_metavar(action)
+        # Get the range for the "N+" and "{m,n}" expressions.
+        nargs_range = get_nargs_range(action.nargs)
         # Build the formatted input.
-        if action.nargs is None:
+        if nargs_range is not None:
+            minimum, maximum = nargs_range
+            required = ["<{0}>".format(formatted_metavar)] * minimum
+            # Any number of additional values are allowed for "N+".
+            if maximum is None:
+                formatted_input = "[<{0}> [...]]".format(formatted_metavar)
+            # Otherwise, nest the optional values, e.g. [<a> [<a>]].
+            else:
+                for _ in range(maximum - minimum):
+                    formatted_input = "[<{0}>{1}]".format(formatted_metavar, " " + formatted_input if formatted_input else "")
+            # If there are no optional values, the extra space is stripped.
+            formatted_input = " ".join(required + [formatted_input]).strip()
+        elif action.nargs is None:
             # None is the default value for action.nargs.
             formatted_input = "<{0}>".format(formatted_metavar)
         elif action.nargs == OPTIONAL:
@@ -209,7 +258,8 @@ class KHelpFormatter(HelpFormatter):
             # If action.nargs is zero, formatted_input will be an empty string.
             formatted_input = (("<{0}> " * action.nargs).format(formatted_metavar)).strip()
 
-        # Return the formatted input.
+        # Keep and return the formatted input.
+        record.input = formatted_input
         return formatted_input
 
     def _format_action_invocation(self, action):
@@ -229,6 +279,11 @@ class KHelpFormatter(HelpFormatter):
                 The formatted argument header.
         """
 
+        # Use the header from earlier, if there is one.
+        record = self._get_action_record(action)
+        if record.invocation is not None:
+            return record.invocation
+
         # If there are option_strings for this action, it is an optional argument.
         if action.option_strings:
             parts = []
@@ -250,7 +305,8 @@ class KHelpFormatter(HelpFormatter):
             formatted_input = self._format_action_input(action)
             action_header = formatted_input
 
-        # Return the formatted action header.
+        # Keep and return the formatted action header.
+        record.invocation = action_header
         return action_header
 
     def _format_actions_usage(self, actions, groups):
@@ -327,19 +383,16 @@ class KHelpFormatter(HelpFormatter):
                     break
 
         # Format the required-optional actions.
-        if optionals:
-            # Sort the optionals.
-            optionals.sort(key=self._format_option_strings)
-            for action in optionals:
-                # Only format required optionals.
-                if action.required:
-                    # Get the formatted options for this action. The default format is {-s|--long}.
-                    formatted_options = self._format_option_strings(action, key=False)
-                    # Get the formatted input for this action.
-                    formatted_input = self._format_action_input(action)
-
-                    parts.append(formatted_options)
-                    parts.append(formatted_input)
+        # Only the required optionals are sorted, since they are the only ones formatted.
+        required_optionals = sorted([action for action in optionals if action.required], key=self._format_option_strings)
+        for action in required_optionals:
+            # Get the formatted options for this action. The default format is {-s|--long}.
+            formatted_options = self._format_option_strings(action, key=False)
+            # Get the formatted input for this action.
+            formatted_input = self._format_action_input(action)
+
+            parts.append(formatted_options)
+            parts.append(formatted_input)
 
         # Add the formatted mutally exclusive groups here.
         for formatted_group in formatted_groups:
@@ -396,6 +449,11 @@ class KHelpFormatter(HelpFormatter):
                 The formatted metavar.
         """
 
+        # Use the formatted metavar from earlier, if there is one.
+        record = self._get_action_record(action)
+        if record.metavar is not None:
+            return record.metavar
+
         formatted_metavar = ""
         # Try to get any subactions for this action.
         subactions = ""
@@ -425,7 +483,8 @@ class KHelpFormatter(HelpFormatter):
         else:
             formatted_metavar = action.metavar
 
-        # Return the formatted metavar.
+        # Keep and return the formatted metavar.
+        record.metavar = formatted_metavar
         return formatted_metavar
 
     def _format_mutually_exclusive_group(self, group):
@@ -505,7 +564,11 @@ class KHelpFormatter(HelpFormatter):
                 The formatted option_strings.
         """
 
-        formatted_options = []
+        # Use the formatted options from earlier, if there are any.
+        record = self._get_action_record(action)
+        formatted_options = record.sort_key if key else record.options
+        if formatted_options is not None:
+            return formatted_options
 
         # Get the ordered options.
         ordered_options = self._order_option_strings(action)
@@ -516,10 +579,12 @@ class KHelpFormatter(HelpFormatter):
             ordered_options = [prefixed_option.lstrip(self._prefix_chars).lower() for prefixed_option in ordered_options]
             # Format the options.
             formatted_options = "".join(ordered_options)
+            record.sort_key = formatted_options
         else:
             # Format the options.
             formatted_options = self._delimeter.join(ordered_options)
             formatted_options = "{{{}}}".format(formatted_options)
+            record.options = formatted_options
 
         # Return the formatted options.
         return formatted_options
@@ -566,16 +631,8 @@ class KHelpFormatter(HelpFormatter):
             action_usage = "{} {}".format(self._prog, action_usage)
 
             # Wrap the usage statement.
-            # The first line of the usage is wrapped without an indent.
-            usage_lines = self._split_lines(action_usage, self._width - indent)
-            parts.append("{}\n".format(usage_lines[0]))
-            # The first line is then removed from the usage statement.
-            action_usage = action_usage[len(usage_lines[0]):]
-            # The rest of the usage is wrapped with an indent.
-            indent += self._indent_increment
-            usage_lines = self._split_lines(action_usage, self._width - indent)
-            for line in usage_lines:
-                parts.append("{}{}\n".format(" " * indent, line))
+            for line in self._wrap_usage(action_usage, indent):
+                parts.append("{}\n".format(line))
 
             # Join all of the individual parts together.
             usage = self._join_parts(parts)
@@ -583,6 +640,120 @@ class KHelpFormatter(HelpFormatter):
         # Add the prefix and return the usage statement.
         return "{}{}\n".format(prefix, usage)
 
+    def _is_same_rest(self, wrapper, text, position):
+        """
+        Checks if the rest of a text is split the same on its own.
+
+        A text is wrapped by splitting it into chunks: the whitespace,
+        the words, and the parts of hyphenated words. The first line of
+        the usage can end at a space, after a hyphen, or in the middle
+        of a long word. A word starts after a space, so it is split into
+        the same chunks wherever it is. Only the word the first line
+        ends in has to be checked.
+
+        Arguments:
+            wrapper (class, required):
+                The TextWrapper that wrapped the text.
+            text (string, required):
+                The text, with single spaces.
+            position (integer, required):
+                The end of the first line.
+
+        Returns:
+            boolean:
+                True if the text after the position is split into the
+                same chunks on its own as in the whole text.
+        """
+
+        # The rest always starts with a new word after a space.
+        if text[position] == " ":
+            return True
+
+        # Find the word the first line ends in.
+        start = text.rfind(" ", 0, position) + 1
+        end = text.find(" ", position)
+        if end == -1:
+            end = len(text)
+
+        # Take the chunks of the word that are left after the first line.
+        rest_chunks = []
+        consumed = position - start
+        for chunk in wrapper.wordsep_re.split(text[start:end]):
+            if consumed >= len(chunk):
+                consumed -= len(chunk)
+                continue
+            rest_chunks.append(chunk[consumed:])
+            consumed = 0
+
+        # Compare them with the chunks of the rest of the word on its own.
+        return rest_chunks == [chunk for chunk in wrapper.wordsep_re.split(text[position:end]) if chunk]
+
+    def _wrap_usage(self, action_usage, indent):
+        """
+        Wraps the usage statement.
+
+        The first line of the usage is wrapped without an indent, and the
+        rest of the usage is wrapped with an indent. A usage of thousands
+        of required options is tens of kilobytes long, so it is wrapped in
+        one pass, with the indent of the rest of the usage as the
+        subsequent indent. That is the same as wrapping the whole usage
+        to find the first line and then wrapping the rest again, as long
+        as the usage has no extra whitespace and the rest of the usage is
+        split into the same chunks on its own (see the _is_same_rest()
+        method). Otherwise, the usage is wrapped in those two passes.
+
+        Arguments:
+            action_usage (string, required):
+                The usage, starting with the program name.
+            indent (integer, required):
+                The length of the prefix.
+
+        Returns:
+            list:
+                The lines of the usage. Each line after the first one
+                starts with its indent.
+        """
+
+        rest_indent = " " * (indent + self._indent_increment)
+
+        # Wrap the usage in one pass, if it's the same as two passes.
+        if self._whitespace_matcher.sub(" ", action_usage).strip() == action_usage:
+            wrapper = TextWrapper(width=self._width - indent, subsequent_indent=" " * self._indent_increment)
+            usage_lines = wrapper.wrap(action_usage)
+            if len(usage_lines) == 1 or self._is_same_rest(wrapper, action_usage, len(usage_lines[0])):
+                return [usage_lines[0]] + [" " * indent + line for line in usage_lines[1:]]
+
+        # The first line of the usage is wrapped without an indent.
+        usage_lines = self._split_lines(action_usage, self._width - indent)
+        first_line = usage_lines[0]
+        # The first line is then removed from the usage statement.
+        action_usage = action_usage[len(first_line):]
+        # The rest of the usage is wrapped with an indent.
+        usage_lines = self._split_lines(action_usage, self._width - len(rest_indent))
+
+        return [first_line] + [rest_indent + line for line in usage_lines]
+
+    def _get_action_record(self, action):
+        """
+        Gets the formatted parts of an argument.
+
+        Arguments:
+            action (class, required):
+                The argument to get the formatted parts of.
+
+        Returns:
+            _KActionRecord:
+                The parts formatted so far.
+        """
+
+        record = self._action_records.get(action)
+        if record is None:
+            record = _KActionRecord()
+            self._action_records[action] = record
+
+        # Return the record.
+        return record
+
     def _get_formal_name(self, action):
         """
         Gets the formal name of an argument with option_strings.
@@ -601,6 +772,11 @@ class KHelpFormatter(HelpFormatter):
                 The formal name.
         """
 
+        # Use the formal name from earlier, if there is one.
+        record = self._get_action_record(action)
+        if record.formal_name is not None:
+            return record.formal_name
+
         # Get the formal name for this action.
         formal_name = ""
         for option in action.option_strings:
@@ -615,7 +791,8 @@ class KHelpFormatter(HelpFormatter):
         if not formal_name:
             formal_name = action.option_strings[0]
 
-        # Return the formal name.
+        # Keep and return the formal name.
+        record.formal_name = formal_name
         return formal_name
 
     def _order_option_strings(self, action):
@@ -637,23 +814,121 @@ class KHelpFormatter(HelpFormatter):
                 The ordered option_strings.
         """
 
-        ordered_options = []
+        # Use the ordered options from earlier, if there are any.
+        record = self._get_action_record(action)
+        if record.ordered_options is not None:
+            return record.ordered_options
 
-        # Ignore case and sort the option_strings.
+        # Ignore case and sort the option_strings, and find the length of each prefix.
         sorted_prefixed_options = sorted(action.option_strings, key=str.casefold)
-        # Find the length of the longest prefix.
-        longest_prefix_length = len(sorted_prefixed_options[0]) - len(sorted_prefixed_options[0].lstrip(self._prefix_chars))
+        prefixed_options = [(len(prefixed_option) - len(prefixed_option.lstrip(self._prefix_chars)), prefixed_option) for prefixed_option in sorted_prefixed_options]
+        # The prefix of the first option is taken as the longest prefix.
+        longest_prefix_length = prefixed_options[0][0]
 
-        # Loop through the prefix lengths in ascending order.
-        for prefix_length in range(1, longest_prefix_length+1):
-            for prefixed_option in sorted_prefixed_options:
-                # Check if the prefix_length matches the prefixed_option's prefix_length.
-                if prefix_length == len(prefixed_option) - len(prefixed_option.lstrip(self._prefix_chars)):
-                    ordered_options.append(prefixed_option)
+        # Order the options by the length of their prefixes. The sort is
+        # stable, so options with the same prefix length stay in order.
+        prefixed_options.sort(key=itemgetter(0))
+        ordered_options = [prefixed_option for prefix_length, prefixed_option in prefixed_options if 1 <= prefix_length <= longest_prefix_length]
 
-        # Return the ordered options.
+        # Keep and return the ordered options.
+        record.ordered_options = ordered_options
         return ordered_options
 
+    def _iter_section_parts(self, section):
+        """
+        Yields the parts of a section one at a time.
+
+        The parts are the same as the ones the section's format_help()
+        method joins together, including those of any nested section,
+        but each one is formatted only when it's needed.
+
+        Arguments:
+            section (class, required):
+                The _Section to format.
+
+        Yields:
+            string:
+                The next non-empty part of the section.
+        """
+
+        # The heading is indented the same as the section's parent.
+        heading = ""
+        if section.heading is not SUPPRESS and section.heading is not None:
+            heading = "{}{}:\n".format(" " * self._current_indent, section.heading)
+
+        if section.parent is not None:
+            self._indent()
+        try:
+            has_parts = False
+            for function, arguments in section.items:
+                # Format a nested section one part at a time as well.
+                nested_section = getattr(function, "__self__", None)
+                if isinstance(nested_section, self._Section) and function.__name__ == "format_help":
+                    parts = self._iter_section_parts(nested_section)
+                else:
+                    parts = (function(*arguments),)
+                for part in parts:
+                    if not part or part is SUPPRESS:
+                        continue
+                    # The heading only goes in front of a section that isn't empty.
+                    if not has_parts:
+                        has_parts = True
+                        yield "\n"
+                        if heading:
+                            yield heading
+                    yield part
+            if has_parts:
+                yield "\n"
+        finally:
+            if section.parent is not None:
+                self._dedent()
+
+    def add_argument(self, action):
+        """
+        Adds an argument to the help statement.
+
+        Argparse formats the invocation of every argument as it's added,
+        to find the column the help of each argument starts in. The help
+        of an argument is put under its invocation here, not in a column
+        (see the _format_action() method), so the invocation is only
+        formatted once the argument is.
+
+        Arguments:
+            action (class, required):
+                The argument to add.
+        """
+
+        if action.help is not SUPPRESS:
+            self._add_item(self._format_action, [action])
+
+    def _format_sorted_action(self, actions, sorted_actions, position):
+        """Sorts the arguments the first time, and formats one of them."""
+
+        if not sorted_actions:
+            sorted_actions.extend(sorted(actions, key=self._format_option_strings))
+
+        return self._format_action(sorted_actions[position])
+
+    def add_sorted_arguments(self, actions):
+        """
+        Adds arguments to the help statement, sorted by their option strings.
+
+        This is the same as sorting the arguments with the method from
+        get_format_option_strings() and adding them, except they aren't
+        sorted until the first one is formatted. Then the help statement
+        can be written up to that point first (see the write_help()
+        method).
+
+        Arguments:
+            actions (list, required):
+                The arguments to add.
+        """
+
+        actions = [action for action in actions if action.help is not SUPPRESS]
+        sorted_actions = []
+        for position in range(len(actions)):
+            self._add_item(self._format_sorted_action, [actions, sorted_actions, position])
+
     def format_help(self):
         """
         Formats the help statement.
@@ -668,11 +943,34 @@ class KHelpFormatter(HelpFormatter):
                 The formatted help statement.
         """
 
-        help_statement = self._root_section.format_help()
+        return self.normalize_help(self._root_section.format_help())
+
+    def normalize_help(self, help_statement, full=None):
+        """
+        Removes the extra newlines from a help statement.
+
+        This is the last step of format_help(). It is separate so a help
+        statement that was assembled from parts formatted earlier (see
+        KArgumentParser's format_help() method) ends up the same as one
+        formatted all at once.
+
+        Arguments:
+            help_statement (string, required):
+                The help statement from the root section.
+            full (boolean, optional):
+                True if the text is part of the help statement even if it
+                has no usage or argument headings, e.g. the help for a
+                topic (default: None, decided by the text).
+
+        Returns:
+            string:
+                The help statement with the proper amount of newlines.
+        """
+
         if help_statement:
             help_statement = self._long_break_matcher.sub("\n\n", help_statement).strip("\n")
             # Format the help statement with the proper amount of newlines.
-            if "Usage:" in help_statement or "Positional Arguments:" in help_statement or "Additional Required Arguments and/or Options:" in help_statement:
+            if full or "Usage:" in help_statement or "Positional Arguments:" in help_statement or "Additional Required Arguments and/or Options:" in help_statement:
                 help_statement = "\n{}\n\n".format(help_statement)
             # This format is specifically for the version action.
             else:
@@ -686,3 +984,71 @@ class KHelpFormatter(HelpFormatter):
 
         return self._format_option_strings
 
+    def write_help(self, file):
+        """
+        Writes the help statement to a file.
+
+        This is the same as writing the result of format_help(), except
+        the help statement is never put together as one string. Each part
+        is written as soon as it's formatted, and the extra newlines are
+        removed as the parts go by. The file is flushed once the first
+        part is written, so the usage shows up right away, and again at
+        the end.
+
+        Whether the help statement starts with a newline depends on what
+        it contains (see the normalize_help() method). The usage comes
+        first and settles that, so nothing has to be held back for long.
+
+        Arguments:
+            file (file, required):
+                The file to write the help statement to.
+        """
+
+        markers = ("Usage:", "Positional Arguments:", "Additional Required Arguments and/or Options:")
+        # A file only needs a write() method, the same as for argparse.
+        flush = getattr(file, "flush", None)
+        # The parts held back until it's known how the help statement starts.
+        held_parts = []
+        # The end of the text so far, so a marker split across parts is found.
+        tail = ""
+        has_marker = False
+        has_parts = False
+        has_text = False
+        # The newlines after the last text, which aren't written until more text follows.
+        newlines = 0
+
+        for part in self._iter_section_parts(self._root_section):
+            has_parts = True
+            text = part.lstrip("\n")
+            newlines += len(part) - len(text)
+            if not text:
+                continue
+
+            # A run of newlines between two texts becomes at most two newlines.
+            stripped_text = text.rstrip("\n")
+            body = "{}{}".format("\n" * min(newlines, 2) if has_text else "", self._long_break_matcher.sub("\n\n", stripped_text))
+            newlines = len(text) - len(stripped_text)
+            has_text = True
+
+            if has_marker:
+                file.write(body)
+                continue
+
+            # Hold the text back until a marker is found.
+            held_parts.append(body)
+            tail = (tail + body)[-max(map(len, markers)):]
+            if any(marker in tail for marker in markers):
+                has_marker = True
+                file.write("\n{}".format("".join(held_parts)))
+                held_parts = None
+                if flush is not None:
+                    flush()
+
+        # Write the end of the help statement, the same as normalize_help().
+        if has_parts:
+            if has_marker:
+                file.write("\n\n")
+            else:
+                file.write("{}\n".format("".join(held_parts)))
+        if flush is not None:
+            flush()
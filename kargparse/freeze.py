@@ -0,0 +1,348 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# The help statement and the version of a released program never change,
+# yet printing either one means building the whole parser first. Freezing
+# a parser renders its help statement and version ahead of time, at each
+# line width the program uses, into a small generated Python module:
+#
+#   python -m kargparse.freeze mytool.cli:build_parser mytool/frozen_help.py
+#
+# or from setup.py with the freeze_parser() function. The builder is a
+# module level function that takes no arguments and returns the parser,
+# the same as for the snapshot and parallel modules.
+#
+# A parser created with frozen="mytool.frozen_help" checks the command line
+# as soon as it is created, before any arguments are added. If the only
+# argument is one of the help or version options, the frozen text is
+# printed and the program exits. Only the usage statement and the error
+# diagnostics depend on what went wrong, so they are never frozen.
+#
+# The frozen module is keyed by a hash of the source file that declares
+# the builder, along with the KArgParse, argparse, and Python versions,
+# the same as a snapshot. The source files of the other modules in the
+# builder's package, and of every module loaded while the builder runs,
+# are hashed too, so changing the help of an argument declared in another
+# module of the program is noticed. The names of those modules are kept
+# in the frozen module. A change that doesn't touch any of these source
+# files (e.g., a help string read from a data file, or a module that was
+# loaded before the freeze and is outside the builder's package) isn't
+# noticed, so freeze the parser again if the help depends on one. The
+# program name and the line width must also match. If anything doesn't
+# match, the frozen text is ignored and the parser is built and formats
+# the text as usual, so a stale module is never printed. Run the freeze
+# again for each release.
+#
+# Hashing every source file each time the help is printed would take
+# longer than building a small parser, so the frozen module also keeps
+# the path, modification time, and size of each source file, along with
+# the versions. If none of them changed, the key isn't computed again,
+# the same as make decides whether a file is out of date. Only when one
+# of them changed are the source files hashed, so a file that was only
+# touched still matches.
+#
+# The program name is usually taken from sys.argv[0], which is the freeze
+# itself (or setup.py) while the parser is being frozen. The program name
+# has to be given to freeze_parser() (or with --prog), unless the builder
+# passes prog to the parser.
+
+from argparse import _HelpAction, _VersionAction, __version__ as argparse_version_string
+from hashlib import sha256
+from importlib import import_module
+from importlib.util import find_spec
+from os import getpid, remove, replace, stat
+from os.path import basename
+import sys
+
+from kargparse import VERSION
+from kargparse.action import KHelpAction
+
+# The versions that are part of the key.
+_VERSIONS = "\0".join([str(VERSION), argparse_version_string, "{}.{}".format(*sys.version_info[:2])])
+
+# This is True while freeze_parser() calls the builder, so the parser it
+# builds never prints the frozen text, whatever the command line is.
+_freezing = False
+
+def _get_builder(name):
+    """Returns the builder for a "module:function" name."""
+
+    module_name, _, qualname = name.partition(":")
+    try:
+        builder = import_module(module_name)
+        for attribute in qualname.split("."):
+            builder = getattr(builder, attribute)
+    except (AttributeError, ImportError, ValueError):
+        raise ValueError(name) from None
+    if not callable(builder):
+        raise ValueError(name)
+
+    return builder
+
+def _get_path(module_name):
+    """Returns the path of a module's source file, or None if it can't be found."""
+
+    # Use the module that is already loaded, otherwise find its source file without loading it.
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if path is None:
+        try:
+            path = find_spec(module_name).origin
+        except (AttributeError, ImportError, ValueError):
+            return None
+
+    return path
+
+def _get_source(module_name):
+    """Returns the contents of a module's source file, or None if it can't be read."""
+
+    path = _get_path(module_name)
+    try:
+        with open(path, "rb") as source_file:
+            return source_file.read()
+    except (OSError, TypeError):
+        return None
+
+def _get_module_names(builder_module_name, loaded_module_names):
+    """Returns the names of the modules, other than the builder's, whose source files are part of the key."""
+
+    package = builder_module_name.partition(".")[0] + "."
+    module_names = []
+    for module_name, module in list(sys.modules.items()):
+        # KArgParse is covered by its version.
+        if module_name == builder_module_name or module_name.partition(".")[0] == "kargparse":
+            continue
+        if module_name.startswith(package) or module_name not in loaded_module_names:
+            # Modules without a source file (e.g., builtin modules) are left out.
+            if isinstance(getattr(module, "__file__", None), str) and _get_source(module_name) is not None:
+                module_names.append(module_name)
+
+    return tuple(sorted(module_names))
+
+def _get_stamps(paths):
+    """Returns the versions and the path, modification time, and size of each file, or None if a file is missing."""
+
+    stamps = []
+    try:
+        for path in paths:
+            status = stat(path)
+            stamps.append((path, status.st_mtime_ns, status.st_size))
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return (_VERSIONS, tuple(stamps))
+
+def get_frozen_key(name, module_names=()):
+    """
+    Computes the key for a builder's frozen module.
+
+    Arguments:
+        name (string, required):
+            The builder, as "module:function".
+        module_names (list, optional):
+            The names of the other modules whose source files are part
+            of the key (default: No other modules).
+
+    Returns:
+        string:
+            The key, or None if the source file of the builder's module
+            or one of the other modules can't be read.
+    """
+
+    source = _get_source(name.partition(":")[0])
+    if source is None:
+        return None
+
+    digest = sha256(source)
+    for module_name in module_names:
+        source = _get_source(module_name)
+        if source is None:
+            return None
+        digest.update("\0{}\0".format(module_name).encode("utf-8"))
+        digest.update(source)
+    digest.update("\0".join([name, _VERSIONS]).encode("utf-8"))
+
+    return digest.hexdigest()
+
+def get_frozen_text(frozen, prog, line_width, args):
+    """
+    Returns the frozen help statement or version for a command line.
+
+    Arguments:
+        frozen (string, required):
+            The name of the frozen module.
+        prog (string, required):
+            The program name of the parser.
+        line_width (integer, required):
+            The line width of the parser.
+        args (list, required):
+            The arguments from the command line.
+
+    Returns:
+        string:
+            The frozen text to print, or None if the command line isn't
+            just a help or version option, or the frozen module is
+            missing or stale.
+    """
+
+    if _freezing or len(args) != 1:
+        return None
+
+    try:
+        frozen = import_module(frozen)
+        if args[0] in frozen.HELP_OPTIONS:
+            texts = frozen.HELP
+        elif args[0] in frozen.VERSION_OPTIONS:
+            texts = frozen.VERSION
+        else:
+            return None
+        if frozen.PROG != prog or line_width not in texts:
+            return None
+        # Check the stamps of the source files, and only compute the key, which reads all of them, if one changed.
+        if frozen.STAMPS != _get_stamps([stamp[0] for stamp in frozen.STAMPS[1]]) and frozen.KEY != get_frozen_key(frozen.BUILDER, frozen.MODULES):
+            return None
+    # A damaged module is treated the same as a missing module.
+    except Exception: # pylint: disable=W0703
+        return None
+
+    return texts[line_width]
+
+def freeze_parser(builder, path, widths=None, prog=None):
+    """
+    Renders a builder's help statement and version into a Python module.
+
+    The module is written to a temporary file and then moved into place,
+    so a program never imports a partial module.
+
+    Arguments:
+        builder (function, required):
+            A module level function that takes no arguments and returns
+            a fully built parser.
+        path (string, required):
+            The Python file to write the module to.
+        widths (list, optional):
+            The line widths to render the text at (default: The line
+            width of the parser).
+        prog (string, optional):
+            The program name, for a parser that takes it from
+            sys.argv[0]. sys.argv[0] is set to it while the builder runs
+            (default: None).
+
+    Raises:
+        OSError:
+            If the module can't be written.
+        ValueError:
+            If the source file of the builder can't be read, or the
+            parser takes its program name from sys.argv[0] and prog
+            isn't given.
+    """
+
+    global _freezing # pylint: disable=W0603
+
+    name = "{}:{}".format(builder.__module__, builder.__qualname__)
+    if _get_source(builder.__module__) is None:
+        raise ValueError("The source file of {} can't be read.".format(name))
+
+    # Find the modules the builder loads, by comparing the loaded modules before and after it runs.
+    loaded_module_names = set(sys.modules)
+    program = sys.argv[:1]
+    if prog is not None:
+        sys.argv[:1] = [prog]
+    _freezing = True
+    try:
+        parser = builder()
+    finally:
+        _freezing = False
+        sys.argv[:1] = program
+
+    # Check to make sure the program name isn't the name of the program doing the freeze.
+    if prog is None and program and parser.prog == basename(program[0]):
+        raise ValueError("The program name of {} is taken from sys.argv[0] ({}), so it has to be given.".format(name, parser.prog))
+
+    module_names = _get_module_names(builder.__module__, loaded_module_names)
+    key = get_frozen_key(name, module_names)
+    stamps = _get_stamps([_get_path(module_name) for module_name in (builder.__module__,) + module_names])
+
+    # Find the help and version options.
+    help_options, version_options, version = [], [], None
+    for action in parser._actions: # pylint: disable=W0212
+        if isinstance(action, (_HelpAction, KHelpAction)):
+            help_options.extend(action.option_strings)
+        elif isinstance(action, _VersionAction):
+            version_options.extend(action.option_strings)
+            version = action.version if action.version is not None else getattr(parser, "version", None)
+
+    # Render the text at each width, the same as the help and version actions print it.
+    line_width = parser._line_width # pylint: disable=W0212
+    help_texts, version_texts = {}, {}
+    try:
+        for width in widths or [line_width]:
+            parser._line_width = width # pylint: disable=W0212
+            help_texts[width] = parser.format_help()
+            if version_options:
+                formatter = parser._get_formatter() # pylint: disable=W0212
+                formatter.add_text(version)
+                version_texts[width] = formatter.format_help()
+    finally:
+        parser._line_width = line_width # pylint: disable=W0212
+
+    lines = ['"""',
+             "The frozen help statement and version of {}.".format(name),
+             "",
+             "This module was generated by kargparse.freeze. Do not edit it.",
+             '"""',
+             ""]
+    for variable, value in (("BUILDER", name),
+                            ("MODULES", module_names),
+                            ("KEY", key),
+                            ("STAMPS", stamps),
+                            ("PROG", parser.prog),
+                            ("HELP_OPTIONS", tuple(help_options)),
+                            ("VERSION_OPTIONS", tuple(version_options)),
+                            ("HELP", help_texts),
+                            ("VERSION", version_texts)):
+        lines.append("{} = {!r}".format(variable, value))
+
+    temporary_path = "{}.{}.tmp".format(path, getpid())
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as module_file:
+            module_file.write("\n".join(lines) + "\n")
+        replace(temporary_path, path)
+    except OSError:
+        try:
+            remove(temporary_path)
+        except OSError:
+            pass
+        raise
+
+def main(args=None):
+    """
+    Freezes a parser from the command line.
+
+    Arguments:
+        args (list, optional):
+            The arguments (default: sys.argv[1:]).
+    """
+
+    # The parser module imports this one, so it is imported here.
+    from kargparse.parser import KArgumentParser # pylint: disable=C0415
+
+    parser = KArgumentParser(prog="python -m kargparse.freeze",
+                             description="Render the help statement and version of a parser into a Python module.")
+    parser.modify_allowed_types(add={"_get_builder" : "module:function"})
+    parser.add_argument("builder", type=_get_builder, help="The module level function that builds the parser.")
+    parser.add_argument("path", help="The Python file to write the frozen module to.")
+    parser.add_argument("-w", "--width", action="append", type=int, help="A line width to render the text at. Repeat it for more than one width (default: The line width of the parser).")
+    parser.add_argument("-p", "--prog", help="The program name, for a parser that takes it from sys.argv[0] (default: The prog the builder passes to the parser).")
+    arguments = parser.parse_args(args)
+
+    freeze_parser(arguments.builder, arguments.path, arguments.width, arguments.prog)
+
+if __name__ == "__main__":
+    main()
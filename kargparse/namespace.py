@@ -0,0 +1,157 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# A slotted namespace stores each of a parser's dests in a slot instead
+# of the instance dictionary, which makes it considerably smaller when
+# a large number of parse results are kept in memory. The classes are
+# generated from the dests the first time a parser needs one, and the
+# same dests always produce the same class. A dest that isn't a valid
+# identifier, or one that isn't known until parse time (e.g., the dests
+# of a subparser), is stored in the instance dictionary as usual.
+#
+# The vars() function only returns the instance dictionary, so it does
+# not show the dests stored in slots. Use the _get_kwargs() method or
+# dict(namespace) instead.
+
+from argparse import Namespace
+from keyword import iskeyword
+
+_NAMESPACE_CLASSES = {}
+
+class KSlotsNamespace(Namespace):
+    """
+    Object that extends argparse's Namespace.
+
+    This is the base class for the generated slotted namespaces. It
+    behaves the same as Namespace, except for vars() (see the comments
+    at the top of this module).
+    """
+
+    __slots__ = ()
+
+    def __contains__(self, key):
+        """Returns True if the namespace has the attribute."""
+
+        return hasattr(self, key)
+
+    def __eq__(self, other):
+        """Returns True if both namespaces have the same attributes."""
+
+        if not isinstance(other, Namespace):
+            return NotImplemented
+
+        return dict(self._get_kwargs()) == dict(other._get_kwargs())
+
+    __hash__ = None
+
+    def __iter__(self):
+        """Iterates over the (name, value) pairs, so dict() works."""
+
+        return iter(self._get_kwargs())
+
+    def __reduce__(self):
+        """Pickles the namespace by its slots, not its generated class."""
+
+        return (_restore_namespace, (self.__slots__, self._get_kwargs()))
+
+    def _get_kwargs(self):
+        """Returns the (name, value) pairs, slots first."""
+
+        kwargs = []
+        for name in self.__slots__:
+            try:
+                kwargs.append((name, getattr(self, name)))
+            except AttributeError:
+                pass
+        kwargs.extend(self.__dict__.items())
+
+        return kwargs
+
+def get_namespace_class(dests):
+    """
+    Returns the slotted namespace class for a list of dests.
+
+    Arguments:
+        dests (iterable, required):
+            The dests of a parser's arguments. The dests that aren't
+            valid identifiers are skipped.
+
+    Returns:
+        class:
+            A subclass of KSlotsNamespace with a slot for each dest.
+    """
+
+    slots = []
+    for dest in dests:
+        if dest.isidentifier() and not iskeyword(dest) and not dest.startswith("__") and dest not in slots:
+            slots.append(dest)
+    slots = tuple(slots)
+
+    namespace_class = _NAMESPACE_CLASSES.get(slots)
+    if namespace_class is None:
+        namespace_class = type("Namespace", (KSlotsNamespace,), {"__slots__" : slots, "__module__" : __name__})
+        _NAMESPACE_CLASSES[slots] = namespace_class
+
+    return namespace_class
+
+def get_namespace_factory(dests, defaults):
+    """
+    Returns a function that creates a slotted namespace with defaults.
+
+    Setting hundreds of slots one at a time with setattr() is slow, so
+    the defaults that go in slots are set with a generated function that
+    assigns all of them in one statement. The generated source only
+    contains the dests that passed the identifier check.
+
+    Arguments:
+        dests (iterable, required):
+            The dests of a parser's arguments.
+        defaults (dictionary, required):
+            The defaults to add to each new namespace.
+
+    Returns:
+        function:
+            A function that takes no arguments and returns a new
+            namespace.
+    """
+
+    namespace_class = get_namespace_class(dests)
+    slots = set(namespace_class.__slots__)
+    slot_names = tuple(name for name in defaults if name in slots)
+    slot_values = tuple(defaults[name] for name in slot_names)
+    other_defaults = {name : value for name, value in defaults.items() if name not in slots}
+
+    # Generate the function that sets the slots.
+    if slot_names:
+        source = "def set_slots(namespace, values):\n    {}, = values\n".format(", ".join("namespace." + name for name in slot_names))
+        scope = {}
+        exec(source, scope) # pylint: disable=W0122
+        set_slots = scope["set_slots"]
+    else:
+        set_slots = None
+
+    def create_namespace():
+        namespace = namespace_class()
+        if set_slots is not None:
+            set_slots(namespace, slot_values)
+        if other_defaults:
+            namespace.__dict__.update(other_defaults)
+        return namespace
+
+    return create_namespace
+
+def _restore_namespace(slots, kwargs):
+    """Returns an unpickled slotted namespace."""
+
+    namespace = get_namespace_class(slots)()
+    for name, value in kwargs:
+        setattr(namespace, name, value)
+
+    return namespace
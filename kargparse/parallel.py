@@ -0,0 +1,114 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# Parallel parsing spreads a batch of command lines over a pool of worker
+# processes. A parser can hold functions (e.g., for type or choices) that
+# can't be pickled, so the parser itself is never sent to the workers.
+# Instead, each worker is given the builder, which is a module level
+# function that takes no arguments and returns the parser. A builder is
+# pickled by reference, so it is small and always picklable. Each worker
+# calls the builder once, then parses its chunks of command lines with
+# the parser's parse_many() method. If a snapshot directory is given,
+# the workers load the parser from its snapshot (see the snapshot module).
+#
+# The results are returned in the same order as the command lines, and
+# the command lines are read from the iterable one chunk at a time, so a
+# large batch doesn't have to fit in memory.
+
+from itertools import islice
+from multiprocessing import get_context
+
+from kargparse.snapshot import build_parser
+
+# This is the parser built by each worker process.
+_worker_parser = None
+
+def _initialize_worker(builder, cache_dir):
+    """Builds the parser for a worker process."""
+
+    global _worker_parser # pylint: disable=W0603
+
+    if cache_dir is None:
+        _worker_parser = builder()
+    else:
+        _worker_parser = build_parser(builder, cache_dir)
+
+def _parse_chunk(argvs):
+    """Parses a chunk of command lines in a worker process."""
+
+    return list(_worker_parser.parse_many(argvs))
+
+def _get_chunks(argvs, chunksize):
+    """Yields the command lines in lists of chunksize."""
+
+    argvs = iter(argvs)
+    chunk = list(islice(argvs, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(argvs, chunksize))
+
+def _parse_chunks(builder, argvs, processes, chunksize, cache_dir, context):
+    """Yields the result for each command line, parsed in chunks by a pool of worker processes."""
+
+    # The chunks are already lists of command lines, so the pool sends them one at a time.
+    with get_context(context).Pool(processes, _initialize_worker, (builder, cache_dir)) as pool:
+        for results in pool.imap(_parse_chunk, _get_chunks(argvs, chunksize)):
+            yield from results
+
+def parse_parallel(builder, argvs, processes=None, chunksize=500, cache_dir=None, context=None):
+    """
+    Parses many command lines with a pool of worker processes.
+
+    Each command line is parsed the same as KArgumentParser's
+    parse_many() method, so the results are the same as calling
+    parse_many() with the builder's parser.
+
+    Arguments:
+        builder (function, required):
+            A module level function that takes no arguments and returns
+            a fully built parser.
+        argvs (iterable, required):
+            The command lines to parse. Each command line is a list
+            of argument strings, without the program name.
+        processes (integer, optional):
+            The number of worker processes (default: The number of
+            CPUs).
+        chunksize (integer, optional):
+            The number of command lines sent to a worker at a time
+            (default: 500).
+        cache_dir (string, optional):
+            If given, the workers load the parser from its snapshot in
+            this directory instead of calling the builder (default: None).
+        context (string, optional):
+            The multiprocessing start method, e.g. "fork" or "spawn"
+            (default: The platform's default).
+
+    Returns:
+        generator:
+            The result for each command line, in order, a namespace or a
+            KArgParseError. See the parse_many() method for additional
+            help. The generator raises a KProgramError if there is a
+            programming error in a worker.
+
+    Raises:
+        TypeError:
+            If the chunksize is not an integer.
+        ValueError:
+            If the chunksize is less than one.
+    """
+
+    # Check the chunksize.
+    if not isinstance(chunksize, int):
+        raise TypeError("A integer is the only allowed type value for chunksize.")
+    if chunksize < 1:
+        raise ValueError("The chunksize must be at least 1.")
+
+    # The arguments are checked when parse_parallel() is called, and the pool is only started once the results are asked for.
+    return _parse_chunks(builder, argvs, processes, chunksize, cache_dir, context)
@@ -10,14 +10,433 @@ project's "README.CREDITS" file.
 
 # The second line of argparse imports are strictly here so that the
 # coder can access them through this module for a custom use.
-from argparse import ArgumentError, ArgumentTypeError, ArgumentParser, Namespace, __version__ as argparse_version_string, SUPPRESS, _UNRECOGNIZED_ARGS_ATTR
+from argparse import ArgumentError, ArgumentTypeError, ArgumentParser, Namespace, __version__ as argparse_version_string, SUPPRESS, _SubParsersAction, _UNRECOGNIZED_ARGS_ATTR
+from argparse import ONE_OR_MORE, OPTIONAL, PARSER, REMAINDER, ZERO_OR_MORE
 from argparse import Action, ArgumentDefaultsHelpFormatter, FileType, HelpFormatter, MetavarTypeHelpFormatter, RawDescriptionHelpFormatter, RawTextHelpFormatter # pylint: disable=W0611
-from inspect import signature
-from re import match
-from sys import argv, stderr
-
+from asyncio import gather
+from bisect import bisect_left
+from functools import partial
+from itertools import repeat
+from inspect import isawaitable, iscoroutine, signature
+from operator import attrgetter, contains, is_
+from os.path import realpath
+from re import compile as compile_regex
+from shlex import split as split_shell
+import sys
+from threading import local
+from time import monotonic
+
+from kargparse.action import KHelpAction, KSubParsersAction, get_nargs_range
+from kargparse.choices import KFileChoices, get_choices_index, get_choices_predicate
 from kargparse.formatter import KHelpFormatter
-from kargparse.error import KArgumentError, KProgramError, KUsageError
+from kargparse.freeze import get_frozen_text
+from kargparse.namespace import get_namespace_factory
+from kargparse.suggest import KSuggestionIndex
+from kargparse.topics import KHelpIndex
+from kargparse.vector import convert_array, get_array_backend, get_invalid_position, get_range_position, is_array_type
+from kargparse.error import KArgParseError, KArgumentError, KMultipleErrors, KProgramError, KUsageError
+
+def _identity(string):
+    """
+    Return the string unchanged.
+
+    This is the default type conversion function. It replaces the one
+    argparse registers, which is a nested function and therefore can't
+    be pickled. See the snapshot module for why that matters.
+    """
+
+    return string
+
+# Returns the default of an argument.
+_get_default = attrgetter("default")
+
+# This is put where the error diagnostics go in a kept help or usage
+# statement. See KArgumentParser's _format_statement() method.
+_DIAGNOSTICS_MARKER = "\0"
+
+# A line without any of these characters is split the same by str.split()
+# as by shlex.split(), which is much slower. These are the quotes, the
+# escape, the comment, and any whitespace that shlex doesn't split on.
+_SHELL_CHARACTERS = compile_regex("[\"'\\\\#]|[^\\S \\t\\r\\n]")
+
+def _split_line(line):
+    """
+    Splits a line into arguments the same as a POSIX shell.
+
+    Arguments:
+        line (string, required):
+            The line to split.
+
+    Returns:
+        list:
+            The arguments. A blank line or a comment has no arguments.
+
+    Raises:
+        ValueError:
+            If a quote isn't closed or the line ends with an escape.
+    """
+
+    if _SHELL_CHARACTERS.search(line) is None:
+        return line.split()
+
+    return split_shell(line, comments=True)
+
+# Starting with Python 3.12, the option tuples that argparse uses to match
+# abbreviated options include the separator between the option string and
+# its explicit argument.
+_OPTION_TUPLE_SEPARATOR = sys.version_info >= (3, 12)
+
+# Starting with Python 3.12, argparse reads argument files with the file
+# system encoding instead of the locale encoding.
+_ARGS_FILE_ENCODING = {"encoding" : sys.getfilesystemencoding(), "errors" : sys.getfilesystemencodeerrors()} if sys.version_info >= (3, 12) else {}
+
+# Argument files are read in chunks of about this many characters.
+_ARGS_FILE_CHUNK_SIZE = 1 << 20
+
+# The nargs metacharacters that argparse supports. See the get_nargs_range()
+# function in the action module for the expressions KArgParse adds.
+_NARGS_METACHARACTERS = (ONE_OR_MORE, OPTIONAL, PARSER, REMAINDER, SUPPRESS, ZERO_OR_MORE)
+
+# This is the dictionary for the errors raised by KArgParse itself. Each error
+# is raised with its kind and parameters, so the error() method doesn't have to
+# match its message (see the _KArgumentError class).
+# The structure of this dictionary is: {"The kind of error." : {"message" : "The message, formatted with the parameters.", "error_type" : "The type of error."}}
+_ERROR_KINDS = {
+    "args_file_cycle" : {"message" : "The argument file {path} includes itself.", "error_type" : "argument"},
+    "awaitable" : {"message" : "The {function} '{name}' returned an awaitable. Use parse_args_async() instead.", "error_type" : "program"},
+    "choices_parameters" : {"message" : "Choices only supports the passing of zero or one argument.", "error_type" : "program"},
+    "array_parameters" : {"message" : "An array only supports the int and float types, and a nargs that takes a list.", "error_type" : "program"},
+    "expected_arguments" : {"message" : "Expected {expected}.", "error_type" : "usage"},
+    "invalid_line" : {"message" : "Invalid line: {error}", "error_type" : "usage"},
+    "invalid_choice" : {"message" : "Invalid choice: {value} (choose from {choices})", "error_type" : "argument"},
+    "invalid_choice_suggestion" : {"message" : "Invalid choice: {value}, maybe you meant {suggestion}? (choose from {choices})", "error_type" : "argument"},
+    "invalid_item_choice" : {"message" : "Invalid choice: {value} at index {index} (value not in choices)", "error_type" : "argument"},
+    "invalid_item_value" : {"message" : "Invalid value: {value} at index {index}", "error_type" : "argument"},
+    "invalid_value" : {"message" : "Invalid value: {value}", "error_type" : "argument"},
+    "not_callable" : {"message" : "{function} is not callable.", "error_type" : "program"},
+    "not_in_choices" : {"message" : "Invalid choice: {value} (value not in choices)", "error_type" : "argument"},
+    "not_in_choices_suggestion" : {"message" : "Invalid choice: {value}, maybe you meant {suggestion}? (value not in choices)", "error_type" : "argument"},
+    "unknown_help_topic" : {"message" : "Unknown help topic: {topic}", "error_type" : "usage"},
+    "unrecognized_arguments" : {"message" : "Unrecognized arguments: {arguments}", "error_type" : "usage"},
+    "unrecognized_arguments_suggestion" : {"message" : "Unrecognized arguments: {arguments} (maybe you meant {suggestion}?)", "error_type" : "usage"},
+    "unsupported_array" : {"message" : "The specified array '{array}' is not supported.", "error_type" : "program"},
+    "unsupported_nargs" : {"message" : "The specified nargs '{nargs}' is not supported.", "error_type" : "program"},
+    "unsupported_nargs_formatter" : {"message" : "Argument {name}: The specified nargs '{nargs}' is only supported by KHelpFormatter.", "error_type" : "program"},
+    "unsupported_type" : {"message" : "The specified type '{type}' is not supported.", "error_type" : "program"}
+}
+
+# This is the list for handling the error messages that come from argparse,
+# which only has a message. Each regular expression is compiled once. The
+# KArgParse messages are matched too, because a type or choices function
+# written by the coder may raise an ArgumentTypeError with the same message.
+# argparse keeps going after a few of its errors, as if error() had exited, so
+# an error marked to stop ends the parsing when the parser is collecting errors.
+# The structure of each item is: ("A regular expression to match the original error message.", {"message" : "The new formatted message.", "error_type" : "The type of error.", "stop" : "True to end the parsing (optional)."})
+_ERROR_MESSAGES = tuple((compile_regex(regex), dictionary) for regex, dictionary in (
+    ("^Argument (.+): conflicting option string(s?): (.+)$", {"message" : "Argument {group[0]}: Conflicting option string{group[1]}: {group[2]}", "error_type" : "program"}),
+    ("^Argument (.+): expected (.+) argument(s?)$", {"message" : "Argument {group[0]}: Expected {group[1]} argument{group[2]}.", "error_type" : "usage"}),
+    ("^Argument (.+): can't open (.+): (\\[Errno [0-9]{1,3}\\] .+)$", {"message" : "Argument {group[0]}: Can't open {group[1]}: OSError: {group[2]}", "error_type" : "argument"}),
+    ("^Argument (.+): Choices only supports the passing of zero or one argument.$", {"message" : "{string}", "error_type" : "program"}),
+    ("^Argument (.+): Invalid choice: (.+) \\(value not in choices\\)$", {"message" : "{string}", "error_type" : "argument"}),
+    ("^Argument (.+): Invalid choice: (.+) \\(choose from (.+)\\)$", {"message" : "{string}", "error_type" : "argument"}),
+    ("^Argument (.+): Invalid value: (.+)$", {"message" : "{string}", "error_type" : "argument"}),
+    ("^Argument (.+): The specified type '(.+)' is not supported.$", {"message" : "{string}", "error_type" : "program"}),
+    ("^Argument (.+): (.+) is not callable.$", {"message" : "Argument {group[0]}: {group[1]} is not callable.", "error_type" : "program"}),
+    ("^Argument (.+): ignored explicit argument (.+)$", {"message" : "Argument {group[0]}: Ignored explicit argument {group[1]}", "error_type" : "usage"}),
+    ("^Argument (.+): not allowed with argument (.+)$", {"message" : "Argument {group[0]}: Not allowed with argument {group[1]}", "error_type" : "usage"}),
+    ("^Argument (.+): unknown parser '(.+)' \\(choices: (.+)\\)$", {"message" : "Argument {group[0]}: Unknown parser '{group[1]}' (choices: {group[2]})", "error_type" : "program"}),
+    ("^ambiguous option: (.+) could match (.+)$", {"message" : "Ambiguous option: {group[0]} could match {group[1]}", "error_type" : "usage", "stop" : True}),
+    ("^cannot have multiple subparser arguments$", {"message" : "Cannot have multiple subparser arguments.", "error_type" : "program"}),
+    ("^one of the arguments (.+) is required$", {"message" : "One of the arguments {group[0]} is required.", "error_type" : "usage"}),
+    ("^the following arguments are required: (.+)$", {"message" : "The following arguments are required: {group[0]}", "error_type" : "usage"}),
+    ("^unrecognized arguments: (.+)$", {"message" : "Unrecognized arguments: {group[0]}", "error_type" : "usage"}),
+    ("^unexpected option string: (.+)$", {"message" : "Unexpected option string: {group[0]}", "error_type" : "usage", "stop" : True}),
+    ("^\\[Errno [0-9]{1,3}\\] (.+): (.+)$", {"message" : "OSError: {string}", "error_type" : "argument"})
+))
+
+class _KRevisionDict(dict):
+    """
+    Object that extends Python's dict.
+
+    This dictionary counts the changes made to it. A parser shares some
+    of its dictionaries with its argument groups, and arguments can be
+    added through either one. Anything derived from a shared dictionary
+    can be cached along with the revision it was derived from, and the
+    cache is stale once the revision changes.
+    """
+
+    revision = 0
+
+    def __setitem__(self, key, value):
+        self.revision += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.revision += 1
+        super().__delitem__(key)
+
+    def clear(self):
+        self.revision += 1
+        super().clear()
+
+    def pop(self, *args):
+        self.revision += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.revision += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.revision += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.revision += 1
+        super().update(*args, **kwargs)
+
+class _KRevisionList(list):
+    """
+    Object that extends Python's list.
+
+    This list counts the changes made to it, the same as _KRevisionDict.
+    """
+
+    revision = 0
+
+    def __setitem__(self, index, value):
+        self.revision += 1
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self.revision += 1
+        super().__delitem__(index)
+
+    def __iadd__(self, other):
+        self.revision += 1
+        return super().__iadd__(other)
+
+    def append(self, value):
+        self.revision += 1
+        super().append(value)
+
+    def clear(self):
+        self.revision += 1
+        super().clear()
+
+    def extend(self, values):
+        self.revision += 1
+        super().extend(values)
+
+    def insert(self, index, value):
+        self.revision += 1
+        super().insert(index, value)
+
+    def pop(self, *args):
+        self.revision += 1
+        return super().pop(*args)
+
+    def remove(self, value):
+        self.revision += 1
+        super().remove(value)
+
+    def reverse(self):
+        self.revision += 1
+        super().reverse()
+
+    def sort(self, *args, **kwargs):
+        self.revision += 1
+        super().sort(*args, **kwargs)
+
+class _KArgumentError(ArgumentError):
+    """
+    Object that extends argparse's ArgumentError.
+
+    This is the error raised by KArgParse itself. It carries the kind of
+    error and its parameters from where it is raised, so the error()
+    method can look up the type of error instead of matching the message.
+
+    Arguments:
+        argument (class, required):
+            The argument the error belongs to.
+        kind (string, required):
+            The kind of error. See _ERROR_KINDS for the kinds.
+        **parameters (optional):
+            The values for the kind's message.
+    """
+
+    def __init__(self, argument, kind, **parameters):
+        super().__init__(argument, _ERROR_KINDS[kind]["message"].format(**parameters))
+        self.kind = kind
+        self.parameters = parameters
+
+    def __str__(self):
+        if self.argument_name is None:
+            return self.message
+
+        return "Argument {}: {}".format(self.argument_name, self.message)
+
+class _KErrorMessage(str):
+    """
+    Object that extends Python's str.
+
+    This is the message of a _KArgumentError as it is passed to the
+    error() method. It is a string, like any other message, that also
+    carries the kind of error.
+    """
+
+    def __new__(cls, message, kind):
+        string = super().__new__(cls, message)
+        string.kind = kind
+        return string
+
+def _get_error_message(error):
+    """Returns the message to pass to the error() method for an ArgumentError."""
+
+    if isinstance(error, _KArgumentError):
+        return _KErrorMessage(str(error), error.kind)
+
+    error = str(error)
+    # Capitialize the first letter of the error message.
+    return error[0].upper() + error[1:]
+
+class _KPendingValue:
+    """
+    Object that stands in for a value that is still being converted.
+
+    During parse_args_async(), a type function that returns an awaitable
+    leaves one of these in the namespace. The awaitable is awaited after
+    the command line has been parsed, and the placeholder is replaced by
+    the converted value.
+
+    Arguments:
+        parser (class, required):
+            The parser that converted the value.
+        action (class, required):
+            The argument the value belongs to.
+        arg_string (string, required):
+            The value from the command line.
+        awaitable (awaitable, required):
+            The awaitable returned by the type function.
+    """
+
+    def __init__(self, parser, action, arg_string, awaitable):
+        self.parser = parser
+        self.action = action
+        self.arg_string = arg_string
+        self.awaitable = awaitable
+        self.check = False
+        self.value = None
+
+    async def resolve(self):
+        """Awaits the value and checks it. Returns an ArgumentError or None."""
+
+        # Convert the value the same as _get_value().
+        try:
+            self.value = await self.awaitable
+        except ArgumentTypeError as error:
+            return ArgumentError(self.action, error)
+        except Exception: # pylint: disable=W0703
+            return _KArgumentError(self.action, "invalid_value", value=self.arg_string)
+
+        # Check the converted value the same as _check_value().
+        if self.check:
+            try:
+                check = self.parser._check_choices(self.action, self.value) # pylint: disable=W0212
+            except ArgumentError as error:
+                return error
+            if check is not None:
+                return await check.resolve()
+
+        return None
+
+class _KPendingCheck:
+    """
+    Object that holds a choices check that is still being evaluated.
+
+    During parse_args_async(), a choices function that returns an
+    awaitable is awaited after the command line has been parsed.
+
+    Arguments:
+        parser (class, required):
+            The parser that checked the value.
+        action (class, required):
+            The argument the value belongs to.
+        value (type, required):
+            The converted value.
+        awaitable (awaitable, required):
+            The awaitable returned by the choices function.
+        container (boolean, required):
+            True if the choices function returns a container, False if
+            it returns a boolean.
+    """
+
+    def __init__(self, parser, action, value, awaitable, container):
+        self.parser = parser
+        self.action = action
+        self.value = value
+        self.awaitable = awaitable
+        self.container = container
+
+    async def resolve(self):
+        """Awaits the check. Returns an ArgumentError or None."""
+
+        result = await self.awaitable
+        if (self.value not in result) if self.container else (not result):
+            return _KArgumentError(self.action, "not_in_choices", value=self.value)
+
+        return None
+
+class _KStopParsing(Exception):
+    """
+    Exception that ends a parse that is collecting errors.
+
+    An error that argparse can't recover from (e.g., an option without
+    its arguments) is collected, then this exception is raised so the
+    errors collected so far are reported.
+    """
+
+class _KDeferredError(Exception):
+    """
+    Exception that carries an error out of the first phase of
+    parse_args_async(), before it is handled by the error() method.
+
+    Arguments:
+        parser (class, required):
+            The parser whose error() method was called.
+        message (string, required):
+            The message passed to the error() method.
+    """
+
+    def __init__(self, parser, message):
+        super().__init__(message)
+        self.parser = parser
+        self.message = message
+
+def _replace_pending_values(value):
+    """Returns the value with any _KPendingValue placeholders replaced."""
+
+    if isinstance(value, _KPendingValue):
+        return value.value
+    if isinstance(value, list):
+        value[:] = [_replace_pending_values(item) for item in value]
+
+    return value
+
+class _KCallState(local):
+    """
+    Object that extends threading's local.
+
+    This object holds the state of a single call to a parser, e.g., the
+    error message for the usage statement. Each thread sees its own
+    copy, so threads that share a parser never see each other's state.
+    """
+
+    async_pending = None
+    batch_output = None
+    choices_results = None
+    collected_errors = None
+    error_message = None
 
 class KArgumentParser(ArgumentParser):
     """
@@ -31,6 +450,12 @@ class KArgumentParser(ArgumentParser):
     the argparse documentation for a detailed explanation of everything
     argparse can do (https://docs.python.org/3/library/argparse.html).
 
+    Once a parser is built, it can be shared by many threads. Parsing
+    and formatting keep their per-call state (e.g., the error message
+    for the usage statement) in a thread-local context and don't modify
+    the parser, apart from filling in its internal caches. Building the
+    parser (e.g., add_argument(), set_defaults()) is not thread safe.
+
     Arguments:
         prog (string, optional):
             The name of the program (default: sys.argv[0]).
@@ -65,9 +490,23 @@ class KArgumentParser(ArgumentParser):
         add_version (string, optional):
             Add a -v|--version option to the help statement (default:
             None).
+        choices_cache (string or number, optional):
+            How long the result of a zero-argument choices function is
+            kept. If "parse", it is called once for each parse. If a
+            number, it is called again once that many seconds have
+            passed. Otherwise, it is called for every value (default:
+            None).
         choices_limit (integer, optional):
             Limit for the number of argument choices displayed in the
             help statement (default: 25).
+        choices_lru (integer, optional):
+            The number of results of a one-argument choices function
+            that are kept for each argument. If 0, it is called for
+            every value (default: 0).
+        collect_errors (boolean, optional):
+            Keep parsing after an argument or usage error and report
+            every error at once, instead of only the first one. See the
+            parse_args() method for additional help (default: False).
         delimeter (string, optional):
             A character that delimits optional arguments in the help
             statement (default: "|").
@@ -75,9 +514,32 @@ class KArgumentParser(ArgumentParser):
             Exit and print the help statement if there is an
             error. Otherwise, raise an error for the user to handle. See
             the error() method for additional help (default: True).
+        frozen (string, optional):
+            The name of a module generated by kargparse.freeze. If the
+            only argument on the command line is -h|--help or
+            -v|--version, the frozen text is printed and the program
+            exits as soon as the parser is created, before any arguments
+            are added. See the freeze module for additional help
+            (default: None).
+        help_topics (boolean, optional):
+            Let the -h|--help option take a topic: the title of an
+            argument group, an option string, or keywords. Only the
+            matching part of the help statement is printed. An option
+            string must be given with '=' (e.g., --help=--host). See the
+            topics module for additional help (default: False).
         line_width (integer, optional):
             The line width for the usage and help statements (default:
             80).
+        namespace_class (string, optional):
+            The kind of namespace parse_args() creates. If "slots", the
+            namespace is an instance of a class with a slot for each
+            dest, which uses considerably less memory. See the namespace
+            module for additional help (default: None).
+        suggest_on_error (boolean, optional):
+            Add the closest valid choice or option to the message for
+            an invalid choice or an unrecognized option, e.g. "maybe you
+            meant --tenant?". See the suggest module for additional help
+            (default: False).
     """
 
     def __init__(self,
@@ -94,10 +556,20 @@ class KArgumentParser(ArgumentParser):
                  add_help=True,
                  allow_abbrev=True,
                  add_version=None,
+                 choices_cache=None,
                  choices_limit=25,
+                 choices_lru=0,
+                 collect_errors=False,
                  delimeter="|",
                  exit_on_error=True,
-                 line_width=80):
+                 frozen=None,
+                 help_topics=False,
+                 line_width=80,
+                 namespace_class=None,
+                 suggest_on_error=False):
+
+        # This is the per-call state. See the _KCallState class.
+        self._call_state = _KCallState()
 
         if parents is None:
             parents = []
@@ -121,13 +593,95 @@ class KArgumentParser(ArgumentParser):
         # the help statement for this argument would not match its peers.
         self.add_help = add_help
 
+        # Replace the default type conversion function with one that can
+        # be pickled. This allows a fully built parser to be saved to a
+        # snapshot (see the snapshot module).
+        self.register("type", None, _identity)
+
+        # Use the subparsers action that supports deferred subparsers. See
+        # KSubParsersAction's add_parser() method for additional help.
+        self.register("action", "parsers", KSubParsersAction)
+
+        # Replace the actions, defaults, and option string containers with
+        # ones that count their changes, and share them with the argument
+        # groups created so far. The groups created later share them
+        # automatically.
+        self._actions = _KRevisionList(self._actions)
+        self._defaults = _KRevisionDict(self._defaults)
+        self._option_string_actions = _KRevisionDict(self._option_string_actions)
+        for group in self._action_groups + self._mutually_exclusive_groups:
+            group._actions = self._actions
+            group._defaults = self._defaults
+            group._option_string_actions = self._option_string_actions
+
+        # This is the template of defaults used to seed a new namespace.
+        # See the _get_defaults_template() method.
+        self._defaults_template = None
+
+        # This is the generated namespace factory for namespace_class="slots".
+        # See the _get_namespace_factory() method.
+        self._namespace_factory_cache = None
+
+        # This is the sorted index of option strings used to match
+        # abbreviated options. See the _get_option_index() method.
+        self._option_string_index = None
+
+        # These are the compiled nargs patterns used to match arguments.
+        # See the _get_nargs_matcher() method.
+        self._nargs_matchers = {}
+        self._nargs_partial_matchers = {}
+
+        # These are the membership indexes for static choices.
+        # See the _get_choices_index() method.
+        self._choices_indexes = {}
+
+        # These are the number of parameters of each choices function,
+        # the kept results of the zero-argument functions, and the LRU
+        # caches of the one-argument functions. See the _call_choices()
+        # method.
+        self._choices_arities = {}
+        self._choices_memo = {}
+        self._choices_predicates = {}
+
+        # These are the kept help and usage statements. See the
+        # _format_statement() method.
+        self._statements = {}
+
+        # These are the indexes for the suggestions, by argument. The
+        # option strings are under None. See the _get_suggestion() method.
+        self._suggestion_indexes = {}
+
+        # This is the index for the help topics. See the _get_help_index()
+        # method.
+        self._help_index = None
+
         self._add_version = add_version
+        self._choices_cache = choices_cache
         self._choices_limit = choices_limit
+        self._choices_lru = choices_lru
+        self._collect_errors = collect_errors
         self._delimeter = delimeter
         self._exit_on_error = exit_on_error
+        self._frozen = frozen
+        self._help_topics = help_topics
         self._line_width = line_width
+        self._namespace_class = namespace_class
+        self._suggest_on_error = suggest_on_error
 
         self._error_message = None
+        # This is the output captured during parse_many(). It is None
+        # when the parser isn't parsing a batch.
+        self._batch_output = None
+        # These are the pending values and checks during the first phase
+        # of parse_args_async(). It is None at all other times.
+        self._async_pending = None
+        # These are the results of the zero-argument choices functions
+        # during a parse when choices_cache is "parse". It is None at all
+        # other times.
+        self._choices_results = None
+        # These are the errors found so far when collect_errors is True.
+        # It is None when the parser isn't collecting errors.
+        self._collected_errors = None
         self._supported_version_string = "1.1"
         self._supported_version_number = float(self._supported_version_string)
 
@@ -146,31 +700,6 @@ class KArgumentParser(ArgumentParser):
         # The structure of this dictionary is: {"The type of error." : "The exception class"}
         self._error_classes = {"argument" : KArgumentError, "program" : KProgramError, "usage" : KUsageError}
 
-        # This variable needs to be defined before any methods are called.
-        # This is the dictionary for handling error messages.
-        # The structure of this dictionary is: {"A regular expression to match the original error message." : {"message" : "The new formatted message.", "error_type" : "The type of error."}}
-        self._error_messages = {
-            "^Argument (.+): conflicting option string(s?): (.+)$" : {"message" : "Argument {group[0]}: Conflicting option string{group[1]}: {group[2]}", "error_type" : "program"},
-            "^Argument (.+): expected (.+) argument(s?)$" : {"message" : "Argument {group[0]}: Expected {group[1]} argument{group[2]}.", "error_type" : "usage"},
-            "^Argument (.+): can't open (.+): (\\[Errno [0-9]{1,3}\\] .+)$" : {"message" : "Argument {group[0]}: Can't open {group[1]}: OSError: {group[2]}", "error_type" : "argument"},
-            "^Argument (.+): Choices only supports the passing of zero or one argument.$" : {"message" : "{string}", "error_type" : "program"},
-            "^Argument (.+): Invalid choice: (.+) \\(value not in choices\\)$" : {"message" : "{string}", "error_type" : "argument"},
-            "^Argument (.+): Invalid choice: (.+) \\(choose from (.+)\\)$" : {"message" : "{string}", "error_type" : "argument"},
-            "^Argument (.+): Invalid value: (.+)$" : {"message" : "{string}", "error_type" : "argument"},
-            "^Argument (.+): The specified type '(.+)' is not supported.$" : {"message" : "{string}", "error_type" : "program"},
-            "^Argument (.+): (.+) is not callable.$" : {"message" : "Argument {group[0]}: {group[1]} is not callable.", "error_type" : "program"},
-            "^Argument (.+): ignored explicit argument (.+)$" : {"message" : "Argument {group[0]}: Ignored explicit argument {group[1]}", "error_type" : "usage"},
-            "^Argument (.+): not allowed with argument (.+)$" : {"message" : "Argument {group[0]}: Not allowed with argument {group[1]}", "error_type" : "usage"},
-            "^Argument (.+): unknown parser '(.+)' \\(choices: (.+)\\)$" : {"message" : "Argument {group[0]}: Unknown parser '{group[1]}' (choices: {group[2]})", "error_type" : "program"},
-            "^ambiguous option: (.+) could match (.+)$" : {"message" : "Ambiguous option: {group[0]} could match {group[1]}", "error_type" : "usage"},
-            "^cannot have multiple subparser arguments$" : {"message" : "Cannot have multiple subparser arguments.", "error_type" : "program"},
-            "^one of the arguments (.+) is required$" : {"message" : "One of the arguments {group[0]} is required.", "error_type" : "usage"},
-            "^the following arguments are required: (.+)$" : {"message" : "The following arguments are required: {group[0]}", "error_type" : "usage"},
-            "^unrecognized arguments: (.+)$" : {"message" : "Unrecognized arguments: {group[0]}", "error_type" : "usage"},
-            "^unexpected option string: (.+)$" : {"message" : "Unexpected option string: {group[0]}", "error_type" : "usage"},
-            "^\\[Errno [0-9]{1,3}\\] (.+): (.+)$" : {"message" : "OSError: {string}", "error_type" : "argument"}
-        }
-
         # Check the version of argparse to make sure it is supported.
         try:
             float(argparse_version_string)
@@ -184,6 +713,32 @@ class KArgumentParser(ArgumentParser):
         if not isinstance(self._exit_on_error, bool):
             raise TypeError("A boolean is the only allowed type value for exit_on_error.")
 
+        # Check the frozen.
+        if self._frozen is not None and not isinstance(self._frozen, str):
+            raise TypeError("A string is the only allowed type value for frozen.")
+
+        # Check the help_topics.
+        if not isinstance(self._help_topics, bool):
+            raise TypeError("A boolean is the only allowed type value for help_topics.")
+
+        # Check the collect_errors.
+        if not isinstance(self._collect_errors, bool):
+            raise TypeError("A boolean is the only allowed type value for collect_errors.")
+
+        # Check the choices_cache.
+        if self._choices_cache is not None and (not isinstance(self._choices_cache, (int, float, str)) or isinstance(self._choices_cache, bool)):
+            raise TypeError("A string or a number is the only allowed type value for choices_cache.")
+        if isinstance(self._choices_cache, str) and self._choices_cache != "parse":
+            raise ValueError("The choices_cache must be None, \"parse\", or a number of seconds.")
+        if isinstance(self._choices_cache, (int, float)) and not self._choices_cache > 0:
+            raise ValueError("The choices_cache must be greater than 0 seconds.")
+
+        # Check the choices_lru.
+        if not isinstance(self._choices_lru, int) or isinstance(self._choices_lru, bool):
+            raise TypeError("A integer is the only allowed type value for choices_lru.")
+        if self._choices_lru < 0:
+            raise ValueError("The choices_lru must be at least 0.")
+
         # Check the choices_limit.
         if not isinstance(self._choices_limit, int):
             raise TypeError("A integer is the only allowed type value for choices_limit.")
@@ -196,10 +751,23 @@ class KArgumentParser(ArgumentParser):
         if self._line_width not in range(20, 241):
             raise ValueError("The line_width must be in the set [20, 240].")
 
+        # Check the suggest_on_error.
+        if not isinstance(self._suggest_on_error, bool):
+            raise TypeError("A boolean is the only allowed type value for suggest_on_error.")
+
+        # Check the namespace_class.
+        if self._namespace_class is not None and not isinstance(self._namespace_class, str):
+            raise TypeError("A string is the only allowed type value for namespace_class.")
+        if self._namespace_class not in (None, "slots"):
+            raise ValueError("The namespace_class must be None or \"slots\".")
+
         # Add the help argument if necessary.
         if self.add_help:
             prefix = self.prefix_chars[0]
-            self.add_argument(prefix+"h", prefix*2+"help", action="help", default=SUPPRESS, help="Show this help message and exit.")
+            if self._help_topics:
+                self.add_argument(prefix+"h", prefix*2+"help", action=KHelpAction, default=SUPPRESS, help="Show this help message, or only the help for a topic, and exit. Give an option string as the topic with '=', e.g., '{}help={}option'.".format(prefix*2, prefix*2))
+            else:
+                self.add_argument(prefix+"h", prefix*2+"help", action="help", default=SUPPRESS, help="Show this help message and exit.")
 
         # Add the version argument if necessary.
         if self._add_version is not None:
@@ -208,72 +776,794 @@ class KArgumentParser(ArgumentParser):
             prefix = self.prefix_chars[0]
             self.add_argument(prefix+"v", prefix*2+"version", action="version", version="{} {}".format(self.prog, self._add_version), default=SUPPRESS, help="Show the version and exit.")
 
-    def _check_value(self, action, value):
+        # Print the frozen help statement or version, if it is asked for, before any arguments are added.
+        if self._frozen is not None:
+            frozen_text = get_frozen_text(self._frozen, self.prog, self._line_width, sys.argv[1:])
+            if frozen_text is not None:
+                self._print_message(frozen_text, sys.stdout)
+                self.exit()
+
+    def __getstate__(self):
+        """
+        Returns the parser's state for pickling.
+
+        The generated namespace factory can't be pickled, so it is left
+        out. It is generated again the first time it's needed.
+        """
+
+        state = self.__dict__.copy()
+        state["_namespace_factory_cache"] = None
+        # The kept choices results are tied to this process's clock, and
+        # the LRU caches can't be pickled.
+        state["_choices_memo"] = {}
+        state["_choices_predicates"] = {}
+        # The suggestion indexes are large and quick to build again.
+        state["_suggestion_indexes"] = {}
+        # The per-call state is thread-local and can't be pickled.
+        del state["_call_state"]
+
+        return state
+
+    def __setstate__(self, state):
+        """Restores the parser's state after unpickling."""
+
+        self.__dict__.update(state)
+        self._call_state = _KCallState()
+
+    @property
+    def _async_pending(self):
+        """The pending values and checks of parse_args_async() (per-call)."""
+
+        return self._call_state.async_pending
+
+    @_async_pending.setter
+    def _async_pending(self, value):
+        self._call_state.async_pending = value
+
+    @property
+    def _batch_output(self):
+        """The output captured during parse_many() (per-call)."""
+
+        return self._call_state.batch_output
+
+    @_batch_output.setter
+    def _batch_output(self, value):
+        self._call_state.batch_output = value
+
+    @property
+    def _choices_results(self):
+        """The results of the zero-argument choices functions (per-call)."""
+
+        return self._call_state.choices_results
+
+    @_choices_results.setter
+    def _choices_results(self, value):
+        self._call_state.choices_results = value
+
+    @property
+    def _collected_errors(self):
+        """The errors found so far when collecting errors (per-call)."""
+
+        return self._call_state.collected_errors
+
+    @_collected_errors.setter
+    def _collected_errors(self, value):
+        self._call_state.collected_errors = value
+
+    @property
+    def _error_message(self):
+        """The error message for the usage statement (per-call)."""
+
+        return self._call_state.error_message
+
+    @_error_message.setter
+    def _error_message(self, value):
+        self._call_state.error_message = value
+
+    def _collect(self, function, args, namespace):
+        """
+        Calls a parse method while collecting errors.
+
+        The errors are collected by the error() method. Once the parse
+        method is done, or an error ends it early, the errors are handled
+        together the same as error() handles one error.
+
+        Arguments:
+            function (function, required):
+                The parse method, e.g. parse_args().
+            args (list, required):
+                The arguments for the parse method.
+            namespace (class, required):
+                The namespace for the parse method.
+
+        Returns:
+            type:
+                The result of the parse method.
+
+        Raises:
+            KArgumentError, KUsageError:
+                If one error was found.
+            KMultipleErrors:
+                If more than one error was found.
+        """
+
+        errors = self._collected_errors = []
+        try:
+            result = function(args, namespace)
+        except _KStopParsing:
+            result = None
+        finally:
+            self._collected_errors = None
+
+        # If there were any errors, exit or raise them together.
+        if errors:
+            error = errors[0] if len(errors) == 1 else KMultipleErrors(errors)
+            if self._exit_on_error and self._batch_output is None:
+                self.exit(error.status, error.message)
+            raise error
+
+        return result
+
+    def _call_choices(self, action, *value):
+        """
+        Calls the choices function of an argument.
+
+        A zero-argument function's result is kept as set by the
+        choices_cache, and a one-argument function's results are kept
+        as set by the choices_lru. See the choices module for additional
+        help.
+
+        Arguments:
+            action (class, required):
+                The argument which contains the choices function.
+            *value (type, optional):
+                The converted value, for a one-argument function.
+
+        Returns:
+            function or type:
+                For a zero-argument function, a function that takes a
+                value and returns True if the value is in the result.
+                For a one-argument function, its result. Either one can
+                also be an awaitable, which is never kept.
+        """
+
+        # Call a one-argument function, through its LRU cache if there is one.
+        if value:
+            if not self._choices_lru:
+                return action.choices(*value)
+            predicate = self._choices_predicates.get(action)
+            if predicate is None or predicate[0] is not action.choices:
+                predicate = (action.choices, get_choices_predicate(action.choices, self._choices_lru))
+                self._choices_predicates[action] = predicate
+            return predicate[1](*value)
+
+        # Find where the result of a zero-argument function is kept.
+        if self._choices_cache == "parse":
+            results = self._choices_results
+        elif self._choices_cache is not None:
+            results = self._choices_memo
+        else:
+            results = None
+
+        # Use the kept result if it's still current.
+        if results is not None:
+            result = results.get(action)
+            if result is not None and result[0] is action.choices and result[1] > monotonic():
+                return result[2]
+
+        # Otherwise, call the function and keep its result.
+        choices = action.choices()
+        if isawaitable(choices):
+            return choices
+        if results is None:
+            return partial(contains, choices)
+        if self._choices_cache == "parse":
+            expires = float("inf")
+        else:
+            expires = monotonic() + self._choices_cache
+        results[action] = (action.choices, expires, get_choices_index(choices))
+
+        return results[action][2]
+
+    def _check_value(self, action, value):
+        """
+        Check the value of an argument.
+
+        Check the value of an argument from the command line with the
+        choices attribute for that argument. If the number of choices
+        for an argument is greater than the choices_limit, a message
+        will be displayed instead of the choices.
+
+        Arguments:
+            action (class, required):
+                The argument which contains the choices and pairs with
+                the value.
+            value (type, required):
+                The argument's converted value from the command line.
+
+        Raises:
+            ArgumentError:
+                If the value is not in the choices or if choices is a
+                function call and cannot be evaluated.
+        """
+
+        # During parse_args_async(), a value that is still being converted is checked after it's converted.
+        if isinstance(value, _KPendingValue):
+            value.check = True
+            return
+
+        # Check the value, and keep any check that is still being evaluated for parse_args_async().
+        check = self._check_choices(action, value)
+        if check is not None:
+            if self._async_pending is None:
+                if iscoroutine(check.awaitable):
+                    check.awaitable.close()
+                raise _KArgumentError(action, "awaitable", function="choices", name=getattr(action.choices, "__name__", repr(action.choices)))
+            self._async_pending.append(check)
+
+    def _check_choices(self, action, value):
+        """
+        Checks a converted value against the choices of an argument.
+
+        This method does the work for _check_value(). If the choices is a
+        function that returns an awaitable, the check is returned so it
+        can be awaited.
+
+        Arguments:
+            action (class, required):
+                The argument which contains the choices.
+            value (type, required):
+                The argument's converted value from the command line.
+
+        Returns:
+            _KPendingCheck:
+                The check that is still being evaluated, or None if the
+                check is done.
+
+        Raises:
+            ArgumentError:
+                If the value is not in the choices or if choices is a
+                function call and cannot be evaluated.
+        """
+
+        # If specified, the converted value must be one of the choices.
+        kind = suggestion = None
+        if action.choices is not None:
+            # If action.choices is callable, call it and check the return value.
+            if callable(action.choices):
+                # Check the number of parameters of the callable.
+                arity = self._get_choices_arity(action)
+                # If no parameters, the return value should be iterable.
+                if arity == 0:
+                    choices = self._call_choices(action)
+                    if isawaitable(choices):
+                        return _KPendingCheck(self, action, value, choices, True)
+                    if not choices(value):
+                        kind = "not_in_choices"
+                # If one parameter, the return value should be a boolean.
+                elif arity == 1:
+                    valid = self._call_choices(action, value)
+                    if isawaitable(valid):
+                        return _KPendingCheck(self, action, value, valid, False)
+                    if not valid:
+                        kind = "not_in_choices"
+                # Anything other than zero or one parameter is not supported.
+                else:
+                    raise _KArgumentError(action, "choices_parameters")
+            # Otherwise, action.choices should be iterable.
+            else:
+                if not self._get_choices_index(action)(value):
+                    suggestion = self._get_suggestion(action, value)
+                    # The choices in a file are never counted or listed.
+                    if not isinstance(action.choices, KFileChoices) and len(action.choices) < self._choices_limit:
+                        kind = "invalid_choice" if suggestion is None else "invalid_choice_suggestion"
+                        raise _KArgumentError(action, kind, value=value, choices=", ".join(map(repr, action.choices)), suggestion=suggestion)
+                    kind = "not_in_choices" if suggestion is None else "not_in_choices_suggestion"
+
+        # If kind was set, we have an error.
+        if kind is not None:
+            raise _KArgumentError(action, kind, value=value, suggestion=suggestion)
+
+        return None
+
+    def _get_array_values(self, action, arg_strings):
+        """
+        Converts and checks the values of an array argument.
+
+        The values are converted into one array (see the vector module).
+        A range of choices is checked against the whole array, and any
+        other choices are checked one value at a time. Either way, the
+        first value that isn't one of the choices is reported with its
+        index.
+
+        Arguments:
+            action (class, required):
+                The argument the values belong to.
+            arg_strings (list, required):
+                The argument's values from the command line.
+
+        Returns:
+            array:
+                The converted values.
+
+        Raises:
+            ArgumentError:
+                If a value can't be converted or isn't in the choices.
+        """
+
+        # Remove the "--" the same as argparse does.
+        if "--" in arg_strings:
+            arg_strings = list(arg_strings)
+            arg_strings.remove("--")
+
+        # Convert the values, then find the invalid one if that fails.
+        try:
+            values = convert_array(arg_strings, action.type, action.array)
+        except (OverflowError, ValueError):
+            position = get_invalid_position(arg_strings, action.type)
+            raise _KArgumentError(action, "invalid_item_value", value=arg_strings[position], index=position) from None
+
+        # Check the values with the choices.
+        if isinstance(action.choices, range):
+            position = get_range_position(values, action.choices)
+            if position is not None:
+                raise _KArgumentError(action, "invalid_item_choice", value=arg_strings[position], index=position)
+        elif action.choices is not None:
+            for position, value in enumerate(values):
+                try:
+                    self._check_value(action, value)
+                # Report the first value that isn't one of the choices with its index, the same as a range.
+                except _KArgumentError as error:
+                    if error.kind not in ("invalid_choice", "invalid_choice_suggestion", "not_in_choices", "not_in_choices_suggestion"):
+                        raise
+                    raise _KArgumentError(action, "invalid_item_choice", value=arg_strings[position], index=position) from None
+
+        return values
+
+    def _get_choices_arity(self, action):
+        """
+        Returns the number of parameters of an argument's choices function.
+
+        The signature is inspected once and kept until the argument's
+        choices are replaced.
+
+        Arguments:
+            action (class, required):
+                The argument which contains the choices function.
+
+        Returns:
+            integer:
+                The number of parameters.
+        """
+
+        arity = self._choices_arities.get(action)
+        if arity is None or arity[0] is not action.choices:
+            arity = (action.choices, len(signature(action.choices).parameters))
+            self._choices_arities[action] = arity
+
+        return arity[1]
+
+    def _get_choices_index(self, action):
+        """
+        Returns the membership test for an argument's static choices.
+
+        The choices are compiled into an index (see the choices module)
+        and the index is kept until the argument's choices are replaced.
+        A list of choices that has choices added or removed in place is
+        compiled again, since its length changes. A choice replaced in
+        place isn't noticed, so a new list must be assigned instead.
+
+        Arguments:
+            action (class, required):
+                The argument to get the membership test for.
+
+        Returns:
+            function:
+                A function that takes a value and returns True if the
+                value is one of the choices.
+        """
+
+        choices = action.choices
+        length = len(choices) if isinstance(choices, list) else None
+        index = self._choices_indexes.get(action)
+        if index is None or index[0] is not choices or index[1] != length:
+            index = (choices, length, get_choices_index(choices))
+            self._choices_indexes[action] = index
+
+        return index[2]
+
+    def _add_sections(self, formatter, full, messages):
+        """
+        Adds the sections of the help or usage statement to a formatter.
+
+        Arguments:
+            formatter (class, required):
+                The KHelpFormatter to add the sections to.
+            full (boolean, required):
+                True for the help statement, False for the usage statement.
+            messages (iterable, required):
+                The lines of the error diagnostics.
+        """
+
+        # Format and add the usage.
+        formatter.add_usage(self.usage, self._actions, self._mutually_exclusive_groups)
+
+        if full:
+            # Format and add the description.
+            formatter.start_section("Description")
+            formatter.add_text(self.description)
+            formatter.end_section()
+
+            # Format the positionals, optionals and user-defined groups.
+            # The optionals are sorted when they are formatted, so the parser isn't modified.
+            for action_group in self._action_groups:
+                formatter.start_section(action_group.title)
+                formatter.add_text(action_group.description)
+                if action_group.title == self._optionals.title:
+                    formatter.add_sorted_arguments(action_group._group_actions)
+                else:
+                    formatter.add_arguments(action_group._group_actions)
+                formatter.end_section()
+
+            # Format and add the epilog.
+            formatter.start_section("Epilog")
+            formatter.add_text(self.epilog)
+            formatter.end_section()
+
+        # Format and add the error diagnostics.
+        if self.add_help:
+            formatter.start_section("Error Diagnostics (use -h|--help for usage details)")
+        else:
+            formatter.start_section("Error Diagnostics")
+        for message in messages:
+            formatter.add_text(message)
+        formatter.end_section()
+
+    def _format_statement(self, full):
+        """
+        Formats the help or usage statement.
+
+        Formatting a statement takes much longer than parsing, and the
+        usage statement is formatted for every error. So a statement is
+        formatted once and kept until anything it depends on changes:
+        the arguments, the argument groups, the defaults, the subcommands,
+        the allowed_types, or any of the parser's settings that show up
+        in it (see the _get_statement_key() method). Changing an argument
+        after it is added (e.g., its help) isn't noticed.
+
+        The error diagnostics are different every time, so the statement
+        is kept in two parts, the text before and after the diagnostics.
+        Only the lines of the error message are formatted, and they are
+        put between the two parts. The statement without any diagnostics
+        is kept whole.
+
+        Arguments:
+            full (boolean, required):
+                True for the help statement, False for the usage statement.
+
+        Returns:
+            string:
+                The formatted statement.
+        """
+
+        key = self._get_statement_key()
+        statement = self._statements.get(full)
+        if statement is None or statement["key"] != key:
+            # The formatter for the diagnostics is indented the same as a section.
+            formatter = self._get_formatter()
+            formatter._indent() # pylint: disable=W0212
+            statement = {"key" : key, "formatter" : formatter, "plain" : None, "parts" : None}
+            self._statements[full] = statement
+
+        messages = (self._error_message or "").splitlines()
+        formatter = statement["formatter"]
+
+        # Format the statement without any diagnostics.
+        if not messages:
+            if statement["plain"] is None:
+                plain_formatter = self._get_formatter()
+                self._add_sections(plain_formatter, full, ())
+                statement["plain"] = plain_formatter.format_help()
+            return statement["plain"]
+
+        # Format the statement with a marker for the diagnostics, and keep the text around it.
+        if statement["parts"] is None:
+            parts_formatter = self._get_formatter()
+            self._add_sections(parts_formatter, full, (_DIAGNOSTICS_MARKER,))
+            before, _, after = parts_formatter._root_section.format_help().partition(formatter._format_text(_DIAGNOSTICS_MARKER)) # pylint: disable=W0212
+            statement["parts"] = (before, after)
+
+        before, after = statement["parts"]
+        diagnostics = "".join(map(formatter._format_text, messages)) # pylint: disable=W0212
+
+        return formatter.normalize_help(before + diagnostics + after)
+
+    def _get_formatter(self):
+        """Returns an intialized formatter class object."""
+
+        # Check the formatter_class.
+        if self.formatter_class == KHelpFormatter:
+            return self.formatter_class(prog=self.prog,
+                                        allowed_types=self._allowed_types,
+                                        width=self._line_width,
+                                        delimeter=self._delimeter,
+                                        prefix_chars=self.prefix_chars)
+
+        return self.formatter_class(prog=self.prog)
+
+    def _get_help_index(self):
+        """
+        Returns the index for the help topics.
+
+        The index is built the first time a topic is asked for, and kept
+        until an argument or an argument group is added.
+
+        Returns:
+            class:
+                The KHelpIndex of the argument groups.
+        """
+
+        index = self._help_index
+        revision = (self._actions.revision, len(self._action_groups))
+        if index is None or index[0] != revision:
+            index = (revision, KHelpIndex(self._action_groups))
+            self._help_index = index
+
+        return index[1]
+
+    def _get_nargs_matcher(self, action):
+        """
+        Returns the compiled nargs pattern for an argument.
+
+        Argparse builds the regular expression for an argument's nargs
+        every time it matches the argument. This method builds it once,
+        compiles it, and keeps it until the argument's nargs changes. It
+        also builds the patterns for the "N+" and "{m,n}" expressions.
+
+        Arguments:
+            action (class, required):
+                The argument to get the nargs pattern for.
+
+        Returns:
+            tuple:
+                A three item tuple containing the nargs the pattern was
+                built for, the pattern, and the compiled pattern.
+        """
+
+        matcher = self._nargs_matchers.get(action)
+        if matcher is None or matcher[0] != action.nargs:
+            nargs_range = get_nargs_range(action.nargs)
+            if nargs_range is None:
+                nargs_pattern = super()._get_nargs_pattern(action)
+            else:
+                # In the patterns, "A" is an argument and "-" is a "--".
+                minimum, maximum = nargs_range
+                nargs_pattern = "(-*(?:A-*){{{},{}}})".format(minimum, "" if maximum is None else maximum)
+                # If this is an optional argument, "--" is not allowed.
+                if action.option_strings:
+                    nargs_pattern = nargs_pattern.replace("-*", "")
+            matcher = (action.nargs, nargs_pattern, compile_regex(nargs_pattern))
+            self._nargs_matchers[action] = matcher
+
+        return matcher
+
+    def _get_nargs_pattern(self, action):
+        """Returns the nargs pattern for an argument."""
+
+        return self._get_nargs_matcher(action)[1]
+
+    def _match_argument(self, action, arg_strings_pattern):
+        """
+        Matches an argument's nargs against the remaining arguments.
+
+        Arguments:
+            action (class, required):
+                The argument to match.
+            arg_strings_pattern (string, required):
+                The pattern of the remaining arguments, e.g. "AOA".
+
+        Returns:
+            integer:
+                The number of arguments matched.
+
+        Raises:
+            ArgumentError:
+                If the arguments don't match the nargs.
+        """
+
+        arguments = self._get_nargs_matcher(action)[2].match(arg_strings_pattern)
+        if arguments is None:
+            nargs_range = get_nargs_range(action.nargs)
+            # Let argparse raise the error for its own nargs.
+            if nargs_range is None:
+                return super()._match_argument(action, arg_strings_pattern)
+            minimum, maximum = nargs_range
+            if maximum is None:
+                expected = "at least {} argument{}".format(minimum, "" if minimum == 1 else "s")
+            else:
+                expected = "between {} and {} arguments".format(minimum, maximum)
+            raise _KArgumentError(action, "expected_arguments", expected=expected)
+
+        return len(arguments.group(1))
+
+    def _match_arguments_partial(self, actions, arg_strings_pattern):
+        """
+        Matches as many positional arguments as possible.
+
+        The combined patterns are compiled once for each run of
+        positional arguments and kept until one of their nargs changes.
+
+        Arguments:
+            actions (list, required):
+                The positional arguments to match.
+            arg_strings_pattern (string, required):
+                The pattern of the remaining arguments, e.g. "AOA".
+
+        Returns:
+            list:
+                The number of arguments matched for each positional
+                argument, or an empty list if none matched.
+        """
+
+        # Progressively shorten the list by slicing off the last argument until there is a match.
+        for end in range(len(actions), 0, -1):
+            key = tuple(actions[:end])
+            nargs_patterns = tuple(self._get_nargs_matcher(action)[1] for action in key)
+            matcher = self._nargs_partial_matchers.get(key)
+            if matcher is None or matcher[0] != nargs_patterns:
+                matcher = (nargs_patterns, compile_regex("".join(nargs_patterns)))
+                self._nargs_partial_matchers[key] = matcher
+            arguments = matcher[1].match(arg_strings_pattern)
+            if arguments is not None:
+                return [len(group) for group in arguments.groups()]
+
+        return []
+
+    def _get_defaults_template(self):
+        """
+        Returns the defaults for a new namespace.
+
+        The template is rebuilt the first time it's needed after an
+        argument has been added or removed, set_defaults() has been
+        called, or an argument's default has been changed directly
+        (e.g., action.default = 1).
+
+        Returns:
+            dictionary:
+                The defaults, in the order they would be added to the
+                namespace.
+        """
+
+        template = self._defaults_template
+        revision = (self._actions.revision, self._defaults.revision)
+        # A change made directly to an argument's default isn't counted by the
+        # revisions, so the defaults the template was built from are compared too.
+        action_defaults = tuple(map(_get_default, self._actions))
+        if template is None or template[0] != revision or not all(map(is_, template[1], action_defaults)):
+            defaults = {}
+            # Add the action defaults.
+            for action in self._actions:
+                if action.dest is not SUPPRESS and action.dest not in defaults and action.default is not SUPPRESS:
+                    defaults[action.dest] = action.default
+            # Add the parser defaults that aren't present.
+            for dest in self._defaults:
+                if dest not in defaults:
+                    defaults[dest] = self._defaults[dest]
+            template = (revision, action_defaults, defaults)
+            self._defaults_template = template
+
+        return template[2]
+
+    def _get_namespace_factory(self):
+        """
+        Returns a function that creates a slotted namespace.
+
+        The namespace class is generated from the parser's dests, and
+        the function seeds each new namespace with the parser's defaults.
+        Both are rebuilt the first time they're needed after the
+        defaults template has been rebuilt.
+
+        Returns:
+            function:
+                A function that takes no arguments and returns a new
+                namespace.
+        """
+
+        cache = self._namespace_factory_cache
+        # The template is rebuilt whenever the arguments or the defaults change.
+        template = self._get_defaults_template()
+        if cache is None or cache[0] is not template:
+            dests = [action.dest for action in self._actions if action.dest is not SUPPRESS]
+            dests.extend(self._defaults)
+            cache = (template, get_namespace_factory(dests, template))
+            self._namespace_factory_cache = cache
+
+        return cache[1]
+
+    def _get_option_index(self):
+        """
+        Returns the sorted index of option strings.
+
+        The index is rebuilt the first time it's needed after an option
+        string has been added or removed. It consists of the option strings
+        in sorted order and a dictionary that maps each option string to its
+        position in the parser, which is the order argparse reports them in.
+
+        Returns:
+            tuple:
+                A two item tuple containing the sorted option strings and
+                the dictionary of positions.
         """
-        Check the value of an argument.
 
-        Check the value of an argument from the command line with the
-        choices attribute for that argument. If the number of choices
-        for an argument is greater than the choices_limit, a message
-        will be displayed instead of the choices.
+        index = self._option_string_index
+        revision = self._option_string_actions.revision
+        if index is None or index[0] != revision:
+            option_strings = list(self._option_string_actions)
+            positions = {option_string : position for position, option_string in enumerate(option_strings)}
+            index = (revision, sorted(option_strings), positions)
+            self._option_string_index = index
 
-        Arguments:
-            action (class, required):
-                The argument which contains the choices and pairs with
-                the value.
-            value (type, required):
-                The argument's converted value from the command line.
+        return index[1], index[2]
 
-        Raises:
-            ArgumentError:
-                If the value is not in the choices or if choices is a
-                function call and cannot be evaluated.
+    def _get_option_tuples(self, option_string):
         """
+        Finds the actions an abbreviated option could refer to.
 
-        # If specified, the converted value must be one of the choices.
-        message = ""
-        if action.choices is not None:
-            default = "Invalid choice: {} (value not in choices)".format(value)
-
-            # If action.choices is callable, call it and check the return value.
-            if callable(action.choices):
-                # Create a signature of the callable so we can check the parameters.
-                sig = signature(action.choices)
-                # If no parameters, the return value should be iterable.
-                if not sig.parameters:
-                    if value not in action.choices():
-                        message = default
-                # If one parameter, the return value should be a boolean.
-                elif len(sig.parameters) == 1:
-                    if not action.choices(value):
-                        message = default
-                # Anything other than zero or one parameter is not supported.
-                else:
-                    message = "Choices only supports the passing of zero or one argument."
-            # Otherwise, action.choices should be iterable.
-            else:
-                if value not in action.choices:
-                    if len(action.choices) < self._choices_limit:
-                        message = "Invalid choice: {} (choose from {})".format(value, ", ".join(map(repr, action.choices)))
-                    else:
-                        message = default
+        This method replaces argparse's linear scan of every option string
+        with a binary search of the sorted index of option strings. Only
+        the option strings that start with the given prefix are examined.
+        The matches are returned in the same order argparse would return
+        them, so the "ambiguous option" error message doesn't change.
 
-        # If message was set, we have an error.
-        if message:
-            raise ArgumentError(action, message)
+        Arguments:
+            option_string (string, required):
+                The option string from the command line.
 
-    def _get_formatter(self):
-        """Returns an intialized formatter class object."""
+        Returns:
+            list:
+                A list of (action, option string, explicit argument)
+                tuples, one for each possible match.
+        """
 
-        # Check the formatter_class.
-        if self.formatter_class == KHelpFormatter:
-            return self.formatter_class(prog=self.prog,
-                                        allowed_types=self._allowed_types,
-                                        width=self._line_width,
-                                        delimeter=self._delimeter,
-                                        prefix_chars=self.prefix_chars)
+        matches = {}
+        chars = self.prefix_chars
+        sorted_options, positions = self._get_option_index()
+
+        # Option strings that start with two prefix characters are only split at the "=".
+        if option_string[0] in chars and option_string[1] in chars:
+            if not self.allow_abbrev:
+                return []
+            option_prefix, separator, explicit_arg = option_string.partition("=")
+            if not separator:
+                separator = explicit_arg = None
+        # Single character options can be concatenated with their arguments.
+        elif option_string[0] in chars and option_string[1] not in chars:
+            option_prefix, separator, explicit_arg = option_string, None, None
+            short_option_prefix = option_string[:2]
+            if short_option_prefix in self._option_string_actions:
+                matches[short_option_prefix] = ("", option_string[2:])
+        # This shouldn't ever happen.
+        else:
+            self.error("unexpected option string: {}".format(option_string))
+            return []
+
+        # Collect every option string that starts with the prefix.
+        position = bisect_left(sorted_options, option_prefix)
+        while position < len(sorted_options) and sorted_options[position].startswith(option_prefix):
+            matches.setdefault(sorted_options[position], (separator, explicit_arg))
+            position += 1
+
+        # Return the matches in the order they were added to the parser.
+        # Python 3.12 added the separator to each tuple.
+        result = []
+        for match_string in sorted(matches, key=positions.get):
+            separator, explicit_arg = matches[match_string]
+            if _OPTION_TUPLE_SEPARATOR:
+                result.append((self._option_string_actions[match_string], match_string, separator, explicit_arg))
+            else:
+                result.append((self._option_string_actions[match_string], match_string, explicit_arg))
 
-        return self.formatter_class(prog=self.prog)
+        return result
 
     def _get_value(self, action, arg_string):
         """
@@ -303,8 +1593,7 @@ class KArgumentParser(ArgumentParser):
         # Raise an error if the action type is not callable.
         type_func = self._registry_get("type", action.type, action.type)
         if not callable(type_func):
-            message = "{} is not callable.".format(type_func)
-            raise ArgumentError(action, message)
+            raise _KArgumentError(action, "not_callable", function=type_func)
 
         # Convert the value into the appropriate type.
         try:
@@ -313,13 +1602,373 @@ class KArgumentParser(ArgumentParser):
         except ArgumentTypeError as error:
             raise ArgumentError(action, error)
         # Raise an error if the type is not converted properly.
-        except Exception as error:
-            message = "Invalid value: {}".format(arg_string)
-            raise ArgumentError(action, message)
+        except Exception:
+            raise _KArgumentError(action, "invalid_value", value=arg_string) from None
+
+        # If the type returned an awaitable, it is awaited by parse_args_async().
+        if isawaitable(result):
+            if self._async_pending is None:
+                if iscoroutine(result):
+                    result.close()
+                raise _KArgumentError(action, "awaitable", function="type", name=getattr(type_func, "__name__", repr(type_func)))
+            result = _KPendingValue(self, action, arg_string, result)
+            self._async_pending.append(result)
 
         # Return the converted value.
         return result
 
+    def _get_statement_key(self):
+        """
+        Returns everything the help and usage statements depend on.
+
+        The arguments, the defaults, and the option strings count their
+        changes, so they are compared by their revisions. See the
+        _format_statement() method.
+
+        Returns:
+            tuple:
+                A tuple that is equal to an earlier one if the statements
+                haven't changed since.
+        """
+
+        # The subcommands are only listed, they aren't arguments of this parser.
+        subcommands = ()
+        if self._subparsers is not None:
+            subcommands = tuple(len(action._choices_actions) for action in self._subparsers._group_actions if isinstance(action, _SubParsersAction)) # pylint: disable=W0212
+
+        return (self.prog, self.usage, self.description, self.epilog, self.add_help,
+                self._line_width, self._delimeter, self.prefix_chars, tuple(self._allowed_types.items()),
+                self._actions.revision, self._defaults.revision, self._option_string_actions.revision,
+                tuple((action_group.title, action_group.description) for action_group in self._action_groups),
+                subcommands)
+
+    def _get_suggestion(self, action, word):
+        """
+        Returns the closest valid choice or option string to a word.
+
+        The index for the suggestions is built the first time it's
+        needed and kept until the choices are replaced (or a list of
+        choices changes length) or the option strings change. There are
+        never suggestions for a range or for the choices in a file.
+
+        Arguments:
+            action (class, required):
+                The argument whose choices are suggested, or None for
+                the option strings.
+            word (string, required):
+                The invalid choice or the unrecognized option string.
+
+        Returns:
+            string:
+                The closest choice or option string, or None if there
+                isn't one or suggest_on_error is False.
+        """
+
+        if not self._suggest_on_error or not isinstance(word, str):
+            return None
+
+        # Get the valid words and their revision.
+        if action is None:
+            words, revision = self._option_string_actions, self._option_string_actions.revision
+        elif isinstance(action.choices, (KFileChoices, range)):
+            return None
+        else:
+            words = action.choices
+            revision = len(words) if isinstance(words, list) else None
+
+        index = self._suggestion_indexes.get(action)
+        if index is None or index[0] is not words or index[1] != revision:
+            index = (words, revision, KSuggestionIndex(words))
+            self._suggestion_indexes[action] = index
+
+        return index[2].suggest(word)
+
+    def _get_values(self, action, arg_strings):
+        """
+        Converts and checks the values of an argument.
+
+        This is the same as argparse's _get_values() method, except when
+        the parser is collecting errors. Then an invalid value is
+        collected and the argument is given its default instead, so the
+        rest of the command line can be parsed. A subcommand is never
+        given a default, the remaining arguments belong to it. During
+        parse_many(), only the first error is kept, so the parsing ends
+        at the invalid value. The values of an array argument are
+        converted by _get_array_values().
+
+        Arguments:
+            action (class, required):
+                The argument the values belong to.
+            arg_strings (list, required):
+                The argument's values from the command line.
+
+        Returns:
+            value:
+                The converted value or values.
+
+        Raises:
+            ArgumentError:
+                If a value is invalid and the parser isn't collecting
+                errors.
+        """
+
+        # The values of an array argument are converted all at once. A
+        # positional argument without any values still gets its default.
+        get_values = super()._get_values
+        if getattr(action, "array", None) is not None and (arg_strings or action.option_strings):
+            get_values = self._get_array_values
+
+        if self._collected_errors is None or action.nargs in (PARSER, REMAINDER):
+            return get_values(action, arg_strings)
+
+        try:
+            return get_values(action, arg_strings)
+        except ArgumentError as error:
+            self.error(_get_error_message(error))
+            # During parse_many(), only the first error is kept unless the parser was
+            # created with collect_errors, so nothing after it is parsed.
+            if self._batch_output is not None and not self._collect_errors:
+                raise _KStopParsing() from None
+
+        return action.default
+
+    def _parse_args(self, args, namespace):
+        """
+        Parses the command line arguments and reports any unrecognized
+        arguments. See the parse_args() method.
+        """
+
+        namespace, extras = self.parse_known_args(args, namespace)
+        if extras:
+            # Look for a suggestion for each unrecognized option string.
+            suggestions = []
+            for extra in extras:
+                if extra[:1] in self.prefix_chars:
+                    option_string = extra.split("=", 1)[0]
+                    suggestion = self._get_suggestion(None, option_string)
+                    if suggestion is not None:
+                        suggestions.append((suggestion, option_string))
+            # With more than one, say which option string each suggestion is for.
+            if len(suggestions) == 1:
+                suggestion = suggestions[0][0]
+            else:
+                suggestion = ", ".join("{} instead of {}".format(*pair) for pair in suggestions)
+
+            kind = "unrecognized_arguments_suggestion" if suggestions else "unrecognized_arguments"
+            message = _ERROR_KINDS[kind]["message"].format(arguments=" ".join(extras), suggestion=suggestion)
+            self.error(_KErrorMessage(message, kind))
+
+        return namespace
+
+    def _expand_args(self, arg_strings, new_arg_strings):
+        """
+        Copies the regular arguments into a list and yields the argument files.
+
+        This is a generator for the _read_args_from_files() method. It
+        stops at each argument that names an argument file, so the file
+        can be expanded in place, and picks up where it left off when
+        it's resumed.
+
+        Arguments:
+            arg_strings (iterable, required):
+                The arguments to expand.
+            new_arg_strings (list, required):
+                The list the regular arguments are appended to.
+
+        Yields:
+            string:
+                The path of each argument file.
+        """
+
+        append = new_arg_strings.append
+        prefix_chars = self.fromfile_prefix_chars
+        for arg_string in arg_strings:
+            if not arg_string or arg_string[0] not in prefix_chars:
+                append(arg_string)
+            else:
+                yield arg_string[1:]
+
+    def _expand_args_file(self, path, new_arg_strings):
+        """
+        Copies the regular arguments in an argument file into a list and
+        yields the argument files it names.
+
+        The file is read a line or a chunk of lines at a time. The lines
+        are split the same as argparse splits the whole file, then
+        converted into arguments with the convert_arg_line_to_args()
+        method. See _expand_args() for the rest.
+
+        Arguments:
+            path (string, required):
+                The argument file.
+            new_arg_strings (list, required):
+                The list the regular arguments are appended to.
+
+        Yields:
+            string:
+                The path of each argument file.
+
+        Raises:
+            OSError:
+                If the file can't be opened or read.
+        """
+
+        append = new_arg_strings.append
+        convert_arg_line_to_args = self.convert_arg_line_to_args
+        prefix_chars = self.fromfile_prefix_chars
+        with open(path, **_ARGS_FILE_ENCODING) as args_file:
+            # With argparse's convert_arg_line_to_args(), each line is an
+            # argument. Read the lines in chunks, and copy a whole chunk at
+            # once unless it names an argument file.
+            if getattr(convert_arg_line_to_args, "__func__", None) is ArgumentParser.convert_arg_line_to_args:
+                prefixes = repeat(tuple(prefix_chars))
+                for chunk in iter(partial(args_file.read, _ARGS_FILE_CHUNK_SIZE), ""):
+                    # Finish the last line, so no line is split between chunks.
+                    arg_strings = (chunk + args_file.readline()).splitlines()
+                    if not any(map(str.startswith, arg_strings, prefixes)):
+                        new_arg_strings.extend(arg_strings)
+                        continue
+                    for arg_string in arg_strings:
+                        if not arg_string or arg_string[0] not in prefix_chars:
+                            append(arg_string)
+                        else:
+                            yield arg_string[1:]
+                return
+
+            for line in args_file:
+                for arg_line in line.splitlines():
+                    for arg_string in convert_arg_line_to_args(arg_line):
+                        if not arg_string or arg_string[0] not in prefix_chars:
+                            append(arg_string)
+                        else:
+                            yield arg_string[1:]
+
+    def _parse_record(self, args):
+        """
+        Parses one command line for parse_many() and parse_stream().
+
+        The errors are kept by the error() method instead of being
+        raised, the same as when the parser is collecting errors, and
+        the output of the help and version options is captured.
+
+        Arguments:
+            args (list or ValueError, required):
+                The arguments, or the error from splitting a line.
+
+        Returns:
+            namespace or KArgParseError:
+                The populated namespace, the first error (or all of the
+                errors, if the parser was created with collect_errors),
+                or the captured output of the help or version option.
+
+        Raises:
+            KProgramError:
+                If there is a programming error.
+        """
+
+        errors = self._collected_errors = []
+        self._batch_output = []
+        try:
+            # A line that can't be split is a usage error.
+            if isinstance(args, ValueError):
+                kind = "invalid_line"
+                self.error(_KErrorMessage(_ERROR_KINDS[kind]["message"].format(error=args), kind))
+                result = None
+            else:
+                result = self._parse_args(args, None)
+        # An error that can't be recovered from ends the parsing early.
+        except _KStopParsing:
+            result = None
+        # The help and the version are returned with their output.
+        except KProgramError:
+            raise
+        except KArgParseError as error:
+            result = error
+        finally:
+            self._collected_errors = None
+            self._batch_output = None
+
+        # The first error is the one parse_args() would have raised, or
+        # all of them if the parser was created with collect_errors.
+        if len(errors) == 1 or (errors and not self._collect_errors):
+            result = errors[0]
+        elif errors:
+            result = KMultipleErrors(errors)
+
+        return result
+
+    def _print_message(self, message, file=None):
+        """Prints a message, or captures it during parse_many()."""
+
+        if self._batch_output is not None:
+            if message:
+                self._batch_output.append(message)
+            return
+
+        super()._print_message(message, file)
+
+    def _read_args_from_files(self, arg_strings):
+        """
+        Replaces each argument that names an argument file with its arguments.
+
+        This is the same as argparse's _read_args_from_files() method,
+        except the files are streamed instead of read whole. argparse
+        reads each file into memory, splits it into a list of lines, and
+        copies the arguments of a nested file into each enclosing list.
+        Here, the open files are kept on a stack and read one line at a
+        time, and every argument goes straight into the list that is
+        returned. A file that includes itself is an error instead of a
+        RecursionError.
+
+        Arguments:
+            arg_strings (list, required):
+                The arguments from the command line.
+
+        Returns:
+            list:
+                The arguments with every argument file expanded.
+
+        Raises:
+            ArgumentError:
+                If an argument file can't be read or includes itself.
+        """
+
+        new_arg_strings = []
+        # The arguments being expanded and the path of each argument file
+        # being read. Each one stops at an argument file, which is read
+        # before it is resumed.
+        stack = [self._expand_args(arg_strings, new_arg_strings)]
+        paths = [None]
+        try:
+            while stack:
+                try:
+                    path = next(stack[-1])
+                # This file is done, go back to the one that named it.
+                except StopIteration:
+                    stack.pop()
+                    paths.pop()
+                    continue
+                # This file can't be read, skip the rest of it.
+                except OSError as error:
+                    stack.pop()
+                    paths.pop()
+                    self.error(str(error))
+                    continue
+
+                # Read the argument file, unless it is already being read.
+                if realpath(path) in paths:
+                    kind = "args_file_cycle"
+                    self.error(_KErrorMessage(_ERROR_KINDS[kind]["message"].format(path=path), kind))
+                    continue
+                stack.append(self._expand_args_file(path, new_arg_strings))
+                paths.append(realpath(path))
+        finally:
+            # Close any argument files left open by an error.
+            for expansion in stack:
+                expansion.close()
+
+        return new_arg_strings
+
     def add_argument(self, *args, **kwargs):
         """
         Add an argument to the parser.
@@ -339,6 +1988,13 @@ class KArgumentParser(ArgumentParser):
             **action (string, optional):
                 The basic type of action to be taken when this argument is
                 encountered at the command line (default: "store_action").
+            **array (boolean or string, optional):
+                Convert the values into one array instead of a list. The
+                type must be int or float and the nargs must take a list.
+                This can be "array" for an array.array, "numpy" for a
+                NumPy array, or True for a NumPy array if NumPy is
+                installed and an array.array otherwise. See the vector
+                module for additional help (default: None).
             **choices (container or function, optional):
                 A container of the allowable values for the argument. An
                 evaluated or unevaluated function can also be passed to
@@ -346,7 +2002,9 @@ class KArgumentParser(ArgumentParser):
                 a container. If the function is unevaluated, it either
                 takes no arguments and returns a container; or it takes
                 one argument which is the value of the argument from
-                the command line and returns a boolean (default: None).
+                the command line and returns a boolean. Once the argument
+                is added, a choice in a list must not be replaced in
+                place, assign a new list instead (default: None).
             **const (type, optional):
                 A constant value required by some action and nargs
                 selections (default: None).
@@ -366,8 +2024,11 @@ class KArgumentParser(ArgumentParser):
                 for showing the structured input (default: None)
             **nargs (string or integer, optional):
                 The number of command line arguments that should
-                be consumed. This can either be an integer or a
-                metacharacter, e.g. "?", "+", or "*".
+                be consumed. This can either be an integer, a
+                metacharacter, e.g. "?", "+", or "*", or one of the
+                expressions "N+" (N or more) or "{m,n}" (at least m
+                and at most n). The expressions are only supported by
+                the KHelpFormatter formatter class.
             **required (boolean, optional):
                 Whether or not the command line option may be omitted
                 (optionals only) (default: False).
@@ -392,22 +2053,41 @@ class KArgumentParser(ArgumentParser):
                 error during the creation of the action class.
         """
 
+        # The array option isn't an argparse keyword argument.
+        array = kwargs.pop("array", None)
+
         # Attempt to add the argument and exit if there are any errors.
         try:
+            # Check the nargs to make sure the formatter class can format it. The formatters
+            # of argparse don't know the KArgParse expressions (e.g., "2+", "{1,3}").
+            if get_nargs_range(kwargs.get("nargs")) is not None and not (isinstance(self.formatter_class, type) and issubclass(self.formatter_class, KHelpFormatter)):
+                raise _KArgumentError(None, "unsupported_nargs_formatter", name="/".join(args), nargs=kwargs["nargs"])
             action = super().add_argument(*args, **kwargs)
             # Check the type to make sure it is in allowed_types.
             if action.type is not None:
                 name = getattr(action.type, "__name__", repr(action.type))
                 if not self._allowed_types.get(name):
-                    message = "The specified type '{}' is not supported.".format(name)
-                    raise ArgumentError(action, message)
+                    raise _KArgumentError(action, "unsupported_type", type=name)
+            # Check the nargs to make sure it is supported.
+            if isinstance(action.nargs, str) and action.nargs not in _NARGS_METACHARACTERS and get_nargs_range(action.nargs) is None:
+                raise _KArgumentError(action, "unsupported_nargs", nargs=action.nargs)
+            # Check the array option to make sure the argument takes a list of numbers.
+            if array is not None and array is not False:
+                try:
+                    action.array = get_array_backend(array)
+                except ValueError:
+                    raise _KArgumentError(action, "unsupported_array", array=array) from None
+                takes_list = action.nargs in (ONE_OR_MORE, ZERO_OR_MORE) or isinstance(action.nargs, int) or get_nargs_range(action.nargs) is not None
+                if not is_array_type(action.type) or not takes_list:
+                    raise _KArgumentError(action, "array_parameters")
+            # Compile the nargs and the static choices now, so parsing doesn't have to.
+            self._get_nargs_matcher(action)
+            if action.choices is not None and not callable(action.choices):
+                self._get_choices_index(action)
         # If an ArgumentError was raised, handle the error.
         except ArgumentError as error:
-            error = str(error)
-            # Capitialize the first letter of the error message.
-            error = error[0].upper() + error[1:]
             # Pass the error onwards to continue the error handling.
-            self.error(error)
+            self.error(_get_error_message(error))
 
         # Return the added argument.
         return action
@@ -478,7 +2158,9 @@ class KArgumentParser(ArgumentParser):
         KArgumentError and KUsageError should be the only errors
         caught. KProgramError represents a programming error and needs
         to be let through. Each exception has a user definable exit code,
-        see the modify_error_codes() method for addtitonal help.
+        see the modify_error_codes() method for addtitonal help. While
+        the parser is collecting errors (see the parse_args() method),
+        argument and usage errors are kept and this method returns.
 
         Arguments:
             message (string, required):
@@ -496,25 +2178,51 @@ class KArgumentParser(ArgumentParser):
                 do a help on this error.
         """
 
-        # Make sure a message was provided.
-        if message:
-            # Look for the error in error_messages and handle the error.
-            for regex, dictionary in self._error_messages.items():
-                # If a match was found, handle the error.
-                if match(regex, message):
-                    # Format the new message.
-                    message = dictionary["message"].format(group=match(regex, message).groups(), string=match(regex, message).string)
-                    # Get the exit status.
-                    status = self._error_codes[dictionary["error_type"]]
-                    # Get the exception class.
-                    exception = self._error_classes[dictionary["error_type"]]
-
-                    # If exit_on_error is True and the error_type is not a programming error, exit the program.
-                    if self._exit_on_error and dictionary["error_type"] != "program":
-                        self.exit(status, message)
-
-                    # Otherwise, raise the exception for the user to handle.
-                    raise exception(message, status)
+        # During the first phase of parse_args_async(), the error is handled after the pending values.
+        if self._async_pending is not None:
+            raise _KDeferredError(self, message)
+
+        # An error raised by KArgParse carries its kind, so its message is already formatted.
+        error_type = None
+        stop = False
+        kind = getattr(message, "kind", None)
+        if kind is not None:
+            message = str(message)
+            error_type = _ERROR_KINDS[kind]["error_type"]
+        # Otherwise, look for the error in the argparse error messages.
+        elif message:
+            for regex, dictionary in _ERROR_MESSAGES:
+                groups = regex.match(message)
+                # If a match was found, format the new message.
+                if groups is not None:
+                    message = dictionary["message"].format(group=groups.groups(), string=message)
+                    error_type = dictionary["error_type"]
+                    stop = dictionary.get("stop", False)
+                    break
+
+        # Make sure the error was found and handle the error.
+        if error_type is not None:
+            # Get the exit status.
+            status = self._error_codes[error_type]
+            # Get the exception class.
+            exception = self._error_classes[error_type]
+
+            # When collecting errors, keep the error and let the parsing continue,
+            # unless argparse can't go on from the error (e.g., an ambiguous option).
+            # Programming errors are still raised right away.
+            if self._collected_errors is not None and error_type != "program":
+                self._collected_errors.append(exception(message, status))
+                if stop:
+                    raise _KStopParsing()
+                return
+
+            # If exit_on_error is True and the error_type is not a programming error, exit the program.
+            # The program never exits during parse_many().
+            if self._exit_on_error and self._batch_output is None and error_type != "program":
+                self.exit(status, message)
+
+            # Otherwise, raise the exception for the user to handle.
+            raise exception(message, status)
 
         # Raise an exception if there was not a message or a match.
         message = "Undefined error message. That should not happen. Message: {}".format(str(message))
@@ -539,17 +2247,21 @@ class KArgumentParser(ArgumentParser):
                 The string representation of an error.
         """
 
+        # During parse_many(), raise the captured output instead of exiting.
+        if self._batch_output is not None:
+            raise KArgParseError("".join(self._batch_output) or message or "", status)
+
         # If the exit status is not zero, print the usage statement.
         if status != 0:
             # Save the error message to be used later.
             self._error_message = message
-            self.print_usage(stderr)
+            self.print_usage(sys.stderr)
 
             # Check the formatter_class.
             if self._error_message and self.formatter_class != KHelpFormatter:
                 # The formatter_class is not KHelpFormatter, print the error message manually.
                 self._error_message = self.prog + ": Error: " + self._error_message
-                print(self._error_message, file=stderr)
+                print(self._error_message, file=sys.stderr)
 
         # Exit with the specified status.
         exit(status)
@@ -559,7 +2271,9 @@ class KArgumentParser(ArgumentParser):
         Formats the help statement.
 
         Each section that will be part of the help statement is given
-        to the formatter class to be formatted and joined together.
+        to the formatter class to be formatted and joined together. The
+        help statement is kept until the parser changes, see the
+        _format_statement() method.
 
         Returns:
             string:
@@ -568,51 +2282,66 @@ class KArgumentParser(ArgumentParser):
 
         # Check the formatter_class.
         if self.formatter_class == KHelpFormatter:
-            # Get the formatter.
-            formatter = self._get_formatter()
+            return self._format_statement(True)
 
-            # Format and add the usage.
-            formatter.add_usage(self.usage, self._actions, self._mutually_exclusive_groups)
+        return super().format_help()
 
-            # Format and add the description.
-            formatter.start_section("Description")
-            formatter.add_text(self.description)
-            formatter.end_section()
+    def format_help_topic(self, topic):
+        """
+        Formats the help for a topic.
 
-            # Format the positionals, optionals and user-defined groups.
-            for action_group in self._action_groups:
-                if action_group.title == self._optionals.title:
-                    action_group._group_actions.sort(key=formatter.get_format_option_strings())
+        Only the argument groups and arguments that match the topic are
+        formatted, the same as in the help statement. A whole group is
+        formatted with its description. The usage, the description, and
+        the epilog of the parser are left out. See the topics module for
+        additional help.
 
-                formatter.start_section(action_group.title)
-                formatter.add_text(action_group.description)
-                formatter.add_arguments(action_group._group_actions)
-                formatter.end_section()
+        Arguments:
+            topic (string, required):
+                The title of an argument group, an option string, or one
+                or more words.
 
-            # Format and add the epilog.
-            formatter.start_section("Epilog")
-            formatter.add_text(self.epilog)
-            formatter.end_section()
+        Returns:
+            string:
+                The formatted help for the topic.
+
+        Raises:
+            KUsageError:
+                If nothing matches the topic and exit_on_error is False.
+        """
 
-            # Format and add the error diagnostics.
-            if self.add_help:
-                formatter.start_section("Error Diagnostics (use -h|--help for usage details)")
+        matches = self._get_help_index().find(topic)
+        if not matches:
+            kind = "unknown_help_topic"
+            self.error(_KErrorMessage(_ERROR_KINDS[kind]["message"].format(topic=topic), kind))
+
+        formatter = self._get_formatter()
+        for group, actions in matches:
+            formatter.start_section(group.title)
+            # A whole group is formatted with its description.
+            if actions is None:
+                formatter.add_text(group.description)
+                actions = group._group_actions
+            if group.title == self._optionals.title and isinstance(formatter, KHelpFormatter):
+                formatter.add_sorted_arguments(actions)
             else:
-                formatter.start_section("Error Diagnostics")
-            formatter.add_text(self._error_message)
+                formatter.add_arguments(actions)
             formatter.end_section()
 
-            # Determine and return the help statement from everything added above.
-            return formatter.format_help()
+        # Check the formatter_class.
+        if isinstance(formatter, KHelpFormatter):
+            return formatter.normalize_help(formatter._root_section.format_help(), full=True) # pylint: disable=W0212
 
-        return super().format_help()
+        return formatter.format_help()
 
     def format_usage(self):
         """
         Formats the usage statement.
 
         Each section that will be part of the usage statement is given
-        to the formatter class to be formatted and joined together.
+        to the formatter class to be formatted and joined together. The
+        usage statement is kept until the parser changes, see the
+        _format_statement() method.
 
         Returns:
             string:
@@ -621,22 +2350,7 @@ class KArgumentParser(ArgumentParser):
 
         # Check the formatter_class.
         if self.formatter_class == KHelpFormatter:
-            # Get the formatter.
-            formatter = self._get_formatter()
-
-            # Format and add the usage.
-            formatter.add_usage(self.usage, self._actions, self._mutually_exclusive_groups)
-
-            # Format and add the error diagnostics.
-            if self.add_help:
-                formatter.start_section("Error Diagnostics (use -h|--help for usage details)")
-            else:
-                formatter.start_section("Error Diagnostics")
-            formatter.add_text(self._error_message)
-            formatter.end_section()
-
-            # Determine and return the usage statement from everything added above.
-            return formatter.format_help()
+            return self._format_statement(False)
 
         return super().format_usage()
 
@@ -725,6 +2439,109 @@ class KArgumentParser(ArgumentParser):
         if "usage" in kwargs:
             self._error_codes["usage"] = int(kwargs.pop("usage"))
 
+    def parse_args(self, args=None, namespace=None):
+        """
+        Parses the command line arguments.
+
+        This is the same as argparse's parse_args() method. If the parser
+        was created with collect_errors, the parsing continues after an
+        argument or usage error. An invalid value is replaced with the
+        argument's default, and each error is collected. An error that
+        can't be recovered from (e.g., an option without its arguments)
+        ends the parsing early. All of the errors are then reported
+        together. They are listed one per line in the usage statement,
+        or raised as a KMultipleErrors exception (a single error is
+        raised as usual).
+
+        Arguments:
+            args (list, optional):
+                A list of arguments to parse (default: The command
+                line arguments).
+            namespace (class, optional):
+                The namespace to populate (default: A new Namespace
+                object will be created).
+
+        Returns:
+            namespace:
+                The populated namespace.
+
+        Raises:
+            KArgumentError, KProgramError, KUsageError:
+                See the error() method for additional help.
+            KMultipleErrors:
+                If the parser was created with collect_errors and more
+                than one error was found.
+        """
+
+        # When collecting errors, the unrecognized arguments are collected as well.
+        if self._collect_errors and self._collected_errors is None:
+            return self._collect(self._parse_args, args, namespace)
+
+        return self._parse_args(args, namespace)
+
+    async def parse_args_async(self, args=None, namespace=None):
+        """
+        Parses the command line arguments with asynchronous type and
+        choices functions.
+
+        This method is the same as parse_args(), except that a type or
+        choices function can return an awaitable (e.g., it can be a
+        coroutine function). The command line is parsed first, leaving a
+        placeholder for each value that is still being converted. Then all
+        of the awaitables are awaited concurrently, and the placeholders
+        are replaced by the converted values. If there are any errors,
+        the one that parse_args() would have reported is passed to the
+        error() method, so the error handling is the same as parse_args().
+        Custom actions see the placeholders, not the converted values.
+
+        Arguments:
+            args (list, optional):
+                A list of arguments to parse (default: The command
+                line arguments).
+            namespace (class, optional):
+                The namespace to populate. See the parse_known_args()
+                method for additional help (default: A new Namespace
+                object will be created).
+
+        Returns:
+            namespace:
+                The populated namespace.
+
+        Raises:
+            KArgumentError, KProgramError, KUsageError:
+                See the error() method for additional help.
+        """
+
+        # Parse the command line, keeping the pending values and checks.
+        pending = []
+        deferred = None
+        self._async_pending = pending
+        try:
+            namespace = self.parse_args(args, namespace)
+        except _KDeferredError as error:
+            deferred = error
+        finally:
+            self._async_pending = None
+
+        # Await all of the pending values and checks at once.
+        errors = await gather(*[item.resolve() for item in pending])
+
+        # The pending values and checks come before any error raised while parsing,
+        # so the first one that failed is the error parse_args() would have reported.
+        for item, error in zip(pending, errors):
+            if error is not None:
+                item.parser.error(_get_error_message(error))
+        if deferred is not None:
+            deferred.parser.error(deferred.message)
+
+        # Replace the placeholders with the converted values.
+        if pending:
+            kwargs = namespace._get_kwargs() if hasattr(namespace, "_get_kwargs") else list(vars(namespace).items()) # pylint: disable=W0212
+            for name, value in kwargs:
+                setattr(namespace, name, _replace_pending_values(value))
+
+        return namespace
+
     def parse_known_args(self, args=None, namespace=None):
         """
         Parses the known command line arguments.
@@ -735,6 +2552,11 @@ class KArgumentParser(ArgumentParser):
         error if there are unknown arguments. This allows the remaining
         arguments to be passed on to another script or program.
 
+        A new namespace is seeded with a cached copy of the parser's
+        defaults. The cache is refreshed when an argument is added or
+        removed, or set_defaults() is called. Use set_defaults() rather
+        than assigning to an argument's default directly.
+
         Arguments:
             args (list, required):
                 A list of arguments to parse (default: The command
@@ -757,29 +2579,42 @@ class KArgumentParser(ArgumentParser):
                 of the arguments.
         """
 
+        # When collecting errors, collect them for the whole call (see the parse_args() method).
+        if self._collect_errors and self._collected_errors is None:
+            return self._collect(self.parse_known_args, args, namespace)
+
         # If no arguments are given, default to the system arguments.
         if args is None:
-            args = argv[1:]
+            args = sys.argv[1:]
         # Otherwise, make sure the arguments are mutable.
         else:
             args = list(args)
 
-        # If no Namespace was given, create the default Namespace.
-        # The Namespace will be built up with the parser's defaults.
-        if namespace is None:
+        # If no Namespace was given, create the default Namespace and
+        # add all of the parser's defaults to it at once.
+        if namespace is None and self._namespace_class == "slots":
+            namespace = self._get_namespace_factory()()
+        elif namespace is None:
             namespace = Namespace()
+            namespace.__dict__.update(self._get_defaults_template())
 
-        # Add any action defaults to the Namespace that aren't present.
-        for action in self._actions:
-            if action.dest is not SUPPRESS:
-                if not hasattr(namespace, action.dest):
-                    if action.default is not SUPPRESS:
-                        setattr(namespace, action.dest, action.default)
-
-        # Add any parser defaults to the Namespace that aren't present.
-        for dest in self._defaults:
-            if not hasattr(namespace, dest):
-                setattr(namespace, dest, self._defaults[dest])
+        # Otherwise, add the defaults one at a time.
+        else:
+            # Add any action defaults to the Namespace that aren't present.
+            for action in self._actions:
+                if action.dest is not SUPPRESS:
+                    if not hasattr(namespace, action.dest):
+                        if action.default is not SUPPRESS:
+                            setattr(namespace, action.dest, action.default)
+
+            # Add any parser defaults to the Namespace that aren't present.
+            for dest in self._defaults:
+                if not hasattr(namespace, dest):
+                    setattr(namespace, dest, self._defaults[dest])
+
+        # When choices_cache is "parse", the choices results are kept until the parsing is done.
+        if self._choices_cache == "parse":
+            self._choices_results = {}
 
         # Attempt to parse the arguments and exit if there are any errors.
         try:
@@ -791,9 +2626,158 @@ class KArgumentParser(ArgumentParser):
         # If an ArgumentError was raised, handle the error.
         # All ArgumentError's that are raised come through here except for three raised in add_argument().
         except ArgumentError as error:
-            error = str(error)
-            # Capitialize the first letter of the error message.
-            error = error[0].upper() + error[1:]
             # Pass the error onwards to continue the error handling.
-            self.error(error)
+            self.error(_get_error_message(error))
+            # The error() method only returns when it's collecting errors,
+            # but the parsing can't continue after this error.
+            raise _KStopParsing() from None
+        finally:
+            self._choices_results = None
+
+    def parse_many(self, argvs):
+        """
+        Parses many command lines.
+
+        This method is for validating a large number of stored command
+        lines with one parser. Each command line is parsed the same as
+        parse_args(), except that errors are returned instead of raised
+        and the program never exits, regardless of exit_on_error. The
+        errors are kept by the error() method, the same as when the
+        parser is collecting errors, and the first one is returned (or
+        all of them, if the parser was created with collect_errors). If a
+        command line asks for the help or the version, the text that
+        would have been printed is returned as a KArgParseError with an
+        exit status of zero.
+
+        Arguments:
+            argvs (iterable, required):
+                The command lines to parse. Each command line is a list
+                of argument strings, without the program name.
+
+        Yields:
+            namespace or KArgParseError:
+                The populated namespace for each command line that was
+                parsed successfully. Otherwise, the KArgumentError or
+                KUsageError that parse_args() would have raised.
+
+        Raises:
+            KProgramError:
+                If there is a programming error. These errors are never
+                returned.
+        """
 
+        for args in argvs:
+            yield self._parse_record(args)
+
+    def parse_stream(self, stream):
+        """
+        Parses one command line per line of a file.
+
+        This method is for running the command lines in a job file or
+        from stdin. Each line is split into arguments the same as a
+        POSIX shell (see Python's shlex module), and parsed the same as
+        parse_many(). The lines are read one at a time, so any size of
+        file can be parsed with a small amount of memory. A blank line
+        or a comment is skipped. A line without quotes, escapes, or
+        comments is split with str.split(), which is much faster than
+        shlex. Most of the time is spent parsing, so the rate depends
+        on the parser. On one core, it is about ten thousand lines per
+        second for short command lines, or about 1 MB per second (see
+        tests/benchmark/benchstream.py).
+
+        Arguments:
+            stream (iterable, required):
+                The lines to parse, e.g. a file opened in text mode or
+                sys.stdin.
+
+        Yields:
+            tuple:
+                A two item tuple containing the line number, starting at
+                one, and the namespace or KArgParseError the same as
+                parse_many(). A line that can't be split (e.g., a quote
+                isn't closed) is a KUsageError.
+
+        Raises:
+            KProgramError:
+                If there is a programming error. These errors are never
+                returned.
+        """
+
+        for number, line in enumerate(stream, 1):
+            try:
+                args = _split_line(line)
+            except ValueError as error:
+                args = error
+            if args:
+                yield number, self._parse_record(args)
+
+    def print_help(self, file=None, topic=None):
+        """
+        Prints the help statement, or the help for a topic.
+
+        The help statement is written one part at a time, see the
+        write_help() method. The help for a topic is small, so it is
+        formatted first, see the format_help_topic() method.
+
+        Arguments:
+            file (file, optional):
+                The file to print to (default: sys.stdout).
+            topic (string, optional):
+                The topic to print the help for (default: None).
+        """
+
+        if topic is not None:
+            self._print_message(self.format_help_topic(topic), file or sys.stdout)
+        # Check the formatter_class, and capture the output during parse_many().
+        elif self.formatter_class != KHelpFormatter or self._batch_output is not None:
+            super().print_help(file)
+        else:
+            self.write_help(file)
+
+    def write_help(self, file=None):
+        """
+        Writes the help statement to a file.
+
+        The help statement of a parser with thousands of options is
+        hundreds of kilobytes long, and format_help() puts all of it
+        together before any of it can be written. This method writes
+        each part of the help statement as soon as it is formatted (see
+        KHelpFormatter's write_help() method), so the usage shows up
+        right away, however many options there are. The text is the same
+        as format_help()'s. A help statement that is already kept (see
+        the _format_statement() method) is written as it is. Errors
+        writing to the file (e.g., a closed pipe) are ignored, the same
+        as argparse's print_help().
+
+        Arguments:
+            file (file, optional):
+                The file to write to (default: sys.stdout).
+        """
+
+        # Without a stdout (e.g., under pythonw), write to stderr the same as argparse.
+        if file is None:
+            file = sys.stdout
+        file = file or sys.stderr
+
+        try:
+            # Check the formatter_class.
+            if self.formatter_class != KHelpFormatter:
+                file.write(self.format_help())
+                return
+
+            # Write the help statement without any diagnostics, if it is kept.
+            messages = (self._error_message or "").splitlines()
+            statement = self._statements.get(True)
+            if not messages and statement is not None and statement["plain"] is not None and statement["key"] == self._get_statement_key():
+                file.write(statement["plain"])
+                return
+
+            formatter = self._get_formatter()
+            self._add_sections(formatter, True, messages)
+            formatter.write_help(file)
+        # A file that can't be written to (e.g., a pipe that was closed) is ignored, the same as argparse.
+        except OSError:
+            pass
+        except AttributeError:
+            if hasattr(file, "write"):
+                raise
@@ -0,0 +1,263 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# A snapshot is a pickled copy of a fully built parser. Large parsers
+# spend most of their startup time in add_argument(), so loading a
+# snapshot is considerably faster than rebuilding the parser. Each
+# snapshot is keyed by a hash of the source file that declares the
+# parser (along with the KArgParse, argparse, and Python versions
+# and the program name). If any of those change, the key changes,
+# the snapshot is considered stale, and the parser is rebuilt and
+# saved again. A snapshot can also be discarded explicitly with the
+# invalidate_snapshot() function.
+#
+# Snapshots are loaded with pickle, so the snapshot directory must only
+# be writable by trusted users. The default directory is taken from the
+# KARGPARSE_SNAPSHOT_DIR environment variable, if it is set. Otherwise,
+# it is "~/.cache/kargparse".
+
+from argparse import SUPPRESS, __version__ as argparse_version_string
+from hashlib import sha256
+from inspect import getsourcefile
+from os import environ, getpid, makedirs, remove, replace
+from os.path import basename, expanduser, join
+from pickle import HIGHEST_PROTOCOL, PickleError, Pickler, Unpickler, UnpicklingError
+from sys import argv, version_info
+
+from kargparse import VERSION
+
+class _SnapshotPickler(Pickler):
+    """
+    Object that extends pickle's Pickler.
+
+    Argparse compares against SUPPRESS by identity (e.g., "action.help is
+    SUPPRESS"), and an unpickled string is a new object. This pickler
+    stores a reference to SUPPRESS instead of its value.
+    """
+
+    def persistent_id(self, obj):
+        """Returns a persistent ID for SUPPRESS, otherwise None."""
+
+        if obj is SUPPRESS:
+            return "SUPPRESS"
+
+        return None
+
+class _SnapshotUnpickler(Unpickler):
+    """
+    Object that extends pickle's Unpickler.
+
+    This unpickler restores the references stored by _SnapshotPickler.
+    """
+
+    def persistent_load(self, pid):
+        """Returns the object for a persistent ID."""
+
+        if pid == "SUPPRESS":
+            return SUPPRESS
+
+        raise UnpicklingError("Unsupported persistent ID: {}".format(pid))
+
+def _get_snapshot_dir(cache_dir):
+    """Returns the directory where snapshots are stored."""
+
+    if cache_dir is None:
+        cache_dir = environ.get("KARGPARSE_SNAPSHOT_DIR") or join(expanduser("~"), ".cache", "kargparse")
+
+    return cache_dir
+
+def get_snapshot_key(builder):
+    """
+    Computes the key for a builder's snapshot.
+
+    The key is a hash of the source file that declares the builder,
+    the builder's qualified name, the KArgParse, argparse, and Python
+    versions, and the program name. If the source file can't be found
+    (e.g., the builder was defined interactively), no key is computed.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+
+    Returns:
+        string:
+            The key, or None if the source file can't be read.
+    """
+
+    try:
+        with open(getsourcefile(builder), "rb") as source_file:
+            source = source_file.read()
+    except (OSError, TypeError):
+        return None
+
+    digest = sha256(source)
+    digest.update("\0".join([builder.__module__,
+                             builder.__qualname__,
+                             str(VERSION),
+                             argparse_version_string,
+                             "{}.{}".format(*version_info[:2]),
+                             basename(argv[0])]).encode("utf-8"))
+
+    return digest.hexdigest()
+
+def get_snapshot_path(builder, cache_dir=None):
+    """
+    Returns the path of a builder's snapshot.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+        cache_dir (string, optional):
+            The directory where snapshots are stored (default: See
+            the comments at the top of this module).
+
+    Returns:
+        string:
+            The path of the snapshot.
+    """
+
+    name = "{}.{}.snapshot".format(builder.__module__, builder.__qualname__)
+
+    return join(_get_snapshot_dir(cache_dir), name)
+
+def load_snapshot(builder, cache_dir=None):
+    """
+    Loads a builder's parser from its snapshot.
+
+    The snapshot is only loaded if its key matches the current key for
+    the builder. The key is stored ahead of the parser in the snapshot,
+    so a stale snapshot is rejected without unpickling the parser.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+        cache_dir (string, optional):
+            The directory where snapshots are stored (default: See
+            the comments at the top of this module).
+
+    Returns:
+        parser:
+            The parser, or None if the snapshot is missing, stale,
+            or unreadable.
+    """
+
+    key = get_snapshot_key(builder)
+    if key is None:
+        return None
+
+    try:
+        with open(get_snapshot_path(builder, cache_dir), "rb") as snapshot_file:
+            unpickler = _SnapshotUnpickler(snapshot_file)
+            if unpickler.load() != key:
+                return None
+            return unpickler.load()
+    # A damaged snapshot is treated the same as a missing snapshot.
+    except Exception: # pylint: disable=W0703
+        return None
+
+def save_snapshot(builder, parser, cache_dir=None):
+    """
+    Saves a builder's parser to its snapshot.
+
+    The snapshot is written to a temporary file and then moved into
+    place, so a concurrent load_snapshot() never sees a partial
+    snapshot. A parser that can't be pickled (e.g., one that has a
+    lambda for a type or choices) is not saved.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+        parser (class, required):
+            The parser returned by the builder.
+        cache_dir (string, optional):
+            The directory where snapshots are stored (default: See
+            the comments at the top of this module).
+
+    Returns:
+        boolean:
+            True if the snapshot was saved, otherwise False.
+    """
+
+    key = get_snapshot_key(builder)
+    if key is None:
+        return False
+
+    path = get_snapshot_path(builder, cache_dir)
+    temporary_path = "{}.{}.tmp".format(path, getpid())
+    try:
+        makedirs(_get_snapshot_dir(cache_dir), exist_ok=True)
+        with open(temporary_path, "wb") as snapshot_file:
+            pickler = _SnapshotPickler(snapshot_file, HIGHEST_PROTOCOL)
+            pickler.dump(key)
+            pickler.dump(parser)
+        replace(temporary_path, path)
+    except (OSError, PickleError, AttributeError, TypeError):
+        try:
+            remove(temporary_path)
+        except OSError:
+            pass
+        return False
+
+    return True
+
+def invalidate_snapshot(builder, cache_dir=None):
+    """
+    Removes a builder's snapshot.
+
+    Snapshots become stale on their own when the declaring source file
+    changes. This function is for the cases a source hash can't detect,
+    e.g., when the builder's behavior depends on a configuration file.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+        cache_dir (string, optional):
+            The directory where snapshots are stored (default: See
+            the comments at the top of this module).
+    """
+
+    try:
+        remove(get_snapshot_path(builder, cache_dir))
+    except FileNotFoundError:
+        pass
+
+def build_parser(builder, cache_dir=None):
+    """
+    Returns a builder's parser, using its snapshot when possible.
+
+    If there is a current snapshot for the builder, the parser is
+    loaded from it. Otherwise, the builder is called and the parser
+    it returns is saved as the new snapshot. The builder must be a
+    module level function so its source file can be hashed.
+
+    Arguments:
+        builder (function, required):
+            A function that takes no arguments and returns a fully
+            built parser.
+        cache_dir (string, optional):
+            The directory where snapshots are stored (default: See
+            the comments at the top of this module).
+
+    Returns:
+        parser:
+            The parser.
+    """
+
+    parser = load_snapshot(builder, cache_dir)
+    if parser is None:
+        parser = builder()
+        save_snapshot(builder, parser, cache_dir)
+
+    return parser
@@ -0,0 +1,123 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# When a parser is created with suggest_on_error, an invalid choice or an
+# unrecognized option is reported with the closest valid one, e.g. "maybe
+# you meant --tenant?". Comparing the word with every choice would be far
+# too slow for a large set of choices, so the suggestions come from a
+# trigram index. The words that share the most trigrams with the word are
+# the candidates, and only those are compared by edit distance. A parser
+# builds an index the first time it needs one and keeps it.
+#
+# Each lookup has a time budget. If it runs out, the best suggestion found
+# so far is returned, so a suggestion never holds up the error by much.
+
+from collections import Counter
+from time import perf_counter
+
+# The number of candidates compared by edit distance.
+_CANDIDATES = 32
+
+# The default time budget for a lookup, in seconds.
+_BUDGET = 0.05
+
+def _get_trigrams(word):
+    """Returns the set of trigrams in a word, including its ends."""
+
+    word = "\0{}\0".format(word)
+
+    return {word[position:position + 3] for position in range(len(word) - 2)}
+
+def _get_distance(first, second, maximum):
+    """Returns the edit distance between two words, or maximum + 1 if it's larger."""
+
+    if abs(len(first) - len(second)) > maximum:
+        return maximum + 1
+
+    previous = list(range(len(second) + 1))
+    for row, first_character in enumerate(first, 1):
+        current = [row]
+        for column, second_character in enumerate(second, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (first_character != second_character)))
+        # Stop once every distance in the row is too large.
+        if min(current) > maximum:
+            return maximum + 1
+        previous = current
+
+    return previous[-1]
+
+class KSuggestionIndex:
+    """
+    Object that finds the closest word to a misspelled one.
+
+    Arguments:
+        words (iterable, required):
+            The valid words. Anything that isn't a string is skipped.
+    """
+
+    def __init__(self, words):
+        self.words = []
+        self.trigrams = {}
+        seen = set()
+        for word in words:
+            if not isinstance(word, str) or word in seen:
+                continue
+            seen.add(word)
+            for trigram in _get_trigrams(word):
+                self.trigrams.setdefault(trigram, []).append(len(self.words))
+            self.words.append(word)
+
+    def suggest(self, word, budget=_BUDGET):
+        """
+        Returns the closest word to a misspelled one.
+
+        A word is close enough if the edit distance is at most a third
+        of the misspelled word's length, so very short words never get
+        a suggestion.
+
+        Arguments:
+            word (string, required):
+                The misspelled word.
+            budget (float, optional):
+                The most time to spend, in seconds (default: 0.05).
+
+        Returns:
+            string:
+                The closest word, or None if there isn't one close enough.
+        """
+
+        deadline = perf_counter() + budget
+        maximum = len(word) // 3
+        if not maximum:
+            return None
+
+        # Count the trigrams each word shares with the misspelled word. The
+        # rarest trigrams say the most about the word, so they go first. A
+        # trigram in more than a tenth of the words hardly tells them apart,
+        # so it is only counted if the rarer ones found nothing.
+        counts = Counter()
+        common = max(_CANDIDATES, len(self.words) // 10)
+        for postings in sorted((self.trigrams.get(trigram, ()) for trigram in _get_trigrams(word)), key=len):
+            if counts and len(postings) > common:
+                break
+            counts.update(postings)
+            if perf_counter() > deadline:
+                break
+
+        # Compare the candidates that share the most trigrams, closest first.
+        best, best_distance = None, maximum + 1
+        for position, _ in counts.most_common(_CANDIDATES):
+            distance = _get_distance(word, self.words[position], best_distance - 1)
+            if distance < best_distance:
+                best, best_distance = self.words[position], distance
+            if perf_counter() > deadline:
+                break
+
+        return best
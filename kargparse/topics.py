@@ -0,0 +1,146 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# The help statement of a parser with hundreds of options is long, and a
+# user usually only wants one area of it. When a parser is created with
+# help_topics, the -h|--help option takes an optional topic, and only the
+# matching part of the help statement is printed. A topic is one of:
+#
+#   - The title of an argument group, e.g. "--help network". The whole
+#     group is printed, including its description.
+#   - An option string, e.g. "--help=--host". The topic has to be given
+#     with "=", since argparse takes "--help --host" as two options and
+#     prints the whole help statement.
+#   - One or more words, e.g. "--help 'host name'". The arguments whose
+#     option strings, metavars, and help contain every word are printed,
+#     under the headings of their groups.
+#
+# The arguments are found with an inverted index from each word to the
+# arguments that contain it. A parser builds the index the first time a
+# topic is asked for and keeps it until an argument or a group is added.
+# Looking up a topic only touches the arguments that contain its words,
+# so the time to print the help for a topic depends on the size of the
+# result, not the size of the parser.
+
+from argparse import SUPPRESS
+from bisect import bisect_left
+from re import compile as compile_regex
+
+# A word is a run of letters and digits.
+_WORD = compile_regex("[^\\W_]+")
+
+def _get_words(text):
+    """Returns the words in a text, ignoring case."""
+
+    return _WORD.findall(text.casefold())
+
+def _in_sorted(positions, position):
+    """Returns True if a position is in a sorted list of positions."""
+
+    index = bisect_left(positions, position)
+
+    return index < len(positions) and positions[index] == position
+
+def _get_texts(action):
+    """Yields the option strings, metavars, and help of an argument and its subcommands."""
+
+    # The dest is what a positional argument is called when it has no metavar.
+    if not action.option_strings and isinstance(action.dest, str):
+        yield action.dest
+    for text in action.option_strings:
+        yield text
+    metavars = action.metavar if isinstance(action.metavar, tuple) else (action.metavar,)
+    for text in metavars:
+        if isinstance(text, str):
+            yield text
+    if isinstance(action.help, str):
+        yield action.help
+
+    # The subcommands of a subparsers argument are part of its help.
+    for choice_action in getattr(action, "_choices_actions", ()):
+        for text in _get_texts(choice_action):
+            yield text
+
+class KHelpIndex:
+    """
+    Object that finds the argument groups and arguments for a help topic.
+
+    Arguments:
+        action_groups (list, required):
+            The argument groups of a parser, in order.
+    """
+
+    def __init__(self, action_groups):
+        # The titles of the groups, ignoring case.
+        self.groups = {}
+        # The group and the argument for each position.
+        self.entries = []
+        # The position of the argument for each option string.
+        self.option_strings = {}
+        # The positions of the arguments that contain each word, in order.
+        self.words = {}
+
+        for group in action_groups:
+            if isinstance(group.title, str):
+                self.groups.setdefault(group.title.casefold(), group)
+            for action in group._group_actions: # pylint: disable=W0212
+                if action.help is SUPPRESS:
+                    continue
+                position = len(self.entries)
+                self.entries.append((group, action))
+                for option_string in action.option_strings:
+                    self.option_strings.setdefault(option_string, position)
+                for word in set(_get_words(" ".join(_get_texts(action)))):
+                    self.words.setdefault(word, []).append(position)
+
+    def find(self, topic):
+        """
+        Finds the argument groups and arguments for a help topic.
+
+        Arguments:
+            topic (string, required):
+                The title of an argument group, an option string, or one
+                or more words.
+
+        Returns:
+            list:
+                A two item tuple for each group that matches, in the
+                order of the parser. Each tuple contains the group and
+                the list of its arguments that match, or None if the
+                whole group matches. The list is empty if nothing
+                matches.
+        """
+
+        # Check for the title of a group.
+        group = self.groups.get(topic.casefold())
+        if group is not None:
+            return [(group, None)]
+
+        # Check for an option string.
+        position = self.option_strings.get(topic)
+        if position is not None:
+            positions = [position]
+        else:
+            # Find the arguments that contain every word. Only the positions
+            # for the rarest word are checked, with a binary search of the rest.
+            postings = sorted((self.words.get(word, []) for word in set(_get_words(topic))), key=len)
+            if not postings:
+                return []
+            positions = [position for position in postings[0] if all(_in_sorted(other, position) for other in postings[1:])]
+
+        # Put the arguments under their groups.
+        matches = []
+        for position in positions:
+            group, action = self.entries[position]
+            if not matches or matches[-1][0] is not group:
+                matches.append((group, []))
+            matches[-1][1].append(action)
+
+        return matches
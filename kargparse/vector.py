@@ -0,0 +1,170 @@
+"""
+Copyright 2020-2021 The KArgParse Project, All Rights Reserved.
+
+This software, having been partly or wholly developed and/or
+sponsored by KoreLogic, Inc., is hereby released under the terms
+and conditions set forth in the project's "README.LICENSE" file.
+For a list of all contributors and sponsors, please refer to the
+project's "README.CREDITS" file.
+"""
+
+# A long list of numbers (e.g., from an @argfile) is normally converted and
+# checked one value at a time, and the result is a list of Python objects.
+# An argument added with the array option is converted in one pass into an
+# array.array, or a NumPy array if NumPy is installed, with 64-bit integers
+# for type=int and 64-bit floats for type=float.
+#
+# A NumPy array shares the memory of the array.array it's built from, so
+# both convert the strings the same way as int() and float(). Only after a
+# conversion fails are the strings converted one at a time to find the
+# first invalid one. A range of choices is checked against the whole array
+# at once, and any other choices are checked one value at a time.
+
+from array import array
+
+from kargparse.choices import get_choices_index
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The array.array type codes for the supported types.
+_TYPECODES = {int : "q", float : "d"}
+
+def get_array_backend(option):
+    """
+    Returns the kind of array for the array option of an argument.
+
+    Arguments:
+        option (boolean or string, required):
+            True for a NumPy array if NumPy is installed and an
+            array.array otherwise, "array" for an array.array, or
+            "numpy" for a NumPy array.
+
+    Returns:
+        string:
+            Either "array" or "numpy".
+
+    Raises:
+        ValueError:
+            If the option isn't supported or NumPy isn't installed.
+    """
+
+    if option is True:
+        return "array" if numpy is None else "numpy"
+    if option == "numpy" and numpy is not None:
+        return option
+    if option == "array":
+        return option
+
+    raise ValueError(option)
+
+def is_array_type(element_type):
+    """Returns True if an argument's type can be converted into an array."""
+
+    return element_type in _TYPECODES
+
+def convert_array(strings, element_type, backend):
+    """
+    Converts the values of an argument into an array.
+
+    Arguments:
+        strings (list, required):
+            The argument's values from the command line.
+        element_type (type, required):
+            Either int or float.
+        backend (string, required):
+            Either "array" or "numpy" (see get_array_backend()).
+
+    Returns:
+        array:
+            The converted values.
+
+    Raises:
+        OverflowError:
+            If an integer doesn't fit in 64 bits.
+        ValueError:
+            If a value can't be converted.
+    """
+
+    values = array(_TYPECODES[element_type], map(element_type, strings))
+    if backend == "numpy":
+        return numpy.frombuffer(values, dtype=values.typecode)
+
+    return values
+
+def get_invalid_position(strings, element_type):
+    """
+    Returns the position of the first value that can't be converted.
+
+    Arguments:
+        strings (list, required):
+            The argument's values from the command line.
+        element_type (type, required):
+            Either int or float.
+
+    Returns:
+        integer:
+            The position of the first invalid value, or None if every
+            value can be converted.
+    """
+
+    typecode = _TYPECODES[element_type]
+    for position, string in enumerate(strings):
+        try:
+            array(typecode, (element_type(string),))
+        except (OverflowError, ValueError):
+            return position
+
+    return None
+
+def get_range_position(values, choices):
+    """
+    Returns the position of the first value that isn't in a range of choices.
+
+    Arguments:
+        values (array, required):
+            The values converted by convert_array().
+        choices (range, required):
+            The choices of the argument.
+
+    Returns:
+        integer:
+            The position of the first value that isn't one of the
+            choices, or None if every value is.
+    """
+
+    # Put the range in ascending order, it has the same members.
+    if choices.step < 0:
+        choices = choices[::-1]
+    if not len(values):
+        return None
+    if not choices:
+        return 0
+    start, stop, step = choices.start, choices.stop, choices.step
+
+    # Check a NumPy array all at once. NaN fails the comparisons, while
+    # infinity and a float that isn't integral leave a remainder.
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        valid = (values >= start) & (values < stop)
+        if step != 1 or values.dtype.kind == "f":
+            valid &= (values - start) % step == 0
+        invalid = numpy.flatnonzero(~valid)
+        return int(invalid[0]) if invalid.size else None
+
+    # Check an array.array with its minimum and maximum, then check each
+    # value only if that isn't enough.
+    if values.typecode == "q":
+        if step == 1 and start <= min(values) and max(values) < stop:
+            return None
+        contains = choices.__contains__
+    else:
+        if step == 1 and start <= min(values) and max(values) < stop and all(map(float.is_integer, values)):
+            return None
+        contains = get_choices_index(choices)
+    for position, value in enumerate(values):
+        if not contains(value):
+            return position
+
+    return None
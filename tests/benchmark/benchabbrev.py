@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+"""
+Compares the time of matching abbreviated options with KArgumentParser's
+sorted option index against argparse's scan of every option string. Both
+are measured on the same large parser, so the only difference is the
+matching itself.
+"""
+
+from argparse import ArgumentParser
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from largeparser import build_large_argv, build_large_parser # pylint: disable=C0413
+
+def measure(function, tokens, repeat=5):
+    # Return the best time of matching every token.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for token in tokens:
+            function(token)
+        times.append(perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = build_large_parser(subcommands=0)
+    # Drop the last digit of each option, so every token is an abbreviation.
+    tokens = [token[:-1] for token in build_large_argv(1000)[::2]]
+    # Build the index before measuring.
+    parser._get_option_tuples(tokens[0]) # pylint: disable=W0212
+    scan = measure(lambda token: ArgumentParser._get_option_tuples(parser, token), tokens) # pylint: disable=W0212
+    index = measure(parser._get_option_tuples, tokens) # pylint: disable=W0212
+    print("abbreviations matched:      {:8d}".format(len(tokens)))
+    print("argparse scan:              {:8.1f} ms".format(scan * 1000))
+    print("sorted index:               {:8.1f} ms".format(index * 1000))
+    print("speedup:                    {:8.1f}x".format(scan / index))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time and peak memory of expanding argument files. argparse
+reads each file whole and copies the arguments of a nested file into
+every enclosing list. KArgParse streams each file one line at a time
+into the list it returns. The files here are a chain of nested files,
+each with the same number of arguments.
+"""
+
+from argparse import ArgumentParser
+from os.path import abspath, dirname, getsize, join
+from sys import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+DEPTH = 4
+LINES = 500000
+
+def measure(function):
+    # Return the time in milliseconds, and the memory held by the result
+    # and the peak memory in megabytes.
+    begin = perf_counter()
+    function()
+    elapsed = (perf_counter() - begin) * 1000
+    start()
+    result = function() # pylint: disable=W0612
+    current, peak = get_traced_memory()
+    stop()
+    return elapsed, current / 1000000, peak / 1000000
+
+def main():
+    with TemporaryDirectory() as directory:
+        # Write a chain of argument files, each naming the next one.
+        size = 0
+        for level in range(DEPTH):
+            with open(join(directory, str(level)), "w") as args_file:
+                if level + 1 < DEPTH:
+                    args_file.write("@{}\n".format(join(directory, str(level + 1))))
+                args_file.writelines("--sample-{:d}\n".format(number) for number in range(LINES))
+            size += getsize(join(directory, str(level)))
+        args = ["@" + join(directory, "0")]
+        print("{} files, {:.1f} MB, {} arguments".format(DEPTH, size / 1000000, DEPTH * LINES))
+        for name, parser in (("argparse", ArgumentParser(fromfile_prefix_chars="@")), ("kargparse", KArgumentParser(fromfile_prefix_chars="@"))):
+            elapsed, current, peak = measure(lambda: parser._read_args_from_files(args)) # pylint: disable=W0212
+            print("{:10} {:8.2f} ms {:8.1f} MB result {:8.1f} MB peak".format(name, elapsed, current, peak))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Compares the throughput of parse_many() against a plain loop that calls
+parse_args() and catches the errors. The command lines are a mix of
+valid and invalid records, parsed with the large benchmark parser. The
+records with an invalid value are also measured on their own, since
+that is where the two differ: parse_many() keeps the error instead of
+raising it through the error handling.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.error import KArgParseError # pylint: disable=C0413
+from largeparser import build_large_argv, build_large_parser # pylint: disable=C0413
+
+RECORDS = 2000
+
+def build_records():
+    # Every fourth record has an invalid integer, every eighth an unknown option.
+    records = []
+    for number in range(RECORDS):
+        argv = build_large_argv(5)
+        if number % 4 == 1:
+            argv[1] = "invalid"
+        elif number % 8 == 3:
+            argv.append("--unknown")
+        records.append(argv)
+    return records
+
+def loop(parser, records):
+    results = []
+    for argv in records:
+        try:
+            results.append(parser.parse_args(argv))
+        except KArgParseError as error:
+            results.append(error)
+    return results
+
+def measure(function, repeat=3):
+    # Return the best time of calling the function.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = build_large_parser(subcommands=0)
+    records = build_records()
+    invalid = [argv for number, argv in enumerate(records) if number % 4 == 1]
+    for name, batch_records in (("all", records), ("invalid", invalid)):
+        plain = measure(lambda: loop(parser, batch_records), 5)
+        batch = measure(lambda: list(parser.parse_many(batch_records)), 5)
+        print("{} records:{}{:8d}".format(name, " " * (17 - len(name)), len(batch_records)))
+        print("parse_args() loop:          {:8.0f} records/s".format(len(batch_records) / plain))
+        print("parse_many():               {:8.0f} records/s".format(len(batch_records) / batch))
+        print("speedup:                    {:8.2f}x".format(plain / batch))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Compares checking a value against a large list of static choices with
+the in operator (a linear scan) against the compiled membership index.
+The values are spread evenly over the list, plus some that are missing.
+Then compares a zero-argument choices function that returns the same
+list, with and without its result kept (choices_cache), for one
+command line with many values.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.choices import get_choices_index # pylint: disable=C0413
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+CHOICES = 50000
+VALUES = 2000
+FUNCTION_VALUES = 200
+
+def measure(function, repeat=3):
+    # Return the best time of calling the function.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+def main():
+    choices = ["tenant-{:05d}".format(number) for number in range(CHOICES)]
+    values = ["tenant-{:05d}".format(number) for number in range(0, CHOICES * 2, CHOICES * 2 // VALUES)]
+
+    start = perf_counter()
+    contains = get_choices_index(choices)
+    build = perf_counter() - start
+    scan = measure(lambda: [value in choices for value in values])
+    indexed = measure(lambda: [contains(value) for value in values])
+    print("choices:                    {:8d}".format(CHOICES))
+    print("index build:                {:8.1f} ms".format(build * 1000))
+    print("linear scan:                {:8.0f} checks/s".format(VALUES / scan))
+    print("membership index:           {:8.0f} checks/s".format(VALUES / indexed))
+    print("speedup:                    {:8.0f}x".format(scan / indexed))
+
+    # Parse with the choices, the same as a tool would.
+    parser = KArgumentParser(exit_on_error=False)
+    parser.add_argument("--tenant", choices=choices)
+    argvs = [["--tenant", value] for value in values[:VALUES // 2]]
+    parse = measure(lambda: [parser.parse_args(argv) for argv in argvs])
+    print("parse_args():               {:8.0f} calls/s".format(len(argvs) / parse))
+
+    # Parse one command line with a choices function, with and without its result kept.
+    argv = ["--tenant"] + values[:FUNCTION_VALUES]
+    times = []
+    for choices_cache in (None, "parse"):
+        parser = KArgumentParser(exit_on_error=False, choices_cache=choices_cache)
+        parser.add_argument("--tenant", nargs="+", choices=lambda: list(choices))
+        times.append(measure(lambda: parser.parse_args(argv), repeat=1))
+    print("function, called per value: {:8.3f} s for {} values".format(times[0], FUNCTION_VALUES))
+    print("function, kept per parse:   {:8.3f} s for {} values".format(times[1], FUNCTION_VALUES))
+    print("speedup:                    {:8.0f}x".format(times[0] / times[1]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""
+Compares loading a vocabulary of a million values into a list of
+choices against memory-mapping it with KFileChoices. The startup time
+and the memory are measured for each, then the check rate for values
+that are in the file and values that aren't, with and without a Bloom
+filter. The linear scan of the list is far too slow to measure here,
+so the list's check rate is for a set built from it.
+"""
+
+from os.path import abspath, dirname, join
+from random import Random
+from sys import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.choices import KFileChoices, write_bloom_filter # pylint: disable=C0413
+
+VALUES = 1000000
+CHECKS = 20000
+
+def load(function):
+    # Return the result, the time, and the memory allocated by calling the function.
+    start()
+    begin = perf_counter()
+    result = function()
+    elapsed = perf_counter() - begin
+    memory = get_traced_memory()[0]
+    stop()
+    return result, elapsed, memory
+
+def rate(choices, values):
+    # Return the number of checks per second.
+    begin = perf_counter()
+    for value in values:
+        _ = value in choices
+    return len(values) / (perf_counter() - begin)
+
+def read_list(file_path):
+    with open(file_path) as choices_file:
+        return choices_file.read().splitlines()
+
+def main():
+    random = Random(0)
+    numbers = sorted(random.sample(range(10 ** 9), VALUES))
+    hits = ["SKU-{:09d}".format(number) for number in random.sample(numbers, CHECKS)]
+    misses = ["SKU-{:09d}".format(random.randrange(10 ** 9)) for _ in range(CHECKS)]
+    with TemporaryDirectory() as directory:
+        file_path = join(directory, "skus.txt")
+        bloom_path = join(directory, "skus.bloom")
+        with open(file_path, "w") as choices_file:
+            choices_file.writelines("SKU-{:09d}\n".format(number) for number in numbers)
+        begin = perf_counter()
+        write_bloom_filter(file_path, bloom_path)
+        bloom_build = perf_counter() - begin
+
+        listed, list_time, list_memory = load(lambda: read_list(file_path))
+        mapped, map_time, map_memory = load(lambda: KFileChoices(file_path))
+        bloomed, bloom_time, bloom_memory = load(lambda: KFileChoices(file_path, bloom_path=bloom_path))
+        indexed = set(listed)
+
+        print("values:                          {:10d}".format(VALUES))
+        print("list startup:                    {:10.3f} s {:8.1f} MB".format(list_time, list_memory / 1e6))
+        print("KFileChoices startup:            {:10.3f} s {:8.1f} MB".format(map_time, map_memory / 1e6))
+        print("KFileChoices + Bloom startup:    {:10.3f} s {:8.1f} MB (built once in {:.1f} s)".format(bloom_time, bloom_memory / 1e6, bloom_build))
+        print("set from the list, hits/misses:  {:10.0f} {:10.0f} checks/s".format(rate(indexed, hits), rate(indexed, misses)))
+        print("KFileChoices, hits/misses:       {:10.0f} {:10.0f} checks/s".format(rate(mapped, hits), rate(mapped, misses)))
+        print("KFileChoices + Bloom:            {:10.0f} {:10.0f} checks/s".format(rate(bloomed, hits), rate(bloomed, misses)))
+        mapped.close()
+        bloomed.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""
+Measures how the time to format the help statement grows with the number
+of options. Each argument's formatted parts are kept in a record for the
+rest of the render, so the time per option should stay about the same
+as the parser grows. The "no records" column uses a formatter that never
+reuses a record, which is what every render used to do.
+"""
+
+from gc import collect, disable, enable
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.formatter import KHelpFormatter, _KActionRecord # pylint: disable=C0413
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+SIZES = (250, 500, 1000, 2000)
+
+class NoRecordsFormatter(KHelpFormatter):
+
+    def _get_action_record(self, action):
+        return _KActionRecord()
+
+def build_parser(size):
+    parser = KArgumentParser(prog="prog")
+    for number in range(size):
+        short = "-o{}".format(number) if number % 3 == 0 else "--o{}".format(number)
+        parser.add_argument(short, "--option-{:04d}".format(number), type=int, required=number % 10 == 0, help="Option {}.".format(number))
+    group = parser.add_mutually_exclusive_group(required=True)
+    for number in range(20):
+        group.add_argument("--mode-{:02d}".format(number), action="store_true")
+    return parser
+
+def measure(parser, formatter_class):
+    # Return the best time of five renders in milliseconds, without garbage collection.
+    times = []
+    collect()
+    disable()
+    for _ in range(5):
+        start = perf_counter()
+        formatter = formatter_class(prog=parser.prog, allowed_types=parser.get_allowed_types(), width=80)
+        parser._add_sections(formatter, True, ()) # pylint: disable=W0212
+        formatter.format_help()
+        times.append(perf_counter() - start)
+    enable()
+    return min(times) * 1000
+
+def main():
+    print("options    records (us/option)    no records (us/option)")
+    for size in SIZES:
+        parser = build_parser(size)
+        records, no_records = measure(parser, KHelpFormatter), measure(parser, NoRecordsFormatter)
+        print("{:7d} {:9.1f} ms ({:5.1f}) {:12.1f} ms ({:5.1f})".format(size, records, records / size * 1000, no_records, no_records / size * 1000))
+
+if __name__ == "__main__":
+    main()
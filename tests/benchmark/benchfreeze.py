@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to get the help statement of a parser with many
+options from its frozen module, compared with building the parser and
+formatting the help statement. The frozen time includes importing the
+frozen module the first time and checking the stamps of the source files.
+The time to compute the key, which only happens when a stamp changed, is
+measured too.
+"""
+
+from importlib import import_module, invalidate_caches
+from os.path import abspath, dirname, join
+from sys import modules, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.freeze import freeze_parser, get_frozen_key, get_frozen_text # pylint: disable=C0413
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+OPTIONS = 3000
+FROZEN = "benchfreeze_frozen_help"
+
+def build_parser():
+    parser = KArgumentParser(prog="prog", add_version="1.0", frozen=FROZEN)
+    for number in range(OPTIONS):
+        parser.add_argument("--option-{:04d}".format(number), type=int, default=number, help="Option {} (default: %(default)s).".format(number))
+    return parser
+
+def main():
+    with TemporaryDirectory() as directory:
+        path.insert(0, directory)
+        freeze_parser(build_parser, join(directory, FROZEN + ".py"))
+        invalidate_caches()
+
+        start = perf_counter()
+        build_parser().format_help()
+        live = perf_counter() - start
+
+        start = perf_counter()
+        module = import_module(FROZEN)
+        text = get_frozen_text(FROZEN, "prog", 80, ["--help"])
+        frozen = perf_counter() - start
+        assert text is not None
+
+        start = perf_counter()
+        get_frozen_text(FROZEN, "prog", 80, ["--help"])
+        imported = perf_counter() - start
+
+        # A program's builder usually loads more modules, so compute the key for every loaded module with a source file.
+        module_names = [name for name, loaded in list(modules.items()) if isinstance(getattr(loaded, "__file__", None), str)]
+        start = perf_counter()
+        get_frozen_key(module.BUILDER, module_names)
+        key = perf_counter() - start
+
+    print("built and formatted:    {:8.2f} ms".format(live * 1000))
+    print("frozen, first time:     {:8.2f} ms".format(frozen * 1000))
+    print("frozen, already loaded: {:8.2f} ms".format(imported * 1000))
+    print("key, {:3d} source files: {:8.2f} ms".format(len(module_names) + 1, key * 1000))
+
+if __name__ == "__main__":
+    main()
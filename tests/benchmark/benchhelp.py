@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to format the usage statement for an error
+and the help statement of a parser with many options. The statements
+are kept after the first time, with the error message put into the kept
+text. The "formatted" lines format each statement from scratch, which
+is what every call used to do.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+OPTIONS = 300
+CALLS = 20
+
+def measure(function):
+    # Return the time per call in milliseconds.
+    start = perf_counter()
+    for _ in range(CALLS):
+        function()
+    return (perf_counter() - start) / CALLS * 1000
+
+def formatted(parser, full):
+    # Format the statement from scratch.
+    formatter = parser._get_formatter() # pylint: disable=W0212
+    parser._add_sections(formatter, full, (parser._error_message or "").splitlines()) # pylint: disable=W0212
+    return formatter.format_help()
+
+def main():
+    parser = KArgumentParser(prog="prog", description="A parser with many options.")
+    for number in range(OPTIONS):
+        parser.add_argument("--option-{:04d}".format(number), type=int, default=number, help="Option {} (default: %(default)s).".format(number))
+    parser._error_message = "Argument --option-0001: Invalid value: x" # pylint: disable=W0212
+    parser.format_usage()
+    parser.format_help()
+    print("usage, formatted: {:8.3f} ms".format(measure(lambda: formatted(parser, False))))
+    print("usage, kept:      {:8.3f} ms".format(measure(parser.format_usage)))
+    print("help, formatted:  {:8.3f} ms".format(measure(lambda: formatted(parser, True))))
+    print("help, kept:       {:8.3f} ms".format(measure(parser.format_help)))
+
+if __name__ == "__main__":
+    main()
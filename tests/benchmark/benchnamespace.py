@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+"""
+Compares the memory used by parse results kept in memory with the
+default Namespace against the slotted namespace (namespace_class="slots").
+Both parsers are the large benchmark parser, and both are given the
+same command lines.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from largeparser import build_large_argv, build_large_parser # pylint: disable=C0413
+
+RESULTS = 2000
+
+def measure(parser, argv):
+    # Return the memory used by the kept results and the time to parse them.
+    parser.parse_args(argv)
+    start()
+    begin = perf_counter()
+    results = [parser.parse_args(argv) for _ in range(RESULTS)]
+    elapsed = perf_counter() - begin
+    memory = get_traced_memory()[0]
+    stop()
+    del results
+    return memory, elapsed
+
+def main():
+    argv = build_large_argv(10)
+    namespace_memory, namespace_time = measure(build_large_parser(subcommands=0), argv)
+    slots_memory, slots_time = measure(build_large_parser(subcommands=0, namespace_class="slots"), argv)
+    print("results kept:               {:8d}".format(RESULTS))
+    print("Namespace per result:       {:8.1f} KiB".format(namespace_memory / RESULTS / 1024))
+    print("slotted per result:         {:8.1f} KiB".format(slots_memory / RESULTS / 1024))
+    print("memory reduction:           {:8.1f}x".format(namespace_memory / slots_memory))
+    print("Namespace parse time:       {:8.1f} ms".format(namespace_time * 1000))
+    print("slotted parse time:         {:8.1f} ms".format(slots_time * 1000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Compares the time of parsing with KArgumentParser's compiled nargs
+patterns against argparse's patterns, which are rebuilt on every match.
+Both are measured on the same parser, so the only difference is how the
+nargs are matched.
+"""
+
+from argparse import ArgumentParser
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+class ArgparseNargsParser(KArgumentParser):
+    # Match the nargs the same way argparse does.
+    _get_nargs_pattern = ArgumentParser._get_nargs_pattern
+    _match_argument = ArgumentParser._match_argument
+    _match_arguments_partial = ArgumentParser._match_arguments_partial
+
+def build_nargs_parser(parser_class):
+    # Create a parser with a mix of optional and positional nargs.
+    parser = parser_class(prog="nargs", exit_on_error=False)
+    for number in range(20):
+        parser.add_argument("--option-{:02d}".format(number), nargs=[None, "?", "+", 2][number % 4])
+    for number in range(4):
+        parser.add_argument("positional-{:02d}".format(number))
+    parser.add_argument("remaining", nargs="+")
+    return parser
+
+def measure(parser, argv, repeat=5, number=1000):
+    # Return the best time of parsing the argv.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            parser.parse_args(argv)
+        times.append(perf_counter() - start)
+    return min(times)
+
+def main():
+    argv = []
+    for number in range(20):
+        argv.extend(["--option-{:02d}".format(number)] + ["value"] * [1, 1, 3, 2][number % 4])
+    argv.extend(["value"] * 8)
+    argparse_nargs = measure(build_nargs_parser(ArgparseNargsParser), argv)
+    compiled_nargs = measure(build_nargs_parser(KArgumentParser), argv)
+    print("argparse nargs patterns:    {:8.1f} ms".format(argparse_nargs * 1000))
+    print("compiled nargs patterns:    {:8.1f} ms".format(compiled_nargs * 1000))
+    print("speedup:                    {:8.1f}x".format(argparse_nargs / compiled_nargs))
+
+if __name__ == "__main__":
+    main()
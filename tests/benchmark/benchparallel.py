@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+"""
+Measures how parse_parallel() scales with the number of worker processes.
+The command lines are parsed with the large benchmark parser, and the
+in-process parse_many() rate is shown for comparison. The speedup can't
+exceed the number of CPUs on the machine.
+"""
+
+from os import cpu_count
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parallel import parse_parallel # pylint: disable=C0413
+from largeparser import build_large_argv, build_large_parser # pylint: disable=C0413
+
+RECORDS = 8000
+
+def measure(function):
+    # Return the time of consuming the results.
+    start = perf_counter()
+    for _ in function():
+        pass
+    return perf_counter() - start
+
+def main():
+    argvs = [build_large_argv(5) for _ in range(RECORDS)]
+    serial = measure(lambda: build_large_parser().parse_many(argvs))
+    print("CPUs:                       {:8d}".format(cpu_count()))
+    print("records:                    {:8d}".format(RECORDS))
+    print("parse_many():               {:8.0f} records/s".format(RECORDS / serial))
+    processes = 1
+    while processes <= max(2, cpu_count()):
+        elapsed = measure(lambda: parse_parallel(build_large_parser, argvs, processes=processes)) # pylint: disable=W0640
+        print("{:2d} processes:               {:8.0f} records/s  {:5.1f}x".format(processes, RECORDS / elapsed, serial / elapsed))
+        processes *= 2
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+Compares the time of building a large parser with the time of loading
+it from a snapshot. The cold-start measurements are made in a fresh
+interpreter, so they include the imports that a real tool would pay
+for. The in-process measurements only include the parser itself.
+"""
+
+from os.path import abspath, dirname
+from subprocess import run
+from sys import executable, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.snapshot import load_snapshot, save_snapshot # pylint: disable=C0413
+from largeparser import build_large_parser # pylint: disable=C0413
+
+BUILD = """
+from largeparser import build_large_parser
+build_large_parser()
+"""
+
+LOAD = """
+from kargparse.snapshot import build_parser
+from largeparser import build_large_parser
+build_parser(build_large_parser, {cache_dir!r})
+"""
+
+def measure_in_process(function, repeat=5):
+    # Return the best time of calling the function.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+def measure(code, repeat=5):
+    # Return the best wall clock time of running the code in a fresh interpreter.
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run([executable, "-c", "import sys; sys.path[:0] = [{!r}, {!r}]\n{}".format(BENCHMARK_DIR, PACKAGE_DIR, code)], check=True)
+        times.append(perf_counter() - start)
+    return min(times)
+
+def main():
+    with TemporaryDirectory() as cache_dir:
+        baseline = measure("pass")
+        build = measure(BUILD)
+        # The first run saves the snapshot, the rest load it.
+        measure(LOAD.format(cache_dir=cache_dir), repeat=1)
+        load = measure(LOAD.format(cache_dir=cache_dir))
+        in_process_build = measure_in_process(build_large_parser)
+        # The snapshot key includes the program name, so save it again for this process.
+        save_snapshot(build_large_parser, build_large_parser(), cache_dir)
+        in_process_load = measure_in_process(lambda: load_snapshot(build_large_parser, cache_dir))
+    print("interpreter startup:        {:8.1f} ms".format(baseline * 1000))
+    print("cold build parser:          {:8.1f} ms".format((build - baseline) * 1000))
+    print("cold load parser snapshot:  {:8.1f} ms".format((load - baseline) * 1000))
+    print("cold speedup:               {:8.1f}x".format((build - baseline) / (load - baseline)))
+    print("in-process build parser:    {:8.1f} ms".format(in_process_build * 1000))
+    print("in-process load snapshot:   {:8.1f} ms".format(in_process_load * 1000))
+    print("in-process speedup:         {:8.1f}x".format(in_process_build / in_process_load))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Measures how many lines per second parse_stream() parses from a job
+file. The plain lines are split with str.split(), and the quoted lines
+need shlex. A tenth of the lines have an invalid value. The last line
+splits every plain line with shlex, which is what each line would cost
+without the str.split() shortcut.
+"""
+
+from os.path import abspath, dirname, join
+from shlex import split
+from sys import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+LINES = 100000
+
+def build_parser():
+    parser = KArgumentParser(prog="job")
+    parser.add_argument("--host", choices=["host-{:02d}".format(number) for number in range(50)])
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("task")
+    parser.add_argument("inputs", nargs="*")
+    return parser
+
+def measure(parser, job_path):
+    # Return the number of lines parsed per second.
+    start = perf_counter()
+    with open(job_path) as job_file:
+        for _ in parser.parse_stream(job_file):
+            pass
+    return LINES / (perf_counter() - start)
+
+def main():
+    parser = build_parser()
+    with TemporaryDirectory() as directory:
+        plain, quoted = join(directory, "plain"), join(directory, "quoted")
+        with open(plain, "w") as job_file:
+            job_file.writelines("--host host-{:02d} --retries {} task-{} input-a input-b\n".format(number % 50, "x" if number % 10 == 0 else number % 5, number) for number in range(LINES))
+        with open(quoted, "w") as job_file:
+            job_file.writelines("--host host-{:02d} --retries {} 'task {}' \"input a\" input-b\n".format(number % 50, "x" if number % 10 == 0 else number % 5, number) for number in range(LINES))
+        print("plain lines:  {:10.0f} lines/s".format(measure(parser, plain)))
+        print("quoted lines: {:10.0f} lines/s".format(measure(parser, quoted)))
+        with open(plain) as job_file:
+            start = perf_counter()
+            for line in job_file:
+                split(line, comments=True)
+        print("shlex only:   {:10.0f} lines/s".format(LINES / (perf_counter() - start)))
+
+if __name__ == "__main__":
+    main()
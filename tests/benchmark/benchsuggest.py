@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to suggest the closest choice for a misspelled
+value. The suggestion index is built the first time a parser needs it,
+so the first error pays for the build and later errors only look up the
+index. The last line compares every choice with the misspelled value by
+edit distance, which is what a suggestion would cost without the index.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser, KArgumentError # pylint: disable=C0413
+from kargparse.suggest import _get_distance # pylint: disable=C0413
+
+CHOICES = ["host-{:06d}.example.com".format(number) for number in range(100000)]
+CALLS = 20
+
+def measure(function, calls):
+    # Return the time per call in milliseconds.
+    start = perf_counter()
+    for _ in range(calls):
+        function()
+    return (perf_counter() - start) / calls * 1000
+
+def main():
+    parser = KArgumentParser(exit_on_error=False, suggest_on_error=True)
+    parser.add_argument("--host", choices=CHOICES)
+    def error():
+        try:
+            parser.parse_args(["--host", "host-04217.example.com"])
+        except KArgumentError:
+            pass
+    print("first error (build + lookup): {:8.2f} ms".format(measure(error, 1)))
+    print("later errors (lookup):        {:8.2f} ms".format(measure(error, CALLS)))
+    print("edit distance to every choice:{:8.2f} ms".format(measure(lambda: min(CHOICES, key=lambda choice: _get_distance("host-04217.example.com", choice, 7)), 1)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Compares the throughput of one parser shared by several threads against
+a separate parser for each thread, for both parse_args() and
+format_help(). A shared parser saves building (and keeping) one parser
+per thread, and its caches are only filled once.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from threading import Barrier, Thread
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from largeparser import build_large_argv, build_large_parser # pylint: disable=C0413
+
+PARSE_CALLS = 400
+HELP_CALLS = 80
+
+def run(parsers, function, calls):
+    # Split the calls evenly over a thread per parser and return the elapsed time.
+    count = calls // len(parsers)
+    barrier = Barrier(len(parsers) + 1)
+    def target(parser):
+        barrier.wait()
+        for _ in range(count):
+            function(parser)
+    threads = [Thread(target=target, args=(parser,)) for parser in parsers]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = perf_counter()
+    for thread in threads:
+        thread.join()
+    return perf_counter() - start
+
+def main():
+    argv = build_large_argv(5)
+    parse = lambda parser: parser.parse_args(argv)
+    help = lambda parser: parser.format_help() # pylint: disable=W0622
+    print("threads   shared parse   per-thread parse   shared help   per-thread help   (calls/s)")
+    for threads in (1, 2, 4, 8):
+        start = perf_counter()
+        shared = [build_large_parser(subcommands=0)] * threads
+        separate = shared[:1] + [build_large_parser(subcommands=0) for _ in range(threads - 1)]
+        build = perf_counter() - start
+        for parser in separate:
+            help(parser)
+        results = [PARSE_CALLS / run(shared, parse, PARSE_CALLS), PARSE_CALLS / run(separate, parse, PARSE_CALLS)]
+        results += [HELP_CALLS / run(shared, help, HELP_CALLS), HELP_CALLS / run(separate, help, HELP_CALLS)]
+        print("{:7d}   {:12.0f}   {:16.0f}   {:11.0f}   {:15.0f}   (build {:.2f}s)".format(threads, *results, build))
+
+if __name__ == "__main__":
+    main()
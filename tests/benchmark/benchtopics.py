@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to format the help for a topic as the parser
+grows, compared with the whole help statement. The index of the topics
+is built the first time a topic is asked for, so that time is shown on
+its own. After that, the time for a topic should stay about the same, no
+matter how many options the parser has.
+"""
+
+from os import devnull
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+SIZES = (1000, 4000, 16000)
+GROUP_SIZE = 20
+CALLS = 20
+
+def build_parser(size):
+    parser = KArgumentParser(prog="prog", help_topics=True)
+    for group_number in range(size // GROUP_SIZE):
+        group = parser.add_argument_group("Area {}".format(group_number), "The options for area {}.".format(group_number))
+        for number in range(GROUP_SIZE):
+            group.add_argument("--area-{}-option-{}".format(group_number, number), type=int, help="Option {} of area {}.".format(number, group_number))
+    return parser
+
+def measure(function, calls=CALLS):
+    # Return the time per call in milliseconds.
+    start = perf_counter()
+    for _ in range(calls):
+        function()
+    return (perf_counter() - start) / calls * 1000
+
+def write_help(parser):
+    with open(devnull, "w") as null_file:
+        parser.write_help(null_file)
+
+def main():
+    print("options    index    group topic    word topic    whole help")
+    for size in SIZES:
+        parser = build_parser(size)
+        index = measure(parser._get_help_index, 1) # pylint: disable=W0212
+        group = measure(lambda: parser.format_help_topic("area 7"))
+        word = measure(lambda: parser.format_help_topic("option 3 area 12"))
+        whole = measure(lambda: write_help(parser), 1)
+        print("{:7d} {:6.1f} ms {:10.2f} ms {:10.2f} ms {:10.1f} ms".format(size, index, group, word, whole))
+
+if __name__ == "__main__":
+    main()
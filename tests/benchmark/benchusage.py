@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to format the usage statement of a parser with
+many required options and required mutually exclusive groups, whose usage
+is tens of kilobytes long. The "two passes" column uses a formatter that
+wraps the whole usage to find the first line and then wraps the rest of
+the usage again, which is what every usage statement used to do.
+"""
+
+from gc import collect, disable, enable
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.formatter import KHelpFormatter # pylint: disable=C0413
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+SIZES = (500, 1000, 2000)
+
+class TwoPassFormatter(KHelpFormatter):
+
+    def _wrap_usage(self, action_usage, indent):
+        first_line = self._split_lines(action_usage, self._width - indent)[0]
+        indent += self._indent_increment
+        return [first_line] + [" " * indent + line for line in self._split_lines(action_usage[len(first_line):], self._width - indent)]
+
+def build_parser(size):
+    parser = KArgumentParser(prog="prog")
+    for number in range(size):
+        parser.add_argument("--required-option-{:05d}".format(number), "-r{}".format(number), type=int, required=True)
+    for group_number in range(size // 50):
+        group = parser.add_mutually_exclusive_group(required=True)
+        for number in range(25):
+            group.add_argument("--choice-{}-{}".format(group_number, number), action="store_true")
+    parser.add_argument("files", nargs="+")
+    return parser
+
+def measure(parser, formatter_class):
+    # Return the best time of five usage statements in milliseconds, and the statement.
+    times = []
+    collect()
+    disable()
+    for _ in range(5):
+        formatter = formatter_class(prog=parser.prog, allowed_types=parser.get_allowed_types(), width=80)
+        # Format the parts first, so only the wrapping is measured.
+        formatter._format_actions_usage(parser._actions, parser._mutually_exclusive_groups) # pylint: disable=W0212
+        start = perf_counter()
+        usage = formatter._format_usage(None, parser._actions, parser._mutually_exclusive_groups, None) # pylint: disable=W0212
+        times.append(perf_counter() - start)
+    enable()
+    return min(times) * 1000, usage
+
+def main():
+    print("options    length    one pass    two passes")
+    for size in SIZES:
+        parser = build_parser(size)
+        (one_pass, usage), (two_passes, expected) = measure(parser, KHelpFormatter), measure(parser, TwoPassFormatter)
+        assert usage == expected
+        print("{:7d} {:9d} {:8.1f} ms {:10.1f} ms".format(size, len(usage), one_pass, two_passes))
+
+if __name__ == "__main__":
+    main()
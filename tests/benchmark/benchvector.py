@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes to parse a long list of integers. A list
+argument converts and checks each value on its own, while an array
+argument converts all of them in one pass and checks a range of choices
+against the whole array. The conversion is measured on its own and as
+part of parse_args().
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+from kargparse.vector import numpy # pylint: disable=C0413
+
+VALUES = [str(number * 7 % 1000000) for number in range(500000)]
+CHOICES = range(1000000)
+
+def measure(function):
+    # Return the time of the best of three calls in milliseconds.
+    times = []
+    for _ in range(3):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times) * 1000
+
+def main():
+    parsers = {}
+    for array in (None, "array", "numpy"):
+        if array == "numpy" and numpy is None:
+            continue
+        parser = KArgumentParser(exit_on_error=False)
+        parser.add_argument("--offsets", type=int, nargs="+", choices=CHOICES, array=array)
+        parsers[array] = parser
+    for array, parser in parsers.items():
+        action = parser._option_string_actions["--offsets"] # pylint: disable=W0212
+        label = "list" if array is None else array
+        print("{:5} values:     {:8.2f} ms".format(label, measure(lambda: parser._get_values(action, VALUES)))) # pylint: disable=W0212
+        print("{:5} parse_args: {:8.2f} ms".format(label, measure(lambda: parser.parse_args(["--offsets"] + VALUES))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Measures how long it takes for the first part of the help statement of a
+parser with many options to be written, the time to write all of it, and
+the most memory used while writing it. The help statement is written to
+a file that throws the text away. The "format_help" lines format the
+whole help statement into one string and then write it, which is what
+print_help() used to do.
+"""
+
+from os.path import abspath, dirname
+from sys import path
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+BENCHMARK_DIR = dirname(abspath(__file__))
+PACKAGE_DIR = dirname(dirname(BENCHMARK_DIR))
+path[:0] = [BENCHMARK_DIR, PACKAGE_DIR]
+
+from kargparse.parser import KArgumentParser # pylint: disable=C0413
+
+SIZES = (1000, 4000)
+
+class NullFile:
+
+    def __init__(self):
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = perf_counter()
+
+    def flush(self):
+        pass
+
+def build_parser(size):
+    parser = KArgumentParser(prog="prog", description="A parser with many options.")
+    for number in range(size):
+        parser.add_argument("--option-{:05d}".format(number), type=int, default=number, help="Option {} (default: %(default)s).".format(number))
+    return parser
+
+def measure(size, write):
+    # Return the time to the first write and to the end in milliseconds, and the peak memory in MB.
+    parser = build_parser(size)
+    null_file = NullFile()
+    start()
+    begin = perf_counter()
+    write(parser, null_file)
+    end = perf_counter()
+    peak = get_traced_memory()[1]
+    stop()
+    return (null_file.first - begin) * 1000, (end - begin) * 1000, peak / (1 << 20)
+
+def main():
+    print("options    method         first write      total    peak memory")
+    for size in SIZES:
+        for name, write in (("write_help", lambda parser, null_file: parser.write_help(null_file)),
+                            ("format_help", lambda parser, null_file: null_file.write(parser.format_help()))):
+            first, total, peak = measure(size, write)
+            print("{:7d}    {:11s} {:9.1f} ms {:8.1f} ms {:9.1f} MB".format(size, name, first, total, peak))
+
+if __name__ == "__main__":
+    main()
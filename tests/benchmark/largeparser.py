@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+"""
+Builds a large parser for the benchmarks.
+
+The parser is modeled on a real tool: several hundred options spread
+over a few argument groups, plus a set of subcommands that each have
+their own options.
+"""
+
+from kargparse.parser import KArgumentParser
+
+OPTIONS = 900
+SUBCOMMANDS = 60
+SUBCOMMAND_OPTIONS = 10
+
+def build_large_parser(options=OPTIONS, subcommands=SUBCOMMANDS, **kwargs):
+    # Create the main parser.
+    kwargs.setdefault("prog", "large")
+    kwargs.setdefault("exit_on_error", False)
+    parser = KArgumentParser(description="A large parser for the benchmarks.", **kwargs)
+
+    # Add the options, spread over a few argument groups.
+    groups = [parser.add_argument_group("Group {:02d}".format(number), "Options for area {}.".format(number)) for number in range(9)]
+    for number in range(options):
+        group = groups[number % len(groups)]
+        if number % 3 == 0:
+            group.add_argument("--option-{:04d}".format(number), type=int, default=number, help="Set integer option {} (default: %(default)s).".format(number))
+        elif number % 3 == 1:
+            group.add_argument("--option-{:04d}".format(number), choices=["low", "medium", "high"], default="low", help="Set choice option {} (%(choices)s).".format(number))
+        else:
+            group.add_argument("--option-{:04d}".format(number), action="store_true", help="Enable flag option {}.".format(number))
+
+    # Add the subcommands.
+    if subcommands:
+        subparsers = parser.add_subparsers(dest="command", help="The command to run.")
+        for number in range(subcommands):
+            subparser = subparsers.add_parser("command-{:02d}".format(number), help="Run command {}.".format(number))
+            subparser.add_argument("target", help="The target of command {}.".format(number))
+            for option in range(SUBCOMMAND_OPTIONS):
+                subparser.add_argument("--setting-{:02d}".format(option), type=int, default=option, help="Set setting {}.".format(option))
+
+    return parser
+
+def build_large_argv(count=100):
+    # Build an argv that uses a mix of exact and abbreviated options.
+    argv = []
+    for number in range(0, count * 3, 3):
+        argv.extend(["--option-{:04d}".format(number % OPTIONS), str(number)])
+    return argv
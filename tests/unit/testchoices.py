@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from kargparse.choices import KFileChoices, get_choices_index, write_bloom_filter
+from kargparse.parser import KArgumentError, KArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+import pickle
+import unittest
+
+class TestChoices(unittest.TestCase):
+
+    def setUp(self):
+        # Create a sorted file of choices.
+        self.directory = TemporaryDirectory()
+        self.values = sorted("SKU-{:06d}".format(number * 7) for number in range(5000))
+        self.path = join(self.directory.name, "skus.txt")
+        with open(self.path, "w") as choices_file:
+            choices_file.write("\n".join(self.values) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_choices(self, choices):
+        # Check every value, the values around them, and a few edge cases against a set.
+        expected = set(self.values)
+        for value in self.values + ["SKU-{:06d}".format(number) for number in range(0, 35000, 3)] + ["", "SKU", "SKU-", "ZZZ", "A", "SKU-000000\nSKU-000007"]:
+            self.assertEqual(value in choices, value in expected, value)
+
+    def test_file_choices(self):
+        # Check to make sure the file is searched correctly.
+        choices = KFileChoices(self.path)
+        self.check_choices(choices)
+        self.assertEqual(len(choices), 5000)
+        self.assertEqual(list(choices), self.values)
+        self.assertEqual(str(choices), "the values in skus.txt")
+        self.assertEqual(str(KFileChoices(self.path, description="the known SKUs")), "the known SKUs")
+        # Check to make sure the choices can be pickled and opened again.
+        self.check_choices(pickle.loads(pickle.dumps(choices)))
+        choices.close()
+
+    def test_small_files(self):
+        # Check to make sure files without a final newline, with one line, or with nothing are searched correctly.
+        for content, values in (("a\nb\nc", ["a", "b", "c"]), ("x\n", ["x"]), ("x", ["x"]), ("", [])):
+            with open(self.path, "w") as choices_file:
+                choices_file.write(content)
+            choices = KFileChoices(self.path)
+            self.assertEqual(list(choices), values)
+            self.assertEqual(len(choices), len(values))
+            for value in ["a", "b", "c", "x", "", "y"]:
+                self.assertEqual(value in choices, value in values, (content, value))
+
+    def test_bloom_filter(self):
+        # Check to make sure the Bloom filter never rejects a value that is in the file.
+        bloom_path = join(self.directory.name, "skus.bloom")
+        write_bloom_filter(self.path, bloom_path)
+        choices = KFileChoices(self.path, bloom_path=bloom_path)
+        self.check_choices(choices)
+        self.check_choices(pickle.loads(pickle.dumps(choices)))
+        # Check to make sure a Bloom filter isn't used once the file has changed.
+        with open(self.path, "a") as choices_file:
+            choices_file.write("SKU-999999\n")
+        with self.assertRaises(ValueError):
+            KFileChoices(self.path, bloom_path=bloom_path)
+        with self.assertRaises(ValueError):
+            KFileChoices(self.path, bloom_path=self.path)
+        with self.assertRaises(ValueError):
+            write_bloom_filter(self.path, bloom_path, bits_per_value=0)
+
+    def test_parser(self):
+        # Add an argument with the choices in a file.
+        parser = KArgumentParser(prog="prog", exit_on_error=False)
+        parser.add_argument("--sku", nargs="+", choices=KFileChoices(self.path), help="The SKU, one of %(choices)s.")
+        # Check to make sure the values are checked against the file, which is never counted or listed.
+        self.assertEqual(parser.parse_args(["--sku", "SKU-000007", "SKU-034993"]).sku, ["SKU-000007", "SKU-034993"])
+        with self.assertRaises(KArgumentError) as error:
+            parser.parse_args(["--sku", "SKU-000008"])
+        self.assertEqual(error.exception.message, "Argument --sku: Invalid choice: SKU-000008 (value not in choices)")
+        self.assertIsNone(parser._actions[-1].choices._length)
+        # Check to make sure the help statement describes the file.
+        self.assertIn("The SKU, one of the values in skus.txt.", parser.format_help())
+
+    def test_choices_index(self):
+        # Check to make sure each kind of index answers the same as the in operator.
+        for choices, values in (([3, 1, 2], [1, 4, 2.0, True, "1", [1]]),
+                                (range(0, 100, 5), [5, 6, 5.0, 5.5, True, "5", float("inf"), None]),
+                                ([[2], [1, 2]], [[1, 2], [3], (1, 2), 1]),
+                                ([{"a" : 1}, 2], [{"a" : 1}, 2, 3]),
+                                ([{1, 2}, {3}, {0}, {5, 6}, {4}], [{1, 2}, {3}, {0}, {5, 6}, {4}, {7}, {1}]),
+                                ([[1], [1], [0]], [[0], [1], [2]]),
+                                ("abcde", ["a", "bc", "f"])):
+            index = get_choices_index(choices)
+            for value in values:
+                self.assertEqual(index(value), value in choices, (choices, value))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 
-from kargparse.parser import ArgumentError, FileType, KArgumentParser, KArgumentError, KProgramError, KUsageError, Namespace
+from io import StringIO
+from kargparse.error import KMultipleErrors
+from kargparse.parser import ArgumentError, ArgumentTypeError, FileType, KArgumentParser, KArgumentError, KProgramError, KUsageError, Namespace
+from unittest.mock import patch
 import unittest
 
 class TestErrors(unittest.TestCase):
@@ -329,6 +332,96 @@ class TestErrors(unittest.TestCase):
         self.assertEqual(error.message, "Undefined error message. That should not happen. Message: This message will fail.")
         self.assertEqual(error.status, 70)
 
+    def test_error_kinds(self):
+        # Add arguments with each kind of KArgParse error.
+        self.parser.add_argument("--value", type=int)
+        self.parser.add_argument("--choice", choices=["a", "b"])
+        self.parser.add_argument("--check", choices=lambda value: value == "a")
+        self.parser.add_argument("--many", nargs="{2,3}")
+        # Check that the errors are handled from their kind, without matching their messages.
+        with patch("kargparse.parser._ERROR_MESSAGES", ()):
+            for argv, exception, message in (
+                (["--value", "x"], KArgumentError, "Argument --value: Invalid value: x"),
+                (["--choice", "c"], KArgumentError, "Argument --choice: Invalid choice: c (choose from 'a', 'b')"),
+                (["--check", "c"], KArgumentError, "Argument --check: Invalid choice: c (value not in choices)"),
+                (["--many", "a"], KUsageError, "Argument --many: Expected between 2 and 3 arguments.")
+            ):
+                with self.assertRaises(exception) as error:
+                    self.parser.parse_args(argv)
+                self.assertEqual(error.exception.message, message)
+            with self.assertRaises(KProgramError) as error:
+                self.parser.add_argument("--bad", nargs="{3,2}")
+            self.assertEqual(error.exception.message, "Argument --bad: The specified nargs '{3,2}' is not supported.")
+
+    def test_type_error_message(self):
+        # Check that a type function that raises an ArgumentTypeError with a KArgParse message is still handled.
+        def convert(value):
+            raise ArgumentTypeError("Invalid value: {}".format(value))
+        self.parser.modify_allowed_types(add={"convert" : "value"})
+        self.parser.add_argument("--converted", type=convert)
+        with self.assertRaises(KArgumentError) as error:
+            self.parser.parse_args(["--converted", "x"])
+        self.assertEqual((error.exception.message, error.exception.status), ("Argument --converted: Invalid value: x", 2))
+
+    def test_collect_errors(self):
+        # Create a parser that collects errors.
+        parser = KArgumentParser(prog="prog", exit_on_error=False, collect_errors=True)
+        parser.add_argument("--foo", type=int)
+        parser.add_argument("--bar", choices=["a", "b"])
+        parser.add_argument("baz")
+        subparsers = parser.add_subparsers(dest="mode")
+        subparser = subparsers.add_parser("run")
+        subparser.add_argument("--count", type=int)
+        # Check that every recoverable error is collected and raised together.
+        with self.assertRaises(KMultipleErrors) as error:
+            parser.parse_args(["--foo", "x", "--bar", "c", "--unknown"])
+        error = error.exception
+        self.assertEqual([type(item) for item in error.errors], [KArgumentError, KArgumentError, KUsageError, KUsageError])
+        self.assertEqual(error.message, "\n".join([
+            "Argument --foo: Invalid value: x",
+            "Argument --bar: Invalid choice: c (choose from 'a', 'b')",
+            "The following arguments are required: baz",
+            "Unrecognized arguments: --unknown"
+        ]))
+        self.assertEqual(error.status, 2)
+        # Check that an error that can't be recovered from ends the parsing.
+        with self.assertRaises(KMultipleErrors) as error:
+            parser.parse_args(["--foo", "x", "--bar"])
+        self.assertEqual(error.exception.message, "Argument --foo: Invalid value: x\nArgument --bar: Expected one argument.")
+        # Check that the subparser's errors are collected with the parent's.
+        with self.assertRaises(KMultipleErrors) as error:
+            parser.parse_args(["--foo", "x", "baz", "run", "--count", "y"])
+        self.assertEqual(error.exception.message, "Argument --foo: Invalid value: x\nArgument --count: Invalid value: y")
+        # Check that a single error is raised as usual.
+        with self.assertRaises(KUsageError) as error:
+            parser.parse_known_args([])
+        self.assertEqual(error.exception.message, "The following arguments are required: baz")
+        # Check that an ambiguous option is reported once and ends the parsing.
+        ambiguous_parser = KArgumentParser(prog="prog", exit_on_error=False, collect_errors=True)
+        ambiguous_parser.add_argument("--foo", type=int)
+        ambiguous_parser.add_argument("--foobar", type=int)
+        with self.assertRaises(KUsageError) as error:
+            ambiguous_parser.parse_args(["--foo", "x", "--fo", "1"])
+        self.assertRegex(error.exception.message, "^Ambiguous option: --fo could match (?:--foo, --foobar|--foobar, --foo)$")
+        # Check that the errors are returned by parse_many().
+        results = list(parser.parse_many([["--foo", "x"], ["--foo", "1", "baz"]]))
+        self.assertEqual(results[0].message, "Argument --foo: Invalid value: x\nThe following arguments are required: baz")
+        self.assertEqual(results[1].foo, 1)
+
+    def test_collect_errors_exit(self):
+        # Create a parser that collects errors and exits.
+        parser = KArgumentParser(prog="prog", collect_errors=True)
+        parser.add_argument("--foo", type=int)
+        parser.add_argument("--bar", type=int)
+        # Check that every error is listed in the usage statement.
+        with patch("sys.stderr", StringIO()) as output, self.assertRaises(SystemExit) as error:
+            parser.parse_args(["--foo", "x", "--bar", "y"])
+        self.assertEqual(error.exception.code, 2)
+        self.assertIn("Error Diagnostics (use -h|--help for usage details):\n    Argument --foo: Invalid value: x\n\n    Argument --bar: Invalid value: y\n", output.getvalue())
+        # Check the collect_errors.
+        with self.assertRaises(TypeError):
+            KArgumentParser(collect_errors="yes")
+
 if __name__ == "__main__":
     unittest.main()
 
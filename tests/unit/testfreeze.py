@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+from contextlib import redirect_stdout
+from importlib import import_module, invalidate_caches
+from io import StringIO
+from kargparse.freeze import freeze_parser, get_frozen_key, get_frozen_text, main
+from kargparse.parser import KArgumentParser
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+import sys
+import unittest
+
+FROZEN = "example_frozen_help"
+IMPORTED_FROZEN = "imported_frozen_help"
+UNNAMED_FROZEN = "unnamed_frozen_help"
+OPTIONS = "example_frozen_options"
+
+def build_example_parser():
+    # Create a parser with a few arguments and a group that uses the frozen module.
+    parser = KArgumentParser(prog="example", add_version="1.0", exit_on_error=False, frozen=FROZEN)
+    parser.add_argument("foo", choices=["a", "b", "c"], help="This is the help for foo.")
+    parser.add_argument("-b", "--bar", type=int, default=7, help="This is the help for -b|--bar.")
+    group = parser.add_argument_group("Group", "This is the group description.")
+    group.add_argument("--baz", nargs=2, help="This is the help for --baz.")
+    return parser
+
+def build_unnamed_parser():
+    # Create a parser that takes its program name from sys.argv[0].
+    parser = KArgumentParser(add_version="1.0", exit_on_error=False, frozen=UNNAMED_FROZEN)
+    parser.add_argument("--qux", help="This is the help for --qux.")
+    return parser
+
+def build_imported_parser():
+    # Create a parser with the help of an argument from another module.
+    options = import_module(OPTIONS)
+    parser = KArgumentParser(prog="imported", exit_on_error=False, frozen=IMPORTED_FROZEN)
+    parser.add_argument("--qux", help=options.HELP)
+    return parser
+
+class TestFreeze(unittest.TestCase):
+
+    def setUp(self):
+        # Create a temporary directory for the frozen module, and freeze the parser into it.
+        self.directory = TemporaryDirectory()
+        sys.path.insert(0, self.directory.name)
+        sys.modules.pop(FROZEN, None)
+        freeze_parser(build_example_parser, join(self.directory.name, FROZEN + ".py"), [60, 80])
+        invalidate_caches()
+        self.frozen = import_module(FROZEN)
+
+    def tearDown(self):
+        sys.path.remove(self.directory.name)
+        for name in (FROZEN, IMPORTED_FROZEN, UNNAMED_FROZEN, OPTIONS):
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+    def test_freeze_parser(self):
+        # Check to make sure the frozen text is the same as the text formatted by the parser.
+        parser = build_example_parser()
+        self.assertEqual(self.frozen.HELP[80], parser.format_help())
+        parser._line_width = 60
+        self.assertEqual(self.frozen.HELP[60], parser.format_help())
+        self.assertEqual(self.frozen.VERSION, {60 : "example 1.0\n", 80 : "example 1.0\n"})
+        self.assertEqual((self.frozen.HELP_OPTIONS, self.frozen.VERSION_OPTIONS), (("-h", "--help"), ("-v", "--version")))
+        self.assertEqual(self.frozen.KEY, get_frozen_key("{}:build_example_parser".format(__name__)))
+        # Check to make sure the command line writes the same module.
+        path = join(self.directory.name, "main_frozen_help.py")
+        main(["{}:build_example_parser".format(__name__), path, "--width", "60", "--width", "80"])
+        with open(join(self.directory.name, FROZEN + ".py")) as expected, open(path) as actual:
+            self.assertEqual(actual.read(), expected.read())
+
+    def test_program_name(self):
+        # Check to make sure freezing a parser that takes its program name from sys.argv[0] needs the program name.
+        name = "{}:build_unnamed_parser".format(__name__)
+        path = join(self.directory.name, UNNAMED_FROZEN + ".py")
+        with patch("sys.argv", ["freeze.py"]), self.assertRaises(ValueError) as error:
+            main([name, path])
+        self.assertIn("sys.argv[0] (freeze.py)", str(error.exception))
+        # Check to make sure the program name is used while the builder runs, and the frozen text is printed for it.
+        with patch("sys.argv", ["freeze.py"]):
+            main([name, path, "--prog", "unnamed", "--width", "80"])
+            self.assertEqual(sys.argv, ["freeze.py"])
+        invalidate_caches()
+        frozen = import_module(UNNAMED_FROZEN)
+        self.assertEqual(frozen.PROG, "unnamed")
+        with patch("sys.argv", ["/usr/bin/unnamed", "--help"]), redirect_stdout(StringIO()) as output, self.assertRaises(SystemExit):
+            build_unnamed_parser()
+        self.assertEqual(output.getvalue(), frozen.HELP[80])
+
+    def test_imported_module(self):
+        # Check to make sure a module loaded by the builder is part of the key.
+        options_path = join(self.directory.name, OPTIONS + ".py")
+        with open(options_path, "w") as options_file:
+            options_file.write("HELP = 'This is the help for --qux.'\n")
+        sys.modules.pop(OPTIONS, None)
+        invalidate_caches()
+        freeze_parser(build_imported_parser, join(self.directory.name, IMPORTED_FROZEN + ".py"))
+        invalidate_caches()
+        frozen = import_module(IMPORTED_FROZEN)
+        width = next(iter(frozen.HELP))
+        self.assertIn(OPTIONS, frozen.MODULES)
+        self.assertIn("This is the help for --qux.", get_frozen_text(IMPORTED_FROZEN, "imported", width, ["-h"]))
+        # Check to make sure changing the module makes the frozen module stale.
+        with open(options_path, "w") as options_file:
+            options_file.write("HELP = 'This is the new help for --qux.'\n")
+        self.assertNotEqual(get_frozen_key(frozen.BUILDER, frozen.MODULES), frozen.KEY)
+        self.assertEqual(get_frozen_text(IMPORTED_FROZEN, "imported", width, ["-h"]), None)
+
+    def test_get_frozen_text(self):
+        # Check to make sure only a help or version option by itself gets the frozen text.
+        self.assertEqual(get_frozen_text(FROZEN, "example", 80, ["--help"]), self.frozen.HELP[80])
+        self.assertEqual(get_frozen_text(FROZEN, "example", 60, ["-v"]), self.frozen.VERSION[60])
+        for args in ([], ["a"], ["-h", "a"], ["--bar"]):
+            self.assertEqual(get_frozen_text(FROZEN, "example", 80, args), None)
+        # Check to make sure a different program name or width, a missing module, or a stale key gets nothing.
+        self.assertEqual(get_frozen_text(FROZEN, "other", 80, ["-h"]), None)
+        self.assertEqual(get_frozen_text(FROZEN, "example", 100, ["-h"]), None)
+        self.assertEqual(get_frozen_text("missing_frozen_help", "example", 80, ["-h"]), None)
+        # Check to make sure the key is only checked when a stamp changed, and a file that was only touched still matches.
+        stamps = self.frozen.STAMPS
+        self.frozen.STAMPS = (stamps[0], tuple((path, 0, size) for path, _, size in stamps[1]))
+        self.assertEqual(get_frozen_text(FROZEN, "example", 80, ["-h"]), self.frozen.HELP[80])
+        self.frozen.KEY = "stale"
+        self.assertEqual(get_frozen_text(FROZEN, "example", 80, ["-h"]), None)
+        self.frozen.STAMPS = stamps
+        self.assertEqual(get_frozen_text(FROZEN, "example", 80, ["-h"]), self.frozen.HELP[80])
+        self.frozen.STAMPS = ("other versions", stamps[1])
+        self.assertEqual(get_frozen_text(FROZEN, "example", 80, ["-h"]), None)
+
+    def test_frozen_parser(self):
+        # Check to make sure the parser prints the frozen text and exits as soon as it is created.
+        with patch("sys.argv", ["example", "--help"]), redirect_stdout(StringIO()) as output, self.assertRaises(SystemExit) as error:
+            build_example_parser()
+        self.assertEqual((output.getvalue(), error.exception.code), (self.frozen.HELP[80], 0))
+        # Check to make sure a stale module falls back to the help action.
+        self.frozen.KEY = "stale"
+        self.frozen.STAMPS = None
+        with patch("sys.argv", ["example", "--help"]):
+            parser = build_example_parser()
+        with redirect_stdout(StringIO()) as output, self.assertRaises(SystemExit):
+            parser.parse_args(["--help"])
+        self.assertEqual(output.getvalue(), self.frozen.HELP[80])
+        # Check to make sure the parser is built normally while it is being frozen.
+        freeze_parser(build_example_parser, join(self.directory.name, "other_frozen_help.py"))
+        # Check to make sure frozen is a string.
+        with self.assertRaises(TypeError):
+            KArgumentParser(frozen=self.frozen)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+from kargparse.error import KArgumentError, KProgramError, KUsageError
+from kargparse.parallel import parse_parallel
+from kargparse.parser import KArgumentParser
+from tempfile import TemporaryDirectory
+import unittest
+
+def build_example_parser():
+    # Create a parser that has a lambda for choices, which can't be pickled.
+    parser = KArgumentParser(prog="example", namespace_class="slots")
+    parser.add_argument("foo", choices=lambda value: value in ["a", "b", "c"])
+    parser.add_argument("-b", "--bar", type=int, default=7)
+    return parser
+
+def build_broken_parser():
+    # Create a parser that has a choices function with too many arguments.
+    parser = KArgumentParser(prog="broken")
+    parser.add_argument("foo", choices=lambda value, values: value in values)
+    return parser
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        # Create the command lines, a mix of valid and invalid ones.
+        self.argvs = [["a"], ["b", "--bar", "1"], ["d"], ["c", "--bar", "x"], ["a", "--baz"]] * 7
+
+    def test_parse_parallel(self):
+        # Check to make sure the results match parse_many() and are in order.
+        expected = [result if isinstance(result, Exception) else dict(result) for result in build_example_parser().parse_many(self.argvs)]
+        for processes, chunksize in [(1, 100), (2, 1), (3, 4)]:
+            results = list(parse_parallel(build_example_parser, iter(self.argvs), processes=processes, chunksize=chunksize))
+            self.assertEqual(len(results), len(self.argvs))
+            for result, expected_result in zip(results, expected):
+                if isinstance(expected_result, Exception):
+                    self.assertIs(type(result), type(expected_result))
+                    self.assertEqual((result.message, result.status), (expected_result.message, expected_result.status))
+                else:
+                    self.assertEqual(dict(result), expected_result)
+
+        # Check a few of the results directly.
+        results = list(parse_parallel(build_example_parser, self.argvs[:5], processes=2, chunksize=2))
+        self.assertEqual(dict(results[1]), {"foo" : "b", "bar" : 1})
+        self.assertIsInstance(results[2], KArgumentError)
+        self.assertIsInstance(results[4], KUsageError)
+        self.assertEqual(results[4].message, "Unrecognized arguments: --baz")
+
+    def test_parse_parallel_snapshot(self):
+        # Check to make sure the workers can load the parser from a snapshot directory.
+        with TemporaryDirectory() as cache_dir:
+            results = list(parse_parallel(build_example_parser, self.argvs[:2], processes=2, cache_dir=cache_dir))
+        self.assertEqual([dict(result) for result in results], [{"foo" : "a", "bar" : 7}, {"foo" : "b", "bar" : 1}])
+
+    def test_parse_parallel_errors(self):
+        # Check to make sure a programming error in a worker is raised.
+        with self.assertRaises(KProgramError):
+            list(parse_parallel(build_broken_parser, [["a"]], processes=1))
+
+        # Check to make sure the chunksize is checked when parse_parallel() is called.
+        with self.assertRaises(TypeError):
+            parse_parallel(build_example_parser, [], chunksize="1")
+        with self.assertRaises(ValueError):
+            parse_parallel(build_example_parser, [], chunksize=0)
+
+if __name__ == "__main__":
+    unittest.main()
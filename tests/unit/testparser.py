@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 
-from kargparse.parser import ArgumentError, FileType, KArgumentParser, KArgumentError, KProgramError, KUsageError, Namespace
+from argparse import ArgumentParser
+from asyncio import run, sleep
+from contextlib import redirect_stdout
+from io import StringIO
+from kargparse.parser import ArgumentError, FileType, KArgumentParser, KArgumentError, KProgramError, KUsageError, Namespace, RawTextHelpFormatter, SUPPRESS
+from os.path import join
 from re import match
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from unittest.mock import patch
 import unittest
 
 class TestParser(unittest.TestCase):
@@ -82,6 +90,43 @@ class TestParser(unittest.TestCase):
         # Check to make sure the same help statement is reproduced.
         self.assertEqual(help, self.parser.format_help())
 
+    def test_format_statement(self):
+        # Create a parser with a bit of everything in its help statement.
+        parser = KArgumentParser(prog="prog", description="Description.")
+        parser.add_argument("--foo", type=int, default=1, help="Foo (default: %(default)s).")
+        group = parser.add_argument_group("Group", "Group description.")
+        group.add_argument("--bar", choices=["a", "b"])
+        subparsers = parser.add_subparsers(dest="mode")
+        subparsers.add_parser("mode-01", help="Mode 01.")
+
+        def formatted(full):
+            # Format the statement from scratch.
+            formatter = parser._get_formatter()
+            parser._add_sections(formatter, full, (parser._error_message or "").splitlines())
+            return formatter.format_help()
+
+        # Check to make sure a kept statement is the same as a formatted one after each change.
+        changes = [lambda: None,
+                   lambda: parser.add_argument("--baz"),
+                   lambda: group.add_argument("--qux"),
+                   lambda: parser.set_defaults(foo=2),
+                   lambda: subparsers.add_parser("mode-02", help="Mode 02."),
+                   lambda: parser.add_argument_group("Empty", "Empty description."),
+                   lambda: setattr(parser, "description", "New description."),
+                   lambda: parser.modify_allowed_types(replace={"int" : "number"})]
+        for change in changes:
+            change()
+            for message in (None, "Argument --foo: Invalid value: x", "first\n\nsecond", "%(prog)s: " + "word " * 40):
+                parser._error_message = message
+                self.assertEqual(parser.format_help(), formatted(True))
+                self.assertEqual(parser.format_usage(), formatted(False))
+        self.assertIn("New description.", parser.format_help())
+        self.assertIn("mode-02", parser.format_usage())
+
+        # Check to make sure the statement is only formatted once.
+        parser._error_message = None
+        self.assertIs(parser.format_help(), parser.format_help())
+
     def test_get_formatter(self):
         # Attempt to get the formatter.
         formatter = self.parser._get_formatter()
@@ -94,6 +139,25 @@ class TestParser(unittest.TestCase):
         self.assertEqual(formatter._delimeter, self.parser._get_formatter()._delimeter)
         self.assertEqual(formatter._prefix_chars, self.parser._get_formatter()._prefix_chars)
 
+    def test_action_records(self):
+        # Add arguments whose option strings need ordering.
+        foo = self.parser.add_argument("--Foo", "-f", "--bar", type=int, required=True)
+        self.parser.add_argument("qux")
+        formatter = self.parser._get_formatter()
+        # Check to make sure the parts are formatted the same as always.
+        self.assertEqual(formatter._format_option_strings(foo), "fbarfoo")
+        self.assertEqual(formatter._format_option_strings(foo, key=False), "{-f|--bar|--Foo}")
+        self.assertEqual(formatter._format_action_invocation(foo), "{-f|--bar|--Foo} <integer>")
+        self.assertEqual(formatter._get_formal_name(foo), "--Foo")
+        # Check to make sure each part is kept in the argument's record.
+        record = formatter._get_action_record(foo)
+        self.assertIs(formatter._get_action_record(foo), record)
+        self.assertEqual((record.sort_key, record.options, record.metavar, record.input, record.formal_name), ("fbarfoo", "{-f|--bar|--Foo}", "integer", "<integer>", "--Foo"))
+        self.assertIs(formatter._order_option_strings(foo), record.ordered_options)
+        # Check to make sure the help and usage statements use the same parts.
+        self.assertIn("\n    {-f|--bar|--Foo} <integer>", self.parser.format_help())
+        self.assertIn("{-f|--bar|--Foo} <integer> <qux>", self.parser.format_usage())
+
     def test_check_value(self):
         # Add an argument to the parser.
         foo = self.parser.add_argument("foo", choices="abcde")
@@ -235,6 +299,498 @@ class TestParser(unittest.TestCase):
         args = pka(["-c", "-s", "--store", "foo", "bar", "baz", "--unknown", "7"])
         self.assertEqual(str(args), "(Namespace(append=[], append_const=None, count=1, s=['foo', 'bar'], store=['baz'], store_const=0, store_false=True, store_true=False), ['--unknown', '7'])")
 
+    def test_lazy_subparsers(self):
+        # Keep track of which subparsers were built.
+        built = []
+        def factory(**kwargs):
+            built.append(kwargs["prog"])
+            parser = KArgumentParser(exit_on_error=False, **kwargs)
+            parser.add_argument("--bar", type=int)
+            return parser
+
+        # Add one eager subparser and two lazy subparsers.
+        self.parser.prog = "prog"
+        subparsers = self.parser.add_subparsers(dest="mode", help="Modes of Operation.")
+        subparsers.add_parser("mode-01", help="I'm an eager mode.")
+        self.assertEqual(subparsers.add_parser("mode-02", factory=factory, aliases=["m2"], help="I'm a lazy mode."), None)
+        subparsers.add_parser("mode-03", factory=factory, help="I'm another lazy mode.")
+
+        # Check to make sure the help and usage statements don't build the lazy subparsers.
+        self.assertIn("{mode-01|mode-02 (m2)|mode-03} ...", self.parser.format_help())
+        self.assertIn("<mode-03>", self.parser.format_help())
+        self.parser.format_usage()
+        self.assertEqual(built, [])
+
+        # Check to make sure an invalid choice doesn't build the lazy subparsers.
+        with self.assertRaises(KArgumentError) as error:
+            self.parser.parse_args(["mode-04"])
+        self.assertEqual(error.exception.message, "Argument mode: Invalid choice: mode-04 (choose from 'mode-01', 'mode-02', 'm2', 'mode-03')")
+        self.assertEqual(built, [])
+
+        # Check to make sure only the selected subparser is built, and only once.
+        self.assertEqual(vars(self.parser.parse_args(["m2", "--bar", "1"])), {"mode" : "m2", "bar" : 1})
+        self.assertEqual(vars(self.parser.parse_args(["mode-02", "--bar", "2"])), {"mode" : "mode-02", "bar" : 2})
+        self.assertEqual(built, ["prog mode-02"])
+        self.assertIs(subparsers.choices["mode-02"], subparsers.choices["m2"])
+
+        # Check to make sure the names are still checked for conflicts.
+        with self.assertRaises(ArgumentError):
+            subparsers.add_parser("mode-03", factory=factory)
+        with self.assertRaises(TypeError):
+            subparsers.add_parser("mode-05", factory="factory")
+
+    def test_get_option_tuples(self):
+        # Build the same options into a KArgumentParser and an ArgumentParser.
+        parsers = [KArgumentParser(conflict_handler="resolve", exit_on_error=False), ArgumentParser(conflict_handler="resolve")]
+        for parser in parsers:
+            parser.add_argument("-f", "--foo")
+            parser.add_argument("--foobar")
+            group = parser.add_argument_group("group")
+            group.add_argument("-b", "--bar")
+            group.add_argument("--baz", "--foobaz")
+            parser.add_argument("-x", "--bar")
+
+        # Check to make sure the matches are the same, in the same order.
+        tokens = ["--f", "--foo", "--foob", "--foobar=1", "--ba", "--b=2", "--bar", "--x", "-f1", "-fo", "-b", "-bar", "-x2", "--"]
+        for token in tokens:
+            expected = [(option_tuple[0].dest,) + option_tuple[1:] for option_tuple in parsers[1]._get_option_tuples(token)]
+            actual = [(option_tuple[0].dest,) + option_tuple[1:] for option_tuple in parsers[0]._get_option_tuples(token)]
+            self.assertEqual(actual, expected, token)
+
+        # Check to make sure the index follows the conflict resolution.
+        self.assertEqual([option_tuple[1] for option_tuple in parsers[0]._get_option_tuples("--ba")], ["--baz", "--bar"])
+        self.assertEqual(parsers[0]._get_option_tuples("--bar")[0][0].option_strings, ["-x", "--bar"])
+
+        # Check to make sure the ambiguous option message hasn't changed.
+        with self.assertRaises(KUsageError) as error:
+            parsers[0].parse_args(["--foo", "1", "--fo", "2"])
+        self.assertEqual(error.exception.message, "Ambiguous option: --fo could match --foo, --foobar, --foobaz")
+
+    def test_nargs_expressions(self):
+        # Add arguments with the "N+" and "{m,n}" expressions.
+        self.parser.add_argument("--two", nargs="2+")
+        self.parser.add_argument("--range", nargs="{1,3}")
+        self.parser.add_argument("positional", nargs="{2,3}")
+        self.parser.add_argument("remaining", nargs="1+")
+
+        # Check to make sure the arguments are matched.
+        self.assertEqual(vars(self.parser.parse_args(["--two", "a", "b", "c", "--range", "d", "e", "f", "g", "h", "i"])), {"two" : ["a", "b", "c"], "range" : ["d", "e", "f"], "positional" : ["g", "h"], "remaining" : ["i"]})
+        self.assertEqual(vars(self.parser.parse_args(["a", "b", "c", "d", "e"])), {"two" : None, "range" : None, "positional" : ["a", "b", "c"], "remaining" : ["d", "e"]})
+        self.assertEqual(vars(self.parser.parse_args(["--range", "a", "--", "b", "c", "d"])), {"two" : None, "range" : ["a"], "positional" : ["b", "c"], "remaining" : ["d"]})
+
+        # Check to make sure the wrong number of arguments raises an error.
+        with self.assertRaises(KUsageError) as error:
+            self.parser.parse_args(["--two", "a"])
+        self.assertEqual(error.exception.message, "Argument --two: Expected at least 2 arguments.")
+        with self.assertRaises(KUsageError) as error:
+            self.parser.parse_args(["--range"])
+        self.assertEqual(error.exception.message, "Argument --range: Expected between 1 and 3 arguments.")
+        with self.assertRaises(KUsageError) as error:
+            self.parser.parse_args(["a", "b", "c", "--range", "1", "2", "3", "4"])
+        self.assertEqual(error.exception.message, "Unrecognized arguments: 4")
+
+        # Check to make sure the help statement shows the expressions.
+        usage = self.parser.format_usage()
+        self.assertIn("<positional> <positional> [<positional>]", usage)
+        self.assertIn("<remaining> [<remaining> [...]]", usage)
+        help_statement = self.parser.format_help()
+        self.assertIn("{--two} <value> <value> [<value> [...]]", help_statement)
+        self.assertIn("{--range} <value> [<value> [<value>]]", help_statement)
+
+        # Check to make sure an unsupported nargs raises an error.
+        for number, nargs in enumerate(["{3,1}", "{0,0}", "N+", "2-"]):
+            with self.assertRaises(KProgramError) as error:
+                self.parser.add_argument("--bad-{}".format(number), nargs=nargs)
+            self.assertEqual(error.exception.message, "Argument --bad-{}: The specified nargs '{}' is not supported.".format(number, nargs))
+        # Check to make sure an expression raises an error when argparse formats the help statement.
+        parser = KArgumentParser(formatter_class=RawTextHelpFormatter, exit_on_error=False)
+        with self.assertRaises(KProgramError) as error:
+            parser.add_argument("-t", "--two", nargs="2+")
+        self.assertEqual(error.exception.message, "Argument -t/--two: The specified nargs '2+' is only supported by KHelpFormatter.")
+        parser.add_argument("--two", nargs=2)
+        self.assertIn("--two TWO TWO", parser.format_help())
+
+    def test_defaults_template(self):
+        # Add arguments with defaults, including a duplicate and a suppressed dest.
+        self.parser.add_argument("--foo", default=1)
+        self.parser.add_argument("--bar", dest="foo", default=2)
+        self.parser.add_argument("--baz", default=SUPPRESS)
+        self.parser.set_defaults(qux=3)
+        self.assertEqual(vars(self.parser.parse_args([])), {"foo" : 1, "qux" : 3})
+
+        # Check to make sure the defaults follow set_defaults() and new arguments.
+        self.parser.set_defaults(foo=4)
+        group = self.parser.add_argument_group("group")
+        group.add_argument("--quux", default=5)
+        self.assertEqual(vars(self.parser.parse_args([])), {"foo" : 4, "qux" : 3, "quux" : 5})
+
+        # Check to make sure a caller supplied namespace keeps its values.
+        namespace = Namespace(foo=6)
+        self.assertIs(self.parser.parse_args([], namespace), namespace)
+        self.assertEqual(vars(namespace), {"foo" : 6, "qux" : 3, "quux" : 5})
+
+        # Check to make sure each namespace is new.
+        self.assertIsNot(self.parser.parse_args([]), self.parser.parse_args([]))
+
+        # Check to make sure a default changed directly on an argument is used.
+        self.parser.add_argument("--corge", default=7).default = 8
+        self.assertEqual(vars(self.parser.parse_args([])), {"foo" : 4, "qux" : 3, "quux" : 5, "corge" : 8})
+        self.parser._actions[-1].default = 9
+        self.assertEqual(vars(self.parser.parse_args([])), {"foo" : 4, "qux" : 3, "quux" : 5, "corge" : 9})
+
+    def test_slots_namespace(self):
+        # Check to make sure an unsupported namespace_class raises an error.
+        with self.assertRaises(TypeError):
+            KArgumentParser(namespace_class=1)
+        with self.assertRaises(ValueError):
+            KArgumentParser(namespace_class="dict")
+
+        # Create a parser with slotted namespaces and a subparser.
+        parser = KArgumentParser(add_help=False, exit_on_error=False, namespace_class="slots")
+        parser.add_argument("--foo", type=int, default=1)
+        parser.add_argument("bar-baz")
+        parser.set_defaults(qux="quux")
+        subparsers = parser.add_subparsers(dest="mode")
+        subparsers.add_parser("mode-01").add_argument("--corge", default=2)
+
+        # Check to make sure the namespace stores the dests in slots.
+        namespace = parser.parse_args(["--foo", "3", "4", "mode-01"])
+        self.assertIsInstance(namespace, Namespace)
+        self.assertEqual(namespace.__slots__, ("foo", "mode", "qux"))
+        self.assertEqual(vars(namespace), {"bar-baz" : "4", "corge" : 2})
+        self.assertEqual(dict(namespace), {"foo" : 3, "mode" : "mode-01", "qux" : "quux", "bar-baz" : "4", "corge" : 2})
+        self.assertEqual(namespace, Namespace(foo=3, mode="mode-01", qux="quux", corge=2, **{"bar-baz" : "4"}))
+        self.assertEqual(repr(namespace), "Namespace(foo=3, mode='mode-01', qux='quux', corge=2, **{'bar-baz': '4'})")
+        self.assertIn("foo", namespace)
+        self.assertNotIn("grault", namespace)
+
+        # Check to make sure the class is generated again for new dests.
+        parser.add_argument("--grault")
+        self.assertEqual(parser.parse_args(["4"]).__slots__, ("foo", "mode", "grault", "qux"))
+        self.assertIs(type(parser.parse_args(["4"])), type(parser.parse_args(["5"])))
+        parser._option_string_actions["--foo"].default = 6
+        self.assertEqual(parser.parse_args(["4"]).foo, 6)
+
+    def test_parse_many(self):
+        # Create a parser that exits on errors, with a subparser that does too.
+        parser = KArgumentParser(prog="prog", add_version="1.0")
+        parser.add_argument("--foo", type=int)
+        subparsers = parser.add_subparsers(dest="mode")
+        subparsers.add_parser("mode-01").add_argument("--bar", type=int, required=True)
+
+        # Check to make sure each command line gets a result and nothing exits.
+        argvs = [["--foo", "1"], ["--foo", "a"], ["--baz"], ["mode-01", "--bar", "2"], ["mode-01"], ["-v"], ["-h"]]
+        results = list(parser.parse_many(iter(argvs)))
+        self.assertEqual(len(results), len(argvs))
+        self.assertEqual(vars(results[0]), {"foo" : 1, "mode" : None})
+        self.assertIsInstance(results[1], KArgumentError)
+        self.assertEqual((results[1].message, results[1].status), ("Argument --foo: Invalid value: a", 2))
+        self.assertIsInstance(results[2], KUsageError)
+        self.assertEqual(results[2].message, "Unrecognized arguments: --baz")
+        self.assertEqual(vars(results[3]), {"foo" : None, "mode" : "mode-01", "bar" : 2})
+        self.assertIsInstance(results[4], KUsageError)
+        self.assertEqual(results[4].message, "The following arguments are required: --bar")
+        self.assertEqual((results[5].message, results[5].status), ("prog 1.0\n", 0))
+        self.assertEqual((results[6].message, results[6].status), (parser.format_help(), 0))
+
+        # Check to make sure the first error is returned and nothing after an invalid value is converted.
+        converted = []
+        def convert(value):
+            converted.append(value)
+            return value
+        parser.modify_allowed_types(add={"convert" : "value"})
+        parser.add_argument("--baz", type=convert)
+        results = list(parser.parse_many([["--foo", "a", "--baz", "b", "--unknown"], ["--baz", "c", "--unknown"]]))
+        self.assertEqual([result.message for result in results], ["Argument --foo: Invalid value: a", "Unrecognized arguments: --unknown"])
+        self.assertEqual(converted, ["c"])
+        self.assertEqual(parser._collected_errors, None)
+
+        # Check to make sure the parser exits normally again afterwards.
+        with patch("sys.stderr", StringIO()) as output, self.assertRaises(SystemExit):
+            parser.parse_args(["--foo", "a"])
+        self.assertIn("Argument --foo: Invalid value: a", output.getvalue())
+
+        # Check to make sure programming errors are still raised.
+        parser.add_argument("--qux", choices=lambda value, values: value in values)
+        with self.assertRaises(KProgramError):
+            list(parser.parse_many([["--qux", "a"]]))
+
+    def test_parse_stream(self):
+        # Create a parser that exits on errors.
+        parser = KArgumentParser(prog="prog")
+        parser.add_argument("--foo", type=int)
+        parser.add_argument("bar")
+
+        # Check to make sure each line is split like a shell and gets a numbered result.
+        stream = StringIO("a --foo 1\n\n# comment\nb --foo x\n'c d' --foo=2 # note\ne \"f\n  g\f h\n")
+        results = list(parser.parse_stream(stream))
+        self.assertEqual([number for number, _ in results], [1, 4, 5, 6, 7])
+        self.assertEqual(vars(results[0][1]), {"foo" : 1, "bar" : "a"})
+        self.assertEqual((results[1][1].message, results[1][1].status), ("Argument --foo: Invalid value: x", 2))
+        self.assertEqual(vars(results[2][1]), {"foo" : 2, "bar" : "c d"})
+        self.assertIsInstance(results[3][1], KUsageError)
+        self.assertEqual(results[3][1].message, "Invalid line: No closing quotation")
+        self.assertEqual(results[4][1].message, "Unrecognized arguments: h")
+
+        # Check to make sure the lines are read one at a time.
+        lines = iter(["a\n", "b --foo\n"])
+        stream = parser.parse_stream(lines)
+        self.assertEqual(vars(next(stream)[1]), {"foo" : None, "bar" : "a"})
+        self.assertEqual(next(lines), "b --foo\n")
+
+    def test_parse_args_async(self):
+        # Create a type and a choices function that do I/O.
+        async def resolve(value):
+            await sleep(0.05)
+            if value == "bad":
+                raise ValueError(value)
+            return value.upper()
+        async def exists(value):
+            await sleep(0.05)
+            return value != "MISSING"
+
+        # Create a parser with a subparser that uses them.
+        self.parser.prog = "prog"
+        self.parser.modify_allowed_types(add={"resolve" : "resolve"})
+        self.parser.add_argument("--foo", type=resolve, nargs="+", choices=exists)
+        self.parser.add_argument("--bar", type=int)
+        self.parser.add_argument("baz", type=resolve)
+        subparsers = self.parser.add_subparsers(dest="mode")
+        subparser = subparsers.add_parser("mode-01", exit_on_error=False)
+        subparser.modify_allowed_types(add={"resolve" : "resolve"})
+        subparser.add_argument("--qux", type=resolve, default="default")
+
+        # Check to make sure the values are converted concurrently.
+        start = perf_counter()
+        namespace = run(self.parser.parse_args_async(["--foo", "a", "b", "c", "--bar", "1", "d", "mode-01"]))
+        self.assertLess(perf_counter() - start, 0.5)
+        self.assertEqual(vars(namespace), {"foo" : ["A", "B", "C"], "bar" : 1, "baz" : "D", "mode" : "mode-01", "qux" : "DEFAULT"})
+
+        # Check to make sure the errors are the same as parse_args() would report.
+        for args, expected in [(["--foo", "a", "bad", "--bar", "x", "d"], (KArgumentError, "Argument --foo: Invalid value: bad")),
+                               (["--bar", "x", "--foo", "bad", "d"], (KArgumentError, "Argument --bar: Invalid value: x")),
+                               (["--foo", "a", "missing", "d"], (KArgumentError, "Argument --foo: Invalid choice: MISSING (value not in choices)")),
+                               (["--foo", "a", "d"], (KUsageError, "The following arguments are required: baz")),
+                               (["d", "--quux"], (KUsageError, "Unrecognized arguments: --quux")),
+                               (["d", "mode-01", "--qux", "bad"], (KArgumentError, "Argument --qux: Invalid value: bad"))]:
+            with self.assertRaises(expected[0]) as error:
+                run(self.parser.parse_args_async(args))
+            self.assertEqual(error.exception.message, expected[1])
+
+        # Check to make sure parse_args() doesn't accept an awaitable.
+        with self.assertRaises(KProgramError) as error:
+            self.parser.parse_args(["d"])
+        self.assertEqual(error.exception.message, "Argument baz: The type 'resolve' returned an awaitable. Use parse_args_async() instead.")
+
+    def test_choices_index(self):
+        # Add arguments with large static choices.
+        self.parser.modify_allowed_types(add={"float" : "float"})
+        self.parser.add_argument("--tenant", choices=["tenant-{:05d}".format(number) for number in range(50000, 0, -1)])
+        self.parser.add_argument("--port", type=float, choices=range(1024, 65536))
+        pairs = self.parser.add_argument("--pair", choices=[[2, 1], [1, 2]])
+        letters = self.parser.add_argument("--letter", choices="abcde")
+        # Check to make sure the values are found the same as the in operator would find them.
+        self.assertEqual(self.parser.parse_args(["--tenant", "tenant-00001"]).tenant, "tenant-00001")
+        self.assertEqual(self.parser.parse_args(["--port", "8080"]).port, 8080.0)
+        self.assertEqual(self.parser._check_value(pairs, [1, 2]), None)
+        self.assertEqual(self.parser._check_value(letters, "bc"), None)
+        for args in (["--tenant", "tenant-50001"], ["--port", "8080.5"], ["--port", "80"]):
+            with self.assertRaises(KArgumentError) as error:
+                self.parser.parse_args(args)
+            self.assertEqual(error.exception.message, "Argument {}: Invalid choice: {} (value not in choices)".format(args[0], float(args[1]) if args[0] == "--port" else args[1]))
+        # Check to make sure the choices keep their order in the message.
+        with self.assertRaises(ArgumentError) as error:
+            self.parser._check_value(pairs, [3])
+        self.assertEqual(str(error.exception), "Argument --pair: Invalid choice: [3] (choose from [2, 1], [1, 2])")
+        # Check to make sure changes to the choices are seen.
+        pairs.choices.append([3])
+        self.assertEqual(self.parser._check_value(pairs, [3]), None)
+        pairs.choices = [[4]]
+        self.assertEqual(self.parser._check_value(pairs, [4]), None)
+
+    def test_choices_cache(self):
+        # Create choices functions that count their calls.
+        calls = {"tenants" : 0, "check" : 0}
+        def tenants():
+            calls["tenants"] += 1
+            return ["tenant-{:03d}".format(number) for number in range(100)]
+        def check(value):
+            calls["check"] += 1
+            return value != "bad"
+        values = ["tenant-{:03d}".format(number) for number in range(0, 100, 10)]
+        # Check to make sure the function is called for every value by default.
+        parser = KArgumentParser(exit_on_error=False)
+        parser.add_argument("--tenant", nargs="+", choices=tenants)
+        parser.parse_args(["--tenant"] + values)
+        self.assertEqual(calls["tenants"], 10)
+        # Check to make sure the result is kept for each parse.
+        calls["tenants"] = 0
+        parser = KArgumentParser(exit_on_error=False, choices_cache="parse")
+        parser.add_argument("--tenant", nargs="+", choices=tenants)
+        parser.parse_args(["--tenant"] + values)
+        parser.parse_args(["--tenant"] + values)
+        self.assertEqual(calls["tenants"], 2)
+        with self.assertRaises(KArgumentError):
+            parser.parse_args(["--tenant", "tenant-100"])
+        # Check to make sure the result is kept for a number of seconds.
+        calls["tenants"] = 0
+        parser = KArgumentParser(exit_on_error=False, choices_cache=60)
+        tenant = parser.add_argument("--tenant", nargs="+", choices=tenants)
+        parser.parse_args(["--tenant"] + values)
+        parser.parse_args(["--tenant"] + values)
+        self.assertEqual(calls["tenants"], 1)
+        tenant.choices = lambda: ["tenant-100"]
+        self.assertEqual(parser.parse_args(["--tenant", "tenant-100"]).tenant, ["tenant-100"])
+        # Check to make sure the one-argument results are kept in an LRU cache.
+        parser = KArgumentParser(exit_on_error=False, choices_lru=2)
+        parser.add_argument("--name", nargs="+", choices=check)
+        parser.parse_args(["--name", "a", "b", "a", "b", "c", "a"])
+        self.assertEqual(calls["check"], 4)
+        with self.assertRaises(KArgumentError):
+            parser.parse_args(["--name", "bad"])
+        # Check the choices_cache and the choices_lru.
+        for kwargs, exception in (({"choices_cache" : "forever"}, ValueError), ({"choices_cache" : 0}, ValueError), ({"choices_cache" : True}, TypeError),
+                                  ({"choices_lru" : -1}, ValueError), ({"choices_lru" : 1.5}, TypeError)):
+            with self.assertRaises(exception):
+                KArgumentParser(**kwargs)
+
+    def test_read_args_from_files(self):
+        with TemporaryDirectory() as directory:
+            # Create nested argument files, one of which includes itself.
+            outer, inner, cycle = join(directory, "outer"), join(directory, "inner"), join(directory, "cycle")
+            with open(outer, "w") as args_file:
+                args_file.write("--foo\n1\n@{}\n\n--bar\f2".format(inner))
+            with open(inner, "w") as args_file:
+                args_file.write("--baz\r\n3\n")
+            with open(cycle, "w") as args_file:
+                args_file.write("--foo\n@{}\n".format(cycle))
+            parser = KArgumentParser(exit_on_error=False, fromfile_prefix_chars="@")
+            parser.add_argument("--foo")
+            parser.add_argument("--bar")
+            parser.add_argument("--baz")
+            parser.add_argument("rest", nargs="*")
+            # Check to make sure the arguments are the same as argparse's.
+            reference = ArgumentParser(fromfile_prefix_chars="@")
+            self.assertEqual(parser._read_args_from_files(["a", "@" + outer, "", "b"]), reference._read_args_from_files(["a", "@" + outer, "", "b"]))
+            self.assertEqual(parser._read_args_from_files(["a", "@" + outer, "", "b"]), ["a", "--foo", "1", "--baz", "3", "", "--bar", "2", "", "b"])
+            self.assertEqual(vars(parser.parse_args(["@" + outer])), {"foo" : "1", "bar" : "2", "baz" : "3", "rest" : [""]})
+            # Check to make sure a file that includes itself is an error.
+            with self.assertRaises(KArgumentError) as error:
+                parser.parse_args(["@" + cycle])
+            self.assertEqual(error.exception.message, "The argument file {} includes itself.".format(cycle))
+            # Check to make sure convert_arg_line_to_args() is still used.
+            parser.convert_arg_line_to_args = str.split
+            self.assertEqual(parser._read_args_from_files(["@" + outer]), ["--foo", "1", "--baz", "3", "--bar", "2"])
+
+    def test_wrap_usage(self):
+        # Add enough options that the usage is wrapped, some breaking at a hyphen.
+        for number in range(40):
+            self.parser.add_argument("--required-option-{}".format(number), "-r{}".format(number), type=int, required=True)
+        group = self.parser.add_mutually_exclusive_group(required=True)
+        group.add_argument("--first-choice", action="store_true")
+        group.add_argument("--second-choice", action="store_true")
+        formatter = self.parser._get_formatter()
+        action_usage = "{} {}".format(formatter._prog, formatter._format_actions_usage(self.parser._actions, self.parser._mutually_exclusive_groups))
+        # Extra whitespace is wrapped in two passes.
+        for usage in (action_usage, "prog  --foo   <bar>  " * 4):
+            for width in (20, 37, 50, 80, 200):
+                formatter._width = width
+                # Wrap the usage in two passes, the way it used to be.
+                first_line = formatter._split_lines(usage, width - 7)[0]
+                expected = [first_line] + [" " * 11 + line for line in formatter._split_lines(usage[len(first_line):], width - 11)]
+                # Check to make sure the usage is wrapped the same.
+                self.assertEqual(formatter._wrap_usage(usage, 7), expected)
+
+    def test_write_help(self):
+        # Add arguments to the parser, in groups and out of order.
+        self.parser.add_argument("--foo", type=int, required=True, help="Foo.\n\n\n\nMore foo.")
+        self.parser.add_argument("-b", "--bar", help="Bar.")
+        self.parser.add_argument("qux", help="Qux.")
+        group = self.parser.add_argument_group("Group", "A group.")
+        group.add_argument("--baz", help=SUPPRESS)
+        # Create a file that keeps each write separately.
+        class PartsFile(StringIO):
+            def __init__(self):
+                super().__init__()
+                self.parts = []
+            def write(self, text):
+                self.parts.append(text)
+                return super().write(text)
+        # Check to make sure the help statement is written in parts, the same as format_help().
+        parts_file = PartsFile()
+        self.parser.write_help(parts_file)
+        self.assertEqual(parts_file.getvalue(), self.parser.format_help())
+        self.assertTrue(parts_file.parts[0].startswith("\nUsage: "))
+        self.assertGreater(len(parts_file.parts), 3)
+        # Check to make sure a kept help statement is written whole.
+        parts_file = PartsFile()
+        self.parser.write_help(parts_file)
+        self.assertEqual(parts_file.parts, [self.parser.format_help()])
+        # Check to make sure the error diagnostics are written the same.
+        self.parser._error_message = "Something went wrong.\nAnother line."
+        parts_file = PartsFile()
+        self.parser.write_help(parts_file)
+        self.assertEqual(parts_file.getvalue(), self.parser.format_help())
+        self.parser._error_message = None
+        # Check to make sure print_help() writes to sys.stdout when it is called, so redirect_stdout() catches it.
+        for _ in range(2):
+            with redirect_stdout(StringIO()) as output:
+                self.parser.print_help()
+            self.assertEqual(output.getvalue(), self.parser.format_help())
+        # Check to make sure a closed pipe is ignored, and a missing stdout falls back to stderr, the same as argparse.
+        class ClosedPipe:
+            def write(self, text):
+                raise BrokenPipeError(32, "Broken pipe")
+        self.parser.add_argument("--new")
+        self.parser.print_help(ClosedPipe())
+        self.parser.format_help()
+        self.parser.print_help(ClosedPipe())
+        with patch("sys.stdout", None), patch("sys.stderr", StringIO()) as output:
+            self.parser.print_help()
+        self.assertEqual(output.getvalue(), self.parser.format_help())
+
+    def test_help_topics(self):
+        parser = KArgumentParser(prog="prog", exit_on_error=False, help_topics=True)
+        parser.add_argument("--foo", type=int, help="The foo of the bar.")
+        parser.add_argument("--baz", help=SUPPRESS)
+        group = parser.add_argument_group("Network", "The network settings.")
+        group.add_argument("--host", help="The host name.")
+        group.add_argument("--port", type=int, help="The port of the host.")
+        # Check to make sure a group is formatted whole, the same as in the help statement.
+        help_topic = parser.format_help_topic("NETWORK")
+        self.assertTrue(help_topic.startswith("\nNetwork:\n    The network settings.\n"))
+        self.assertIn(help_topic.strip("\n"), parser.format_help())
+        # Check to make sure only the matching arguments are formatted.
+        self.assertIn("--foo", parser.format_help_topic("--foo"))
+        self.assertNotIn("--host", parser.format_help_topic("--foo"))
+        help_topic = parser.format_help_topic("Host")
+        self.assertIn("--host", help_topic)
+        self.assertIn("--port", help_topic)
+        self.assertNotIn("The network settings.", help_topic)
+        help_topic = parser.format_help_topic("port host")
+        self.assertIn("--port", help_topic)
+        self.assertNotIn("--host", help_topic)
+        # Check to make sure the index is rebuilt after an argument is added.
+        index = parser._get_help_index()
+        self.assertIs(parser._get_help_index(), index)
+        parser.add_argument("--qux", help="The host of the qux.")
+        self.assertIn("--qux", parser.format_help_topic("host"))
+        # Check to make sure an unknown topic and a suppressed argument are errors.
+        for topic in ("nothing", "--baz", "baz"):
+            with self.assertRaises(KUsageError) as error:
+                parser.format_help_topic(topic)
+            self.assertEqual(error.exception.message, "Unknown help topic: {}".format(topic))
+        # Check to make sure -h|--help takes a topic, and an option string given with '='.
+        self.assertIn("--help=--option", parser.format_help())
+        for args, expected in ((["--help", "network"], parser.format_help_topic("network")), (["--help=--host"], parser.format_help_topic("--host")),
+                               (["-h"], parser.format_help())):
+            with redirect_stdout(StringIO()) as output, self.assertRaises(SystemExit):
+                parser.parse_args(args)
+            self.assertEqual(output.getvalue(), expected)
+        # Check to make sure help_topics is a boolean.
+        with self.assertRaises(TypeError):
+            KArgumentParser(help_topics="yes")
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+from kargparse.parser import KArgumentParser
+from kargparse.snapshot import build_parser, get_snapshot_key, get_snapshot_path, invalidate_snapshot, load_snapshot, save_snapshot
+from pickle import dump
+from tempfile import TemporaryDirectory
+import unittest
+
+def build_example_parser():
+    # Create a parser with a few arguments, a group and a subparser.
+    parser = KArgumentParser(prog="example", add_version="1.0", exit_on_error=False)
+    parser.add_argument("foo", choices=["a", "b", "c"], help="This is the help for foo.")
+    parser.add_argument("-b", "--bar", type=int, default=7, help="This is the help for -b|--bar.")
+    group = parser.add_argument_group("Group", "This is the group description.")
+    group.add_argument("--baz", nargs=2, help="This is the help for --baz.")
+    subparsers = parser.add_subparsers(dest="mode")
+    subparsers.add_parser("mode-01", help="This is the help for mode-01.")
+    return parser
+
+def build_unpicklable_parser():
+    # Create a parser that has a lambda for choices.
+    parser = KArgumentParser(prog="example", exit_on_error=False)
+    parser.add_argument("foo", choices=lambda value: value == "foo")
+    return parser
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        # Create a temporary directory for the snapshots.
+        self.directory = TemporaryDirectory()
+        self.cache_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_snapshot_key(self):
+        # Check to make sure the key is stable and is different for each builder.
+        self.assertEqual(get_snapshot_key(build_example_parser), get_snapshot_key(build_example_parser))
+        self.assertNotEqual(get_snapshot_key(build_example_parser), get_snapshot_key(build_unpicklable_parser))
+        # Check to make sure there is no key when the source can't be found.
+        self.assertEqual(get_snapshot_key(len), None)
+
+    def test_build_parser(self):
+        # Check to make sure there is no snapshot to start with.
+        self.assertEqual(load_snapshot(build_example_parser, self.cache_dir), None)
+        # Build the parser, which should also save the snapshot.
+        expected = build_parser(build_example_parser, self.cache_dir)
+        actual = load_snapshot(build_example_parser, self.cache_dir)
+        self.assertIsInstance(actual, KArgumentParser)
+        # Check to make sure the loaded parser behaves like the built parser.
+        self.assertEqual(actual.format_help(), expected.format_help())
+        self.assertEqual(actual.format_usage(), expected.format_usage())
+        self.assertEqual(vars(actual.parse_args(["a", "-b", "3", "--baz", "x", "y"])), vars(expected.parse_args(["a", "-b", "3", "--baz", "x", "y"])))
+        self.assertEqual(vars(actual.parse_args(["b", "mode-01"])), vars(expected.parse_args(["b", "mode-01"])))
+
+    def test_stale_snapshot(self):
+        # Save a snapshot, then overwrite it with one that has a key that doesn't match.
+        self.assertTrue(save_snapshot(build_example_parser, build_example_parser(), self.cache_dir))
+        with open(get_snapshot_path(build_example_parser, self.cache_dir), "wb") as snapshot_file:
+            dump("stale", snapshot_file)
+            dump(build_example_parser(), snapshot_file)
+        # Check to make sure a stale snapshot is not loaded.
+        self.assertEqual(load_snapshot(build_example_parser, self.cache_dir), None)
+        # Check to make sure a damaged snapshot is not loaded.
+        with open(get_snapshot_path(build_example_parser, self.cache_dir), "wb") as snapshot_file:
+            snapshot_file.write(b"\x80\x05damaged")
+        self.assertEqual(load_snapshot(build_example_parser, self.cache_dir), None)
+        # Check to make sure build_parser() replaces the stale snapshot.
+        build_parser(build_example_parser, self.cache_dir)
+        self.assertIsInstance(load_snapshot(build_example_parser, self.cache_dir), KArgumentParser)
+
+    def test_invalidate_snapshot(self):
+        # Save a snapshot and then invalidate it.
+        save_snapshot(build_example_parser, build_example_parser(), self.cache_dir)
+        invalidate_snapshot(build_example_parser, self.cache_dir)
+        self.assertEqual(load_snapshot(build_example_parser, self.cache_dir), None)
+        # Check to make sure invalidating a missing snapshot is not an error.
+        invalidate_snapshot(build_example_parser, self.cache_dir)
+
+    def test_unpicklable_parser(self):
+        # Check to make sure an unpicklable parser is still built but not saved.
+        parser = build_parser(build_unpicklable_parser, self.cache_dir)
+        self.assertEqual(parser.parse_args(["foo"]).foo, "foo")
+        self.assertEqual(load_snapshot(build_unpicklable_parser, self.cache_dir), None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+from kargparse.parser import KArgumentParser, KArgumentError, KUsageError
+from kargparse.suggest import KSuggestionIndex
+import unittest
+
+class TestSuggest(unittest.TestCase):
+
+    def setUp(self):
+        # Create a parser with suggestions.
+        self.parser = KArgumentParser(prog="prog", exit_on_error=False, suggest_on_error=True)
+        self.parser.add_argument("--tenant")
+        self.parser.add_argument("--region", choices=["{}-{}-{}".format(area, direction, number) for area in ("us", "eu", "ap") for direction in ("east", "west") for number in range(1, 1001)])
+        self.parser.add_argument("--color", choices=["red", "green", "blue"])
+
+    def test_index(self):
+        # Check to make sure the closest word is suggested.
+        index = KSuggestionIndex(["apple", "banana", "cherry", 7, "apple"])
+        self.assertEqual(index.words, ["apple", "banana", "cherry"])
+        self.assertEqual(index.suggest("aple"), "apple")
+        self.assertEqual(index.suggest("bananna"), "banana")
+        self.assertEqual(index.suggest("chery"), "cherry")
+        # Check to make sure words that aren't close enough, or are too short, have no suggestion.
+        self.assertIsNone(index.suggest("grape"))
+        self.assertIsNone(index.suggest("ap"))
+        # Check to make sure a lookup with no time left still returns.
+        self.assertIn(index.suggest("aple", budget=0), ("apple", None))
+
+    def test_invalid_choice(self):
+        # Check to make sure an invalid choice has a suggestion.
+        for args, message in ((["--region", "us-est-17"], "Argument --region: Invalid choice: us-est-17, maybe you meant us-east-17? (value not in choices)"),
+                              (["--color", "gren"], "Argument --color: Invalid choice: gren, maybe you meant green? (choose from 'red', 'green', 'blue')"),
+                              (["--color", "purple"], "Argument --color: Invalid choice: purple (choose from 'red', 'green', 'blue')")):
+            with self.assertRaises(KArgumentError) as error:
+                self.parser.parse_args(args)
+            self.assertEqual(error.exception.message, message)
+
+    def test_unrecognized_arguments(self):
+        # Check to make sure each unrecognized option string has a suggestion.
+        for args, message in ((["--tenent", "a"], "Unrecognized arguments: --tenent a (maybe you meant --tenant?)"),
+                              (["--tenent=a", "--regoin", "--zzz"], "Unrecognized arguments: --tenent=a --regoin --zzz (maybe you meant --tenant instead of --tenent, --region instead of --regoin?)"),
+                              (["--zzz", "foo"], "Unrecognized arguments: --zzz foo")):
+            with self.assertRaises(KUsageError) as error:
+                self.parser.parse_args(args)
+            self.assertEqual(error.exception.message, message)
+        # Check to make sure a new option is suggested.
+        self.parser.add_argument("--verbose", action="store_true")
+        with self.assertRaises(KUsageError) as error:
+            self.parser.parse_args(["--verbsoe"])
+        self.assertEqual(error.exception.message, "Unrecognized arguments: --verbsoe (maybe you meant --verbose?)")
+
+    def test_suggest_on_error(self):
+        # Check to make sure there are no suggestions by default.
+        parser = KArgumentParser(exit_on_error=False)
+        parser.add_argument("--tenant")
+        with self.assertRaises(KUsageError) as error:
+            parser.parse_args(["--tenent", "a"])
+        self.assertEqual(error.exception.message, "Unrecognized arguments: --tenent a")
+        # Check the suggest_on_error.
+        with self.assertRaises(TypeError):
+            KArgumentParser(suggest_on_error="yes")
+
+if __name__ == "__main__":
+    unittest.main()
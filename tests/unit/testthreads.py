@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+from kargparse.parser import KArgumentParser
+from threading import Barrier, Thread, local
+from unittest.mock import patch
+import pickle
+import unittest
+
+THREADS = 8
+ITERATIONS = 200
+
+class ThreadStream:
+    # A stream that keeps what each thread writes separate.
+
+    def __init__(self):
+        self.local = local()
+
+    def write(self, text):
+        if not hasattr(self.local, "parts"):
+            self.local.parts = []
+        self.local.parts.append(text)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        value = "".join(getattr(self.local, "parts", []))
+        self.local.parts = []
+        return value
+
+def run_threads(target):
+    # Run the target in each thread at the same time and return any failures.
+    barrier = Barrier(THREADS)
+    failures = []
+    def run(number):
+        barrier.wait()
+        try:
+            target(number)
+        except Exception as error: # pylint: disable=W0703
+            failures.append(error)
+    threads = [Thread(target=run, args=(number,)) for number in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return failures
+
+class TestThreads(unittest.TestCase):
+
+    def setUp(self):
+        # Create a parser that exits on errors and is shared by the threads.
+        self.parser = KArgumentParser(prog="prog", description="This is the description.")
+        for number in range(20):
+            self.parser.add_argument("--option-{:02d}".format(number), type=int, help="This is option {}.".format(number))
+        self.parser.add_argument("foo", choices=["a", "b", "c"])
+
+    def test_error_diagnostics(self):
+        # Check to make sure each thread's usage statement has its own error message.
+        stream = ThreadStream()
+        def target(number):
+            for iteration in range(ITERATIONS):
+                value = "{}-{}".format(number, iteration)
+                with self.assertRaises(SystemExit):
+                    self.parser.parse_args(["a", "--option-01", value])
+                output = stream.getvalue()
+                self.assertIn("Argument --option-01: Invalid value: {}".format(value), output)
+                self.assertEqual(output.count("Invalid value"), 1)
+        with patch("sys.stderr", stream):
+            self.assertEqual(run_threads(target), [])
+
+    def test_format_help(self):
+        # Check to make sure formatting while other threads parse always gives the same help statement.
+        expected = self.parser.format_help()
+        def target(number):
+            for iteration in range(ITERATIONS // 4):
+                if number % 2:
+                    self.assertEqual(self.parser.format_help(), expected)
+                else:
+                    namespace = self.parser.parse_args(["b", "--option-02", str(iteration)])
+                    self.assertEqual((namespace.foo, namespace.option_02), ("b", iteration))
+        self.assertEqual(run_threads(target), [])
+        self.assertEqual(self.parser.format_help(), expected)
+
+    def test_parse_many(self):
+        # Check to make sure batches in different threads don't share their captured output.
+        def target(number):
+            argvs = [["a", "--option-03", str(number)], ["-h"], ["d"]] * (ITERATIONS // 10)
+            for result in self.parser.parse_many(argvs):
+                if isinstance(result, Exception) and result.status == 0:
+                    self.assertEqual(result.message, self.parser.format_help())
+                elif isinstance(result, Exception):
+                    self.assertEqual(result.message, "Argument foo: Invalid choice: d (choose from 'a', 'b', 'c')")
+                else:
+                    self.assertEqual(result.option_03, number)
+        self.assertEqual(run_threads(target), [])
+
+    def test_lazy_subparser(self):
+        # Check to make sure a deferred subparser is only built once.
+        built = []
+        def factory(**kwargs):
+            built.append(kwargs["prog"])
+            return KArgumentParser(**kwargs)
+        self.parser.add_subparsers(dest="mode").add_parser("mode-01", factory=factory)
+        def target(number):
+            self.assertEqual(self.parser.parse_args(["a", "mode-01"]).mode, "mode-01")
+        self.assertEqual(run_threads(target), [])
+        self.assertEqual(built, ["prog <foo> mode-01"])
+
+    def test_pickle(self):
+        # Check to make sure the thread-local state isn't pickled.
+        self.parser._error_message = "This is an error."
+        parser = pickle.loads(pickle.dumps(self.parser))
+        self.assertIsNone(parser._error_message)
+        self.assertEqual(parser.parse_args(["c"]).foo, "c")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+from array import array
+from kargparse.parser import KArgumentParser, KArgumentError, KProgramError
+from kargparse.vector import convert_array, get_invalid_position, get_range_position, numpy
+import unittest
+
+class TestVector(unittest.TestCase):
+
+    def setUp(self):
+        # Create a parser with array arguments.
+        self.parser = KArgumentParser(prog="prog", exit_on_error=False)
+        self.parser.modify_allowed_types(add={"float" : "float"})
+        self.parser.add_argument("--offsets", type=int, nargs="+", array="array", choices=range(0, 1000, 2))
+        self.parser.add_argument("--weights", type=float, nargs="*", array="array")
+        self.parser.add_argument("--pair", type=int, nargs=2, array="array", choices=[1, 2, 3])
+
+    def test_convert(self):
+        # Check to make sure the values are converted the same as int() and float().
+        self.assertEqual(convert_array(["1", " 2 ", "1_000", "-4"], int, "array"), array("q", [1, 2, 1000, -4]))
+        self.assertEqual(convert_array(["1.5", "2", "inf"], float, "array"), array("d", [1.5, 2.0, float("inf")]))
+        # Check to make sure the first invalid value is found.
+        self.assertEqual(get_invalid_position(["1", "2", "x", "y"], int), 2)
+        self.assertEqual(get_invalid_position(["1", str(1 << 63)], int), 1)
+        self.assertIsNone(get_invalid_position(["1", "2"], int))
+        # Check to make sure the first value that isn't in the range is found.
+        self.assertIsNone(get_range_position(array("q", [0, 4, 8]), range(0, 10, 2)))
+        self.assertEqual(get_range_position(array("q", [0, 3, 8]), range(0, 10, 2)), 1)
+        self.assertEqual(get_range_position(array("q", [9, 10]), range(10, 0, -1)), None)
+        self.assertEqual(get_range_position(array("q", [1, 0]), range(10, 0, -1)), 1)
+        self.assertEqual(get_range_position(array("d", [1.0, 2.5]), range(5)), 1)
+        self.assertEqual(get_range_position(array("d", [1.0, float("nan")]), range(5)), 1)
+        self.assertEqual(get_range_position(array("q", [1]), range(0)), 0)
+        self.assertIsNone(get_range_position(array("q"), range(0)))
+
+    def test_parse(self):
+        # Check to make sure the values are converted into arrays.
+        args = self.parser.parse_args(["--offsets", "0", "2", "998", "--weights", "0.5", "--pair", "3", "1"])
+        self.assertEqual(args.offsets, array("q", [0, 2, 998]))
+        self.assertEqual(args.weights, array("d", [0.5]))
+        self.assertEqual(args.pair, array("q", [3, 1]))
+        self.assertEqual(self.parser.parse_args(["--weights"]).weights, array("d"))
+        # Check to make sure the first invalid value is reported with its index.
+        for args, message in ((["--offsets", "0", "x", "y"], "Argument --offsets: Invalid value: x at index 1"),
+                              (["--offsets", "0", "2", "3"], "Argument --offsets: Invalid choice: 3 at index 2 (value not in choices)"),
+                              (["--offsets", "1000"], "Argument --offsets: Invalid choice: 1000 at index 0 (value not in choices)"),
+                              (["--pair", "1", "4"], "Argument --pair: Invalid choice: 4 at index 1 (value not in choices)")):
+            with self.assertRaises(KArgumentError) as error:
+                self.parser.parse_args(args)
+            self.assertEqual(error.exception.message, message)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed.")
+    def test_numpy(self):
+        # Check to make sure the values are converted into a NumPy array.
+        self.parser.add_argument("--samples", type=int, nargs="+", array="numpy", choices=range(10))
+        args = self.parser.parse_args(["--samples", "1", "2", "3"])
+        self.assertIsInstance(args.samples, numpy.ndarray)
+        self.assertEqual(args.samples.tolist(), [1, 2, 3])
+        with self.assertRaises(KArgumentError) as error:
+            self.parser.parse_args(["--samples", "1", "10"])
+        self.assertEqual(error.exception.message, "Argument --samples: Invalid choice: 10 at index 1 (value not in choices)")
+
+    def test_array_parameters(self):
+        # Check to make sure array arguments must take a list of numbers.
+        for kwargs in ({"type" : int, "nargs" : "+", "array" : "list"},
+                       {"nargs" : "+", "array" : True},
+                       {"type" : int, "array" : True},
+                       {"type" : int, "nargs" : "?", "array" : True}):
+            with self.assertRaises(KProgramError):
+                KArgumentParser(exit_on_error=False).add_argument("--values", **kwargs)
+        # Check to make sure True picks NumPy only if it is installed.
+        parser = KArgumentParser(exit_on_error=False)
+        self.assertEqual(parser.add_argument("--values", type=int, nargs="2+", array=True).array, "array" if numpy is None else "numpy")
+        if numpy is None:
+            with self.assertRaises(KProgramError):
+                parser.add_argument("--samples", type=int, nargs="+", array="numpy")
+
+if __name__ == "__main__":
+    unittest.main()